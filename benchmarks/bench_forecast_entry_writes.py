@@ -0,0 +1,155 @@
+"""
+Compare forecast_entry write paths: the legacy iterrows + executemany INSERT
+against ForecastEntryRepository's COPY-based bulk write.
+
+Payloads:
+  - 365d:    one forecast with a 365-day horizon
+  - 10k x30: 10,000 forecasts with a 30-day horizon each (one batch run)
+
+Writes go to a TEMP TABLE named forecast_entry that shadows the real one for the
+session, and the transaction is rolled back, so nothing is persisted. Without a
+reachable database (or with --no-db) only the client-side serialization is timed.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_forecast_entry_writes.py [--repeat 5] [--no-db]
+
+Prints one JSON object per (payload, path, stage) to stdout.
+"""
+import os
+import json
+import time
+import argparse
+import statistics
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from uuid_utils import uuid7
+from forecasting_module.infra.database.repositories.forecast_entry_repo import ForecastEntryRepository
+
+
+def make_payload(n_forecasts: int, horizon: int) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    ds = pd.date_range("2026-01-01", periods=horizon, freq="D")
+    payload = {}
+    for _ in range(n_forecasts):
+        yhat = rng.gamma(2.0, 5.0, horizon)
+        payload[str(uuid7())] = pd.DataFrame({
+            "ds": ds,
+            "yhat": yhat,
+            "yhat_lower": yhat * 0.8,
+            "yhat_upper": yhat * 1.2,
+        })
+    return payload
+
+
+def legacy_rows(forecast_dfs: dict[str, pd.DataFrame]) -> list[tuple]:
+    rows = []
+    for forecast_id, forecast_df in forecast_dfs.items():
+        for _, row in forecast_df.iterrows():
+            rows.append((
+                str(uuid7()),
+                str(forecast_id),
+                float(row["yhat"]),
+                float(row["yhat_upper"]),
+                float(row["yhat_lower"]),
+                str(row["ds"]),
+            ))
+    return rows
+
+
+def legacy_write(cur, forecast_dfs: dict[str, pd.DataFrame]) -> None:
+    cur.executemany(
+        """
+        INSERT INTO forecast_entry (
+            id, forecast_id, yhat, yhat_upper, yhat_lower, date
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+        """,
+        legacy_rows(forecast_dfs),
+    )
+
+
+def copy_serialize(forecast_dfs: dict[str, pd.DataFrame]) -> bytes:
+    repo = ForecastEntryRepository(None)  # pyright: ignore
+    return repo._to_csv(repo._concat(forecast_dfs))
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(payload: str, path: str, stage: str, rows: int, samples: list[float]) -> None:
+    print(json.dumps({
+        "benchmark": "forecast_entry_writes",
+        "payload": payload,
+        "path": path,
+        "stage": stage,
+        "rows": rows,
+        "repeat": len(samples),
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "rows_per_s": rows / statistics.median(samples),
+    }))
+
+
+def connect():
+    import psycopg
+    load_dotenv()
+    conninfo = (
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+    return psycopg.connect(conninfo, connect_timeout=3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-db", action="store_true")
+    args = parser.parse_args()
+
+    payloads = {
+        "365d": make_payload(1, 365),
+        "10k x30": make_payload(10_000, 30),
+    }
+
+    for name, forecast_dfs in payloads.items():
+        rows = sum(len(df) for df in forecast_dfs.values())
+        report(name, "legacy", "serialize", rows, timed(lambda: legacy_rows(forecast_dfs), args.repeat))
+        report(name, "copy", "serialize", rows, timed(lambda: copy_serialize(forecast_dfs), args.repeat))
+
+    if args.no_db:
+        return
+    try:
+        conn = connect()
+    except Exception as exc:
+        print(json.dumps({"benchmark": "forecast_entry_writes", "skipped": "database", "reason": str(exc)}))
+        return
+
+    with conn:
+        with conn.cursor() as cur:
+            # shadow the real table for this session; pg_temp is searched first
+            cur.execute("CREATE TEMP TABLE forecast_entry (LIKE public.forecast_entry INCLUDING DEFAULTS)")
+            repo = ForecastEntryRepository(cur)
+            for name, forecast_dfs in payloads.items():
+                rows = sum(len(df) for df in forecast_dfs.values())
+
+                def run_legacy():
+                    legacy_write(cur, forecast_dfs)
+                    cur.execute("TRUNCATE forecast_entry")
+
+                def run_copy():
+                    repo.save_forecast_dataframes(forecast_dfs)
+                    cur.execute("TRUNCATE forecast_entry")
+
+                report(name, "legacy", "write", rows, timed(run_legacy, args.repeat))
+                report(name, "copy", "write", rows, timed(run_copy, args.repeat))
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
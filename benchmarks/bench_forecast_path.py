@@ -0,0 +1,349 @@
+"""
+Latency and throughput of single forecasts on a synthetic catalog.
+
+Scenarios:
+  - end_to_end: every product of the catalog forecast once, `--concurrency` at a time
+  - stage:      the stages of one forecast, timed one product at a time in this
+                process: load_sales, prophet_fit, prophet_predict, croston, persist_entries
+
+Backends:
+  - fake:     in-memory repositories (fake_repositories.py) with `--db-latency-ms` per
+              round trip. end_to_end runs the job a POST enqueues
+              (GenerateSingleForecastAsyncUsecase over a `--workers` process pool).
+  - postgres: the catalog is written to the database configured in .env (the product,
+              sale, forecast and prophet_model tables; their other columns must be
+              nullable or defaulted) and deleted afterwards. end_to_end is
+              POST /forecasts/{product_id} on the in-process app, polled until its job
+              finishes, so it includes the queue.
+
+Models are fitted from scratch: the model store is a fresh temporary directory.
+The catalog is generated from `--seed`, so runs on different commits are comparable.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_forecast_path.py [--backend fake] [--products 50]
+        [--history-days 730] [--intermittency 0.3] [--concurrency 8] [--workers 4]
+
+Prints one JSON object per scenario (and per stage and method) to stdout.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+from synthetic import SyntheticCatalog, make_catalog
+
+DATA_DEPTH = 100
+WINDOW_START = date(2026, 2, 1)
+
+
+def summarize(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    return {
+        "n": len(samples),
+        "mean_s": float(np.mean(samples)),
+        "p50_s": float(np.percentile(samples, 50)),
+        "p95_s": float(np.percentile(samples, 95)),
+        "p99_s": float(np.percentile(samples, 99)),
+        "max_s": float(np.max(samples)),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Reporter:
+    def __init__(self, args: argparse.Namespace):
+        self.common = {
+            "benchmark": "forecast_path",
+            "commit": git_commit(),
+            "backend": args.backend,
+            "products": args.products,
+            "history_days": args.history_days,
+            "intermittency": args.intermittency,
+            "horizon_days": args.horizon_days,
+            "seed": args.seed,
+        }
+
+    def report(self, **fields) -> None:
+        print(json.dumps({**self.common, **fields}), flush=True)
+
+
+def forecast_input(catalog: SyntheticCatalog, product_id: str, window_end: date) -> dict:
+    return {
+        "forecast_id": catalog.forecast_id(product_id),
+        "product_id": product_id,
+        "account_id": catalog.account_id,
+        "data_depth": DATA_DEPTH,
+        "forecast_start_date": WINDOW_START,
+        "forecast_end_date": window_end,
+        "forecasting_method": catalog.methods[product_id],
+    }
+
+
+def _import_prophet() -> None:
+    # run in each worker before timing, so no request pays for the first import
+    import prophet  # noqa: F401
+
+
+async def run_requests(product_ids: list[str], concurrency: int, request) -> tuple[list[float], int, float]:
+    """Run `request(product_id)` for every product; returns latencies, failures and wall time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one(product_id: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ok = await request(product_id)
+            except Exception as exc:
+                print(f"{product_id}: {exc!r}", file=sys.stderr)
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(product_id) for product_id in product_ids))
+    return latencies, failures, time.perf_counter() - start
+
+
+# --- Stages ---
+
+async def time_stages(reporter: Reporter, catalog: SyntheticCatalog, sale_repo, entry_repo, window_end: date, n: int) -> None:
+    from forecasting_module.domain.services.forecast_manager import ForecastManager, warm_up_croston
+    from forecasting_module.infra.database.repositories.prophet_model_repo import (
+        build_default_prophet_settings,
+        build_prophet_from_settings,
+    )
+
+    # first-call costs (imports, JIT) are covered by bench_startup.py
+    warm_up_croston()
+    _import_prophet()
+    forecast_mgr = ForecastManager()
+    samples: dict[tuple[str, str], list[float]] = {}
+
+    def timed(method: str, stage: str, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        samples.setdefault((method, stage), []).append(time.perf_counter() - start)
+        return result
+
+    for method in ("prophet", "croston"):
+        product_ids = [p for p, m in catalog.methods.items() if m == method][:n]
+        for product_id in product_ids:
+            start = time.perf_counter()
+            sales = await sale_repo.find_daily_series(product_id, DATA_DEPTH)
+            samples.setdefault((method, "load_sales"), []).append(time.perf_counter() - start)
+
+            if method == "prophet":
+                model = build_prophet_from_settings(build_default_prophet_settings(catalog.model_id(product_id)))
+                timed(method, "prophet_fit", forecast_mgr.prophet_fit, model, sales)
+                future = timed(method, "prophet_predict", forecast_mgr.prophet_predict, model, WINDOW_START, window_end)
+            else:
+                future = timed(method, "croston", forecast_mgr.croston_forecast, sales, WINDOW_START, window_end)
+
+            start = time.perf_counter()
+            await entry_repo.replace_forecast_dataframe(catalog.forecast_id(product_id), future)
+            samples.setdefault((method, "persist_entries"), []).append(time.perf_counter() - start)
+
+    for (method, stage), stage_samples in samples.items():
+        reporter.report(scenario="stage", method=method, stage=stage, **summarize(stage_samples))
+
+
+# --- Fake backend ---
+
+async def run_fake(reporter: Reporter, catalog: SyntheticCatalog, args: argparse.Namespace, window_end: date) -> None:
+    from fake_repositories import FakeDatabase, FakeForecastEntryRepository, FakeSaleRepository
+    from forecasting_module.config.executor import ForecastWorkerPool
+    from forecasting_module.application.usecases.generate_single_forecast.usecase import GenerateSingleForecastAsyncUsecase
+    from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore
+
+    db = FakeDatabase(catalog, WINDOW_START, window_end, DATA_DEPTH, args.db_latency_ms)
+    model_store = ProphetModelStore(Path(tempfile.mkdtemp(prefix="bench-models-")))
+    worker_pool = ForecastWorkerPool(args.workers, max(args.concurrency, args.workers))
+    await worker_pool.warm_up()
+    await asyncio.gather(*(worker_pool.run(_import_prophet) for _ in range(args.workers)))
+
+    async def request(product_id: str) -> bool:
+        usecase = GenerateSingleForecastAsyncUsecase(db.transaction, model_store, run_in_worker=worker_pool.run)
+        await usecase.handle(forecast_input(catalog, product_id, window_end))  # pyright: ignore
+        return True
+
+    try:
+        latencies, failures, wall = await run_requests(catalog.product_ids, args.concurrency, request)
+    finally:
+        worker_pool.shutdown()
+    reporter.report(
+        scenario="end_to_end",
+        concurrency=args.concurrency,
+        workers=args.workers,
+        failures=failures,
+        throughput_per_s=len(latencies) / wall,
+        **summarize(latencies),
+    )
+
+    await time_stages(reporter, catalog, FakeSaleRepository(db), FakeForecastEntryRepository(db), window_end, args.stage_products)
+
+
+# --- Postgres backend ---
+
+def seed(cur, catalog: SyntheticCatalog, window_end: date) -> None:
+    from datetime import datetime
+    from uuid_utils import uuid7
+    from forecasting_module.domain.entities.forecast import Forecast
+    from forecasting_module.domain.entities.prophet_model import ProphetModel
+    from forecasting_module.infra.database.repositories.forecast_repo import ForecastRepository
+    from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelRepository
+
+    sale_counts = catalog.sales.groupby("product_id").size()
+    cur.executemany(
+        "INSERT INTO product (id, sale_count) VALUES (%s, %s)",
+        [(product_id, int(sale_counts.get(product_id, 0))) for product_id in catalog.product_ids],
+    )
+    with cur.copy("COPY sale (id, product_id, quantity, date) FROM STDIN") as copy:
+        for row in catalog.sales.itertuples(index=False):
+            copy.write_row((str(uuid7()), row.product_id, row.y, row.ds.date()))
+
+    now = datetime.now()
+    ForecastRepository(cur).create_forecasts([
+        Forecast(
+            catalog.forecast_id(product_id), product_id, catalog.account_id, None, None, method,  # pyright: ignore
+            DATA_DEPTH, WINDOW_START, window_end, now, now, None,
+        )
+        for product_id, method in catalog.methods.items()
+    ])
+    model_repo = ProphetModelRepository(cur)
+    for product_id, method in catalog.methods.items():
+        if method == "prophet":
+            model_repo.save(ProphetModel(catalog.model_id(product_id), product_id, "bench", "", True, None))
+
+
+def clean_up(cur, catalog: SyntheticCatalog) -> None:
+    product_ids = catalog.product_ids
+    forecast_ids = [catalog.forecast_id(p) for p in product_ids]
+    model_ids = [catalog.model_id(p) for p in product_ids]
+    cur.execute("DELETE FROM forecast_entry WHERE forecast_id = ANY(%s)", (forecast_ids,))
+    cur.execute("DELETE FROM forecast_job WHERE payload->>'product_id' = ANY(%s)", (product_ids,))
+    cur.execute("DELETE FROM prophet_model_setting WHERE prophet_model_id = ANY(%s)", (model_ids,))
+    cur.execute("DELETE FROM prophet_model WHERE id = ANY(%s)", (model_ids,))
+    cur.execute("DELETE FROM forecast WHERE id = ANY(%s)", (forecast_ids,))
+    cur.execute("DELETE FROM sale WHERE product_id = ANY(%s)", (product_ids,))
+    cur.execute("DELETE FROM product WHERE id = ANY(%s)", (product_ids,))
+
+
+async def run_postgres(reporter: Reporter, catalog: SyntheticCatalog, args: argparse.Namespace, window_end: date) -> None:
+    # read by the config modules on import
+    os.environ["FORECAST_WORKERS"] = str(args.workers)
+    os.environ["FORECAST_MAX_IN_FLIGHT"] = str(max(args.concurrency, args.workers))
+    os.environ["FORECAST_JOB_CONCURRENCY"] = str(args.concurrency)
+    os.environ["FORECAST_JOB_POLL_INTERVAL"] = str(args.poll_interval)
+    os.environ["FORECAST_JOB_RUNNER_ENABLED"] = "true"
+
+    import httpx
+    import forecasting_module.infra.workers.forecast_jobs as forecast_jobs
+    from forecasting_module.config.executor import worker_pool
+    from forecasting_module.config.pool import async_pool, pool
+    from forecasting_module.infra.database.repositories.forecast_entry_repo import AsyncForecastEntryRepository
+    from forecasting_module.infra.database.repositories.sale_repo import AsyncSaleRepository
+    from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore
+    from forecasting_module.infra.web.app import app
+
+    # fit from scratch instead of reusing the models of earlier runs
+    models_dir = Path(tempfile.mkdtemp(prefix="bench-models-"))
+    forecast_jobs.MODELS_DIR = models_dir  # pyright: ignore
+
+    async with app.router.lifespan_context(app):
+        try:
+            # one transaction: a failed seed leaves nothing behind
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    seed(cur, catalog, window_end)
+        except Exception as exc:
+            reporter.report(skipped="database", reason=str(exc))
+            return
+
+        try:
+            await asyncio.gather(*(worker_pool.run(_import_prophet) for _ in range(args.workers)))
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+                async def request(product_id: str) -> bool:
+                    body = forecast_input(catalog, product_id, window_end)
+                    response = await client.post(f"/forecasts/{product_id}", json={
+                        "accountId": body["account_id"],
+                        "forecastId": body["forecast_id"],
+                        "dataDepth": body["data_depth"],
+                        "forecastStartDate": body["forecast_start_date"].isoformat(),
+                        "forecastEndDate": body["forecast_end_date"].isoformat(),
+                        "forecastingMethod": body["forecasting_method"],
+                    })
+                    response.raise_for_status()
+                    job_id = response.json()["data"]["jobId"]
+                    while True:
+                        job = (await client.get(f"/forecasts/jobs/{job_id}")).json()["data"]
+                        if job["status"] in ("succeeded", "failed"):
+                            return job["status"] == "succeeded"
+                        await asyncio.sleep(args.poll_interval)
+
+                latencies, failures, wall = await run_requests(catalog.product_ids, args.concurrency, request)
+            reporter.report(
+                scenario="end_to_end",
+                concurrency=args.concurrency,
+                workers=args.workers,
+                failures=failures,
+                throughput_per_s=len(latencies) / wall,
+                **summarize(latencies),
+            )
+
+            async with async_pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await time_stages(
+                        reporter, catalog, AsyncSaleRepository(cur), AsyncForecastEntryRepository(cur), window_end, args.stage_products
+                    )
+        finally:
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    clean_up(cur, catalog)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["fake", "postgres"], default="fake")
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--intermittency", type=float, default=0.3, help="share of intermittent (Croston) products")
+    parser.add_argument("--zero-rate", type=float, default=0.7, help="share of days without sales of intermittent products")
+    parser.add_argument("--horizon-days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stage-products", type=int, default=10, help="products per method in the stage scenario")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="fake backend: delay per repository call")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="postgres backend: job polling interval")
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.products, args.history_days, args.intermittency, args.zero_rate, args.seed)
+    window_end = WINDOW_START + timedelta(days=args.horizon_days - 1)
+    reporter = Reporter(args)
+
+    run = run_fake if args.backend == "fake" else run_postgres
+    asyncio.run(run(reporter, catalog, args, window_end))
+
+
+if __name__ == "__main__":
+    main()
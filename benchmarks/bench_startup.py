@@ -0,0 +1,104 @@
+"""
+Track service start-up cost: import time and resident memory of a fresh process.
+
+Scenarios, each run in its own interpreter so nothing is already imported:
+  - api:            import the FastAPI app (what uvicorn does before serving)
+  - worker:         import the worker entry points (first job in a spawned worker)
+  - croston:        worker import plus a first single-series Croston forecast
+  - prophet:        worker import plus a first Prophet fit on 120 days
+  - worker_warm_up: the worker initializer's Croston warm-up (numba cache as on disk)
+
+No database is needed: the pool is not opened at import and the scenarios do not query.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_startup.py [--repeat 3]
+
+Prints one JSON object per scenario to stdout.
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+WORKER_IMPORT = "import forecasting_module.infra.workers.forecast_jobs"
+
+SERIES = """
+from datetime import date
+import numpy as np
+import pandas as pd
+from forecasting_module.domain.services.forecast_manager import ForecastManager
+sales = pd.DataFrame({
+    "ds": pd.date_range("2025-01-01", periods=120, freq="D"),
+    "y": np.random.default_rng(0).poisson(2.0, 120).astype(float),
+})
+"""
+
+SCENARIOS = {
+    "api": "import forecasting_module.infra.web.app",
+    "worker": WORKER_IMPORT,
+    "croston": WORKER_IMPORT + SERIES + """
+ForecastManager().croston_forecast(sales, date(2025, 5, 1), date(2025, 5, 31))
+""",
+    "prophet": WORKER_IMPORT + SERIES + """
+from forecasting_module.infra.database.repositories.prophet_model_repo import build_default_prophet_settings, build_prophet_from_settings
+model = build_prophet_from_settings(build_default_prophet_settings("bench"))
+forecast_mgr = ForecastManager()
+forecast_mgr.prophet_fit(model, sales)
+forecast_mgr.prophet_predict(model, date(2025, 5, 1), date(2025, 5, 31))
+""",
+    "worker_warm_up": """
+from forecasting_module.domain.services.forecast_manager import warm_up_croston
+warm_up_croston()
+""",
+}
+
+# Runs in the child: time the scenario and report its wall time, RSS and heavy modules.
+HARNESS = """
+import sys, json, time, logging
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+exec(compile(sys.argv[1], "<scenario>", "exec"))
+elapsed = time.perf_counter() - start
+rss_kb = 0
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+heavy = ["pandas", "pyarrow", "prophet", "statsforecast", "numba"]
+print(json.dumps({"seconds": elapsed, "rss_mb": rss_kb / 1024, "modules": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def run_scenario(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", HARNESS, code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append")
+    args = parser.parse_args()
+
+    for name in args.scenario or SCENARIOS:
+        runs = [run_scenario(SCENARIOS[name]) for _ in range(args.repeat)]
+        seconds = [r["seconds"] for r in runs]
+        print(json.dumps({
+            "benchmark": "startup",
+            "scenario": name,
+            "repeat": len(runs),
+            "median_s": statistics.median(seconds),
+            "min_s": min(seconds),
+            "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+            "modules": runs[-1]["modules"],
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+In-memory stand-ins for the async repositories, serving a `SyntheticCatalog`.
+
+They answer the calls `GenerateSingleForecastAsyncUsecase` makes with the same
+shapes as the Postgres repositories (the dense daily series, its checksum, the
+forecast rows). Every call awaits `latency_ms` to stand in for a database round
+trip, and written entries go through the real COPY serialization, so client-side
+costs stay in the measurement.
+"""
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+import pandas as pd
+from forecasting_module.domain.entities.forecast import Forecast
+from forecasting_module.domain.entities.product import Product
+from forecasting_module.domain.entities.prophet_model import ProphetModel
+from forecasting_module.application.usecases.generate_single_forecast.usecase import SingleForecastRepositories
+from forecasting_module.infra.database.repositories.forecast_entry_repo import ForecastEntryRepository
+from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelSetting
+from synthetic import SyntheticCatalog
+
+
+def _dense(sales: pd.DataFrame) -> pd.DataFrame:
+    # same zero-fill as DAILY_SERIES_QUERY: every day between the first and last sale
+    df = sales[["ds", "y"]].copy()
+    df["ds"] = pd.to_datetime(df["ds"])
+    full_range = pd.date_range(df["ds"].min(), df["ds"].max(), freq="D")
+    return df.set_index("ds").reindex(full_range, fill_value=0).rename_axis("ds").reset_index()
+
+
+class FakeDatabase:
+    """The rows of one catalog plus one forecast per product, shared by the fake repositories."""
+
+    def __init__(
+        self,
+        catalog: SyntheticCatalog,
+        forecast_start_date: date,
+        forecast_end_date: date,
+        data_depth: int,
+        latency_ms: float = 0.0,
+    ):
+        self.latency = latency_ms / 1000
+        self.sales = {product_id: frame[["ds", "y"]] for product_id, frame in catalog.sales.groupby("product_id")}
+        now = datetime.now()
+        self.forecasts = {
+            product_id: Forecast(
+                catalog.forecast_id(product_id), product_id, catalog.account_id, None, None, method,  # pyright: ignore
+                data_depth, forecast_start_date, forecast_end_date, now, now, None,
+            )
+            for product_id, method in catalog.methods.items()
+        }
+        self.forecasts_by_id = {forecast.id: forecast for forecast in self.forecasts.values()}
+        self.models = {
+            product_id: ProphetModel(catalog.model_id(product_id), product_id, "bench", "", True, None)
+            for product_id, method in catalog.methods.items() if method == "prophet"
+        }
+        self.settings: dict[str, ProphetModelSetting] = {}
+        self.entries: dict[str, bytes] = {}
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Repositories over these rows, as the usecase's `transaction` factory."""
+        yield SingleForecastRepositories(
+            FakeProductRepository(self),  # pyright: ignore
+            FakeSaleRepository(self),  # pyright: ignore
+            FakeForecastRepository(self),  # pyright: ignore
+            FakeForecastEntryRepository(self),  # pyright: ignore
+            FakeProphetModelRepository(self),  # pyright: ignore
+        )
+
+    async def round_trip(self) -> None:
+        await asyncio.sleep(self.latency)
+
+    def daily_series(self, product_id: str, data_depth: int) -> pd.DataFrame:
+        sales = self.sales.get(product_id)
+        if sales is None:
+            return pd.DataFrame({"ds": pd.Series(dtype="datetime64[ns]"), "y": pd.Series(dtype="float64")})
+
+        # same cut as DAILY_SERIES_QUERY: the most recent `data_depth` percent of the history
+        first, last = sales["ds"].min(), sales["ds"].max()
+        span_days = (last - first).days + 1
+        cut = first + pd.Timedelta(days=(span_days * (100 - data_depth)) // 100)
+        return _dense(sales[sales["ds"] >= cut])
+
+
+class FakeProductRepository:
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+
+    async def find_one_by_id(self, id: str) -> Product | None:
+        await self.db.round_trip()
+        sales = self.db.sales.get(id)
+        return Product(id, len(sales)) if sales is not None else None
+
+
+class FakeSaleRepository:
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+
+    async def find_daily_series(self, product_id: str, data_depth: int) -> pd.DataFrame:
+        await self.db.round_trip()
+        return self.db.daily_series(product_id, data_depth)
+
+    async def get_daily_series_checksum(self, product_id: str, data_depth: int) -> str | None:
+        await self.db.round_trip()
+        series = self.db.daily_series(product_id, data_depth)
+        if series.empty:
+            return None
+        return hashlib.md5(series.to_csv(index=False).encode()).hexdigest()
+
+
+class FakeForecastRepository:
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+
+    async def lock_forecast(self, forecast_id: str) -> None:
+        await self.db.round_trip()
+
+    async def get_forecast(self, sales_forecast_id: str) -> Forecast | None:
+        await self.db.round_trip()
+        return self.db.forecasts_by_id.get(str(sales_forecast_id))
+
+    async def mark_processed(self, forecast_ids: list[str], input_fingerprint: str | None = None) -> None:
+        await self.db.round_trip()
+        for id in forecast_ids:
+            self.db.forecasts_by_id[str(id)].input_fingerprint = input_fingerprint
+
+
+class FakeForecastEntryRepository:
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+        self._serializer = ForecastEntryRepository(None)  # pyright: ignore
+
+    async def replace_forecast_dataframe(self, forecast_id: str, forecast_df: pd.DataFrame) -> None:
+        payload = self._serializer._to_csv(self._serializer._concat({forecast_id: forecast_df}))
+        await self.db.round_trip()
+        self.db.entries[str(forecast_id)] = payload
+
+
+class FakeProphetModelRepository:
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+
+    async def get_model_with_settings_by_product_id(
+        self, product_id: str
+    ) -> tuple[ProphetModel | None, ProphetModelSetting | None]:
+        await self.db.round_trip()
+        model = self.db.models.get(str(product_id))
+        settings = self.db.settings.get(model.id) if model is not None else None
+        return model, settings
+
+    async def save_model_settings(self, setting: ProphetModelSetting):
+        await self.db.round_trip()
+        self.db.settings[setting.prophet_model_id] = setting
+
+    async def save(self, model: ProphetModel):
+        await self.db.round_trip()
+        self.db.models[model.product_id] = model
@@ -0,0 +1,74 @@
+"""
+Synthetic sales catalogs for the benchmarks.
+
+A catalog is a set of products with daily sales ending on `end_date`:
+  - smooth products: a level, a weekly cycle, a yearly cycle and Poisson noise,
+    forecast with Prophet
+  - intermittent products (share given by `intermittency`): most days without a
+    sale and lumpy sizes on the others, forecast with Croston
+
+`sales` holds one row per product and day with a sale, like the `sale` table
+(days without sales have no row). The same arguments always give the same catalog.
+"""
+import uuid
+from dataclasses import dataclass
+from datetime import date
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SyntheticCatalog:
+    account_id: str
+    methods: dict[str, str]
+    sales: pd.DataFrame
+
+    @property
+    def product_ids(self) -> list[str]:
+        return list(self.methods)
+
+    # one forecast and (for Prophet products) one model row per product
+    def forecast_id(self, product_id: str) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, f"forecast:{product_id}"))
+
+    def model_id(self, product_id: str) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, f"prophet_model:{product_id}"))
+
+
+def make_catalog(
+    n_products: int,
+    history_days: int,
+    intermittency: float,
+    zero_rate: float = 0.7,
+    seed: int = 0,
+    end_date: date = date(2026, 1, 31),
+) -> SyntheticCatalog:
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range(end=pd.Timestamp(end_date), periods=history_days, freq="D")
+    t = np.arange(history_days)
+    weekly = np.sin(2 * np.pi * t / 7)
+    yearly = np.sin(2 * np.pi * t / 365.25)
+
+    methods: dict[str, str] = {}
+    frames = []
+    for _ in range(n_products):
+        product_id = _uuid(rng)
+        if rng.random() < intermittency:
+            methods[product_id] = "croston"
+            y = np.where(rng.random(history_days) < zero_rate, 0.0, rng.gamma(1.5, 3.0, history_days).round())
+        else:
+            methods[product_id] = "prophet"
+            level = rng.uniform(5, 50)
+            rate = level * (1 + 0.3 * weekly * rng.uniform(0, 1) + 0.2 * yearly * rng.uniform(0, 1))
+            y = rng.poisson(np.clip(rate, 0, None)).astype(float)
+        # the sale window must be bounded by actual sales on both ends, like real history
+        y[0], y[-1] = max(y[0], 1.0), max(y[-1], 1.0)
+
+        keep = y > 0
+        frames.append(pd.DataFrame({"product_id": product_id, "ds": ds[keep], "y": y[keep]}))
+
+    return SyntheticCatalog(_uuid(rng), methods, pd.concat(frames, ignore_index=True))
+
+
+def _uuid(rng: np.random.Generator) -> str:
+    return str(uuid.UUID(bytes=rng.bytes(16), version=4))
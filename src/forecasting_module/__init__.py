@@ -0,0 +1,3 @@
+# Set up the Prometheus multiprocess directory before anything imports prometheus_client,
+# whichever entry point (the API, the job runner, a benchmark) loads the package first.
+from forecasting_module.config import metrics as _metrics  # noqa: F401
@@ -0,0 +1,27 @@
+from fastapi import HTTPException, status
+from forecasting_module.infra.database.repositories.product_repo import ProductRepository
+
+
+def resolve_account_product_ids(
+    product_repo: ProductRepository,
+    account_id: str,
+    product_ids: list[str] | None,
+    failed: dict[str, str],
+) -> list[str]:
+    """
+    The products a job works on: every product of the account, or the requested
+    ones that belong to it. Requested ids of other accounts (or unknown ones) are
+    reported in `failed` and never touched.
+    """
+    if not product_ids:
+        resolved = [str(p.id) for p in product_repo.find_all_by_account_id(account_id)]
+    else:
+        owned = {str(p.id) for p in product_repo.find_all_by_account_id_and_ids(account_id, product_ids)}
+        resolved = [product_id for product_id in product_ids if product_id in owned]
+        for product_id in product_ids:
+            if product_id not in owned:
+                failed[product_id] = "Product not found"
+
+    if not resolved:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"message": "No products found"})
+    return resolved
@@ -0,0 +1,13 @@
+import os
+from fastapi import HTTPException
+
+
+# Series per Croston task: each task forecasts its chunk in one vectorized StatsForecast call.
+CROSTON_SERIES_PER_TASK = int(os.getenv("CROSTON_SERIES_PER_TASK", 500))
+
+
+def failure_message(exc: BaseException) -> str:
+    """What a job reports for a product (or candidate) whose executor task raised `exc`."""
+    if isinstance(exc, HTTPException) and isinstance(exc.detail, dict):
+        return str(exc.detail.get("message", exc.detail))
+    return str(exc) or type(exc).__name__
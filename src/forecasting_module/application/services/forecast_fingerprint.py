@@ -0,0 +1,27 @@
+import json
+import hashlib
+from datetime import date
+
+
+def forecast_input_fingerprint(
+    sales_checksum: str | None,
+    forecasting_method: str,
+    model_fingerprint: str,
+    data_depth: int,
+    forecast_start_date: date,
+    forecast_end_date: date,
+) -> str:
+    """
+    Hash of everything a forecast's entries depend on: the daily sales it is fitted
+    on (checksummed in SQL), the method and its settings, the depth and the window.
+    Equal fingerprints mean the stored entries can be served as they are.
+    """
+    payload = json.dumps([
+        sales_checksum,
+        forecasting_method,
+        model_fingerprint,
+        data_depth,
+        forecast_start_date.isoformat(),
+        forecast_end_date.isoformat(),
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,68 @@
+from typing import TYPE_CHECKING
+import pandas as pd
+from forecasting_module.domain.services.forecast_manager import ForecastManager
+from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelSetting, build_prophet_from_settings
+from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore
+from forecasting_module.infra.storage.prophet_model_cache import ProphetModelCache
+from forecasting_module.infra.metrics import PROPHET_MODELS
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+
+def fit_or_load_prophet(
+    model_store: ProphetModelStore,
+    product_id: str,
+    settings: ProphetModelSetting,
+    sales: pd.DataFrame,
+    previous_model_path: str | None,
+    model_cache: ProphetModelCache | None = None,
+) -> tuple["Prophet", str | None]:
+    """
+    Return a fitted model for `sales`, reusing the stored artifact when settings and
+    training data are unchanged.
+
+    The second element is the path of a newly trained artifact (to be recorded on
+    `prophet_model`), or None when an existing one was reused. With `model_cache`,
+    fits are kept in memory and served without touching the store.
+    """
+    forecast_mgr = ForecastManager()
+
+    model_path = model_store.path_for(product_id, settings, sales)
+    if model_cache is not None:
+        model = model_cache.get(model_path)
+        if model is not None:
+            PROPHET_MODELS.labels("cache").inc()
+            return model, None
+
+    model = model_store.load(model_path)
+    if model is not None:
+        PROPHET_MODELS.labels("store").inc()
+        _cache_model(model_cache, model_store, model_path, model, sales)
+        return model, None
+
+    # warm-start from the previous fit when only the data moved
+    init = None
+    previous = model_store.load_warm_start(product_id, previous_model_path, settings)
+    if previous is not None:
+        init = forecast_mgr.prophet_warm_start_params(previous)
+
+    model = build_prophet_from_settings(settings)
+    forecast_mgr.prophet_fit(model, sales, init=init)
+    model_store.save(model, model_path)
+    PROPHET_MODELS.labels("fit").inc()
+    _cache_model(model_cache, model_store, model_path, model, sales)
+    return model, model_path
+
+
+def _cache_model(
+    model_cache: ProphetModelCache | None,
+    model_store: ProphetModelStore,
+    model_path: str,
+    model: "Prophet",
+    sales: pd.DataFrame,
+) -> None:
+    if model_cache is None:
+        return
+    last_date = pd.to_datetime(sales["ds"]).max().date()
+    model_cache.put(model_path, model, model_store.size(model_path), last_date)
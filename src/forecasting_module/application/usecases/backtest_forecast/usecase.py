@@ -0,0 +1,250 @@
+import math
+from fastapi import HTTPException, status
+from contextlib import AbstractContextManager
+from typing import Callable, TypedDict, Literal
+from datetime import date
+from dataclasses import dataclass, replace
+from concurrent.futures import Executor, Future
+import pandas as pd
+from forecasting_module.domain.services.forecast_manager import ForecastManager, croston_models
+from forecasting_module.domain.services.backtest import backtest_offsets, naive_scales, rolling_cutoffs, score_backtest
+from forecasting_module.infra.database.repositories.product_repo import ProductRepository
+from forecasting_module.domain.entities.prophet_model import ProphetModel
+from forecasting_module.infra.database.repositories.sale_repo import SaleRepository
+from forecasting_module.infra.database.repositories.prophet_model_repo import (
+    ProphetModelRepository,
+    ProphetModelSetting,
+    build_default_prophet_settings,
+    build_prophet_from_settings,
+)
+from forecasting_module.application.services.account_products import resolve_account_product_ids
+from forecasting_module.application.services.fan_out import CROSTON_SERIES_PER_TASK, failure_message
+
+
+class BacktestForecastInput(TypedDict):
+    account_id: str
+    product_ids: list[str] | None
+    data_depth: int
+    # the window every cutoff is scored on, at the same offsets from its last training day
+    forecast_start_date: date
+    forecast_end_date: date
+    methods: list[Literal["prophet", "croston"]]
+    n_windows: int
+    # days between cutoffs; None: the window length
+    step_days: int | None
+
+
+class BacktestMetrics(TypedDict):
+    mae: float
+    rmse: float
+    mase: float | None
+    windows: int
+
+
+class BacktestForecastResult(TypedDict):
+    # product -> method ("prophet" or a Croston variant) -> accuracy
+    metrics: dict[str, dict[str, BacktestMetrics]]
+    # method -> accuracy averaged over the products it was scored on
+    summary: dict[str, BacktestMetrics]
+    # product -> method with the lowest MASE (MAE when MASE is undefined)
+    best: dict[str, str]
+    failed: dict[str, str]
+
+
+# --- Executor tasks (module-level so they can be pickled) ---
+
+def backtest_croston_products(sales: pd.DataFrame, lead: int, horizon: int, n_windows: int, step_size: int) -> pd.DataFrame:
+    return ForecastManager().croston_cross_validation(sales, lead, horizon, n_windows, step_size)
+
+
+def backtest_prophet_window(
+    product_id: str,
+    settings: ProphetModelSetting,
+    sales: pd.DataFrame,
+    cutoff: pd.Timestamp,
+    lead: int,
+    horizon: int,
+) -> pd.DataFrame:
+    """Fit on the sales up to `cutoff` and forecast days `lead`..`horizon` after it."""
+    forecast_mgr = ForecastManager()
+    train = sales[sales["ds"] <= cutoff]
+    # point forecasts only; changepoints after the cutoff are outside the training history
+    settings = replace(
+        settings,
+        uncertainty_samples=0,
+        changepoints=[c for c in settings.changepoints if pd.Timestamp(c.ds) < cutoff],
+    )
+    model = build_prophet_from_settings(settings)
+    forecast_mgr.prophet_fit(model, train)
+
+    start = (cutoff + pd.Timedelta(days=lead)).date()
+    end = (cutoff + pd.Timedelta(days=horizon)).date()
+    future = forecast_mgr.prophet_predict(model, start, end, interval_mode="point")
+    actual = sales[(sales["ds"] >= pd.Timestamp(start)) & (sales["ds"] <= pd.Timestamp(end))]
+    return (
+        actual[["ds", "y"]]
+        .merge(future[["ds", "yhat"]], on="ds")
+        .rename(columns={"yhat": "prophet"})
+        .assign(unique_id=product_id, cutoff=cutoff)
+    )
+
+
+@dataclass
+class BacktestForecastRepositories:
+    """The repositories of one transaction."""
+    product_repo: ProductRepository
+    sale_repo: SaleRepository
+    prophet_model_repo: ProphetModelRepository
+
+
+class BacktestForecastUsecase:
+    """
+    Rolling-origin accuracy of Prophet and the Croston variants for many products.
+
+    Series are loaded once with a single query and cut with the forecasts' `data_depth`.
+    From each cutoff the methods forecast the same days relative to the cutoff as
+    the requested window does relative to the last sale. Croston runs in
+    StatsForecast's cross-validation, one vectorized call per chunk of products
+    over all cutoffs; Prophet fits one task per (product, cutoff) on `executor`.
+    Nothing is persisted, so products, sales and model settings are loaded in one
+    transaction from `transaction` and no connection is held during the fits.
+    """
+
+    def __init__(
+        self,
+        transaction: Callable[[], AbstractContextManager[BacktestForecastRepositories]],
+        executor: Executor,
+    ) -> None:
+        self.transaction = transaction
+        self.executor = executor
+
+    def handle(self, input: BacktestForecastInput) -> BacktestForecastResult:
+        if input["n_windows"] < 1:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "At least one backtest window is required"})
+
+        failed: dict[str, str] = {}
+        with self.transaction() as repos:
+            product_ids = resolve_account_product_ids(repos.product_repo, input["account_id"], input["product_ids"], failed)
+            sales = repos.sale_repo.find_daily_series_by_product_ids(product_ids, input["data_depth"])
+            models = {}
+            if "prophet" in input["methods"]:
+                models = repos.prophet_model_repo.get_models_with_settings_by_product_ids(product_ids)
+
+        loaded = set(sales["product_id"].astype(str))
+        for product_id in product_ids:
+            if product_id not in loaded:
+                failed[product_id] = "No sales data found"
+        groups = self._group_by_offsets(sales, input, failed)
+
+        futures: list[tuple[list[str], list[str], Future]] = []
+        for (lead, horizon, step), ids in groups.items():
+            if "croston" in input["methods"]:
+                futures += self._submit_croston(sales, ids, lead, horizon, input["n_windows"], step)
+            if "prophet" in input["methods"]:
+                futures += self._submit_prophet(sales, models, ids, lead, horizon, input["n_windows"], step)
+
+        # Croston chunks and Prophet windows are scored in one pass each
+        results: dict[tuple[str, ...], list[pd.DataFrame]] = {}
+        for ids, methods, future in futures:
+            try:
+                results.setdefault(tuple(methods), []).append(future.result())
+            except Exception as exc:
+                for product_id in ids:
+                    failed.setdefault(product_id, failure_message(exc))
+
+        history = sales.rename(columns={"product_id": "unique_id"})
+        scores = []
+        for methods, frames in results.items():
+            cv = pd.concat(frames, ignore_index=True)
+            if not cv.empty:
+                scores.append(score_backtest(cv, naive_scales(history, cv), list(methods)))
+
+        return _to_result(pd.concat(scores, ignore_index=True) if scores else None, failed)
+
+    def _group_by_offsets(
+        self, sales: pd.DataFrame, input: BacktestForecastInput, failed: dict[str, str]
+    ) -> dict[tuple[int, int, int], list[str]]:
+        """Products by (lead, horizon, step): series that end on different days are scored on different offsets."""
+        groups: dict[tuple[int, int, int], list[str]] = {}
+        for product_id, group in sales.groupby("product_id", sort=False):
+            product_id = str(product_id)
+            last_date = group["ds"].max().date()
+            lead, horizon = backtest_offsets(last_date, input["forecast_start_date"], input["forecast_end_date"])
+            if horizon <= 0:
+                failed[product_id] = f"Forecast end date ({input['forecast_end_date']}) must be after last sale date ({last_date})."
+                continue
+
+            step = input["step_days"] or horizon - lead + 1
+            # every cutoff keeps the 30 days of history a forecast needs
+            if len(group) - horizon - step * (input["n_windows"] - 1) <= 30:
+                failed[product_id] = f"Not enough data for {input['n_windows']} backtest windows (min 30 days each)"
+                continue
+            groups.setdefault((lead, horizon, step), []).append(product_id)
+        return groups
+
+    def _submit_croston(
+        self, sales: pd.DataFrame, product_ids: list[str], lead: int, horizon: int, n_windows: int, step: int
+    ) -> list[tuple[list[str], list[str], Future]]:
+        futures = []
+        for i in range(0, len(product_ids), CROSTON_SERIES_PER_TASK):
+            chunk = product_ids[i:i + CROSTON_SERIES_PER_TASK]
+            long_df = sales[sales["product_id"].isin(chunk)].rename(columns={"product_id": "unique_id"})
+            futures.append((chunk, list(croston_models()), self.executor.submit(
+                backtest_croston_products, long_df, lead, horizon, n_windows, step,
+            )))
+        return futures
+
+    def _submit_prophet(
+        self,
+        sales: pd.DataFrame,
+        models: dict[str, tuple[ProphetModel, ProphetModelSetting | None]],
+        product_ids: list[str],
+        lead: int,
+        horizon: int,
+        n_windows: int,
+        step: int,
+    ) -> list[tuple[list[str], list[str], Future]]:
+        futures = []
+        for product_id, group in sales[sales["product_id"].isin(product_ids)].groupby("product_id", sort=False):
+            product_id = str(product_id)
+            prophet_model, settings = models.get(product_id, (None, None))
+            if settings is None:
+                settings = build_default_prophet_settings(prophet_model.id if prophet_model else None)
+
+            series = group[["ds", "y"]].reset_index(drop=True)
+            for cutoff in rolling_cutoffs(series["ds"].max(), horizon, n_windows, step):
+                futures.append(([product_id], ["prophet"], self.executor.submit(
+                    backtest_prophet_window, product_id, settings, series, cutoff, lead, horizon,
+                )))
+        return futures
+
+
+def _to_result(scores: pd.DataFrame | None, failed: dict[str, str]) -> BacktestForecastResult:
+    if scores is None:
+        return {"metrics": {}, "summary": {}, "best": {}, "failed": failed}
+
+    def metrics(row) -> BacktestMetrics:
+        return {
+            "mae": float(row.mae),
+            "rmse": float(row.rmse),
+            "mase": None if math.isnan(row.mase) else float(row.mase),
+            "windows": int(row.windows),
+        }
+
+    by_product: dict[str, dict[str, BacktestMetrics]] = {}
+    for row in scores.itertuples(index=False):
+        by_product.setdefault(str(row.unique_id), {})[str(row.method)] = metrics(row)
+
+    summary = scores.groupby("method", sort=False).agg(
+        mae=("mae", "mean"), rmse=("rmse", "mean"), mase=("mase", "mean"), windows=("windows", "sum")
+    ).reset_index()
+
+    ranked = scores.assign(rank_key=scores["mase"].fillna(scores["mae"]))
+    best = ranked.loc[ranked.groupby("unique_id", sort=False)["rank_key"].idxmin()]
+
+    return {
+        "metrics": by_product,
+        "summary": {str(row.method): metrics(row) for row in summary.itertuples(index=False)},
+        "best": dict(zip(best["unique_id"].astype(str), best["method"].astype(str))),
+        "failed": failed,
+    }
@@ -0,0 +1,318 @@
+import os
+from contextlib import AbstractContextManager
+from typing import Callable, TypedDict, Literal
+from datetime import date, datetime
+from dataclasses import dataclass
+from concurrent.futures import Executor, Future
+from uuid_utils import uuid7
+import pandas as pd
+from forecasting_module.domain.entities.forecast import Forecast
+from forecasting_module.domain.entities.prophet_model import ProphetModel
+from forecasting_module.domain.services.forecast_manager import ForecastManager, CROSTON_VARIANT
+from forecasting_module.domain.services.demand_classifier import classify_demand, ROUTES, CLASSIFICATIONS
+from forecasting_module.domain.services.prophet_predictor import IntervalMode
+from forecasting_module.infra.database.repositories.forecast_entry_repo import ForecastEntryRepository
+from forecasting_module.infra.database.repositories.forecast_repo import ForecastRepository
+from forecasting_module.infra.database.repositories.product_repo import ProductRepository
+from forecasting_module.infra.database.repositories.product_setting_repo import ProductSettingRepository
+from forecasting_module.infra.database.repositories.sale_repo import SaleRepository
+from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelRepository, ProphetModelSetting, build_default_prophet_settings
+from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore
+from forecasting_module.infra.storage.prophet_model_cache import model_cache
+from forecasting_module.application.services.prophet_training import fit_or_load_prophet
+from forecasting_module.application.services.account_products import resolve_account_product_ids
+from forecasting_module.application.services.fan_out import CROSTON_SERIES_PER_TASK, failure_message
+from forecasting_module.infra.metrics import time_stage
+
+
+# Forecasts written per transaction once the fits are done
+BATCH_WRITE_CHUNK = int(os.getenv("BATCH_WRITE_CHUNK", 500))
+
+
+class GenerateBatchForecastInput(TypedDict):
+    account_id: str
+    product_ids: list[str] | None
+    data_depth: int
+    forecast_start_date: date
+    forecast_end_date: date
+    # "auto" routes each product by its demand pattern (see demand_classifier)
+    forecasting_method: Literal["prophet", "croston", "auto"]
+    interval_mode: IntervalMode
+    update_classification: bool
+
+
+class GenerateBatchForecastResult(TypedDict):
+    forecasts: dict[str, str]
+    methods: dict[str, str]
+    failed: dict[str, str]
+
+
+# (method, Croston variant) a product is forecast with
+Route = tuple[Literal["prophet", "croston"], str | None]
+
+
+# --- Executor tasks (module-level so they can be pickled) ---
+
+def forecast_prophet_product(
+    model_store: ProphetModelStore,
+    product_id: str,
+    settings: ProphetModelSetting,
+    sales: pd.DataFrame,
+    previous_model_path: str | None,
+    forecast_start_date: date,
+    forecast_end_date: date,
+    interval_mode: IntervalMode,
+) -> tuple[pd.DataFrame, str | None]:
+    # `model_cache` is the executing worker's own cache
+    with time_stage("prophet", "fit"):
+        model, trained_model_path = fit_or_load_prophet(
+            model_store, product_id, settings, sales, previous_model_path, model_cache=model_cache
+        )
+    with time_stage("prophet", "predict"):
+        future = ForecastManager().prophet_predict(model, forecast_start_date, forecast_end_date, interval_mode)
+    return future, trained_model_path
+
+
+def forecast_croston_products(
+    sales: pd.DataFrame,
+    forecast_start_date: date,
+    forecast_end_date: date,
+    variant: str,
+) -> pd.DataFrame:
+    return ForecastManager().croston_forecast_many(sales, forecast_start_date, forecast_end_date, variant=variant)
+
+
+@dataclass
+class BatchForecastRepositories:
+    """The repositories of one transaction."""
+    product_repo: ProductRepository
+    sale_repo: SaleRepository
+    forecast_repo: ForecastRepository
+    forecast_entry_repo: ForecastEntryRepository
+    prophet_model_repo: ProphetModelRepository
+    product_setting_repo: ProductSettingRepository
+
+
+@dataclass
+class _ProphetUpdates:
+    """Model rows to persist with the forecasts: retrained models and first-used default settings."""
+    trained: dict[str, ProphetModel]
+    default_settings: dict[str, ProphetModelSetting]
+
+
+class GenerateBatchForecastUsecase:
+    """
+    Forecast every product of an account (or an explicit list of products) in one job.
+
+    Dense daily series are loaded with a single query, fits are fanned out over `executor`, and
+    forecasts and their entries are written back in bulk. A product that cannot be
+    forecast is reported in `failed` instead of aborting the whole batch.
+
+    A batch can run for hours, so no connection is held during the fits: products,
+    series and model settings are loaded in one transaction from `transaction`, and
+    forecasts are written in one transaction per `BATCH_WRITE_CHUNK` products.
+    """
+
+    def __init__(
+        self,
+        transaction: Callable[[], AbstractContextManager[BatchForecastRepositories]],
+        model_store: ProphetModelStore,
+        executor: Executor,
+    ) -> None:
+        self.transaction = transaction
+        self.model_store = model_store
+        self.executor = executor
+
+    def handle(self, input: GenerateBatchForecastInput) -> GenerateBatchForecastResult:
+        failed: dict[str, str] = {}
+        with self.transaction() as repos:
+            product_ids = resolve_account_product_ids(repos.product_repo, input["account_id"], input["product_ids"], failed)
+            series = self._load_series(repos, product_ids, input["data_depth"], failed)
+
+            routes: dict[str, Route]
+            if input["forecasting_method"] == "auto":
+                routes = self._route(repos, series, input["update_classification"])
+            else:
+                routes = {product_id: (input["forecasting_method"], None) for product_id in series}
+
+            prophet_ids = [product_id for product_id, (method, _) in routes.items() if method == "prophet"]
+            models = repos.prophet_model_repo.get_models_with_settings_by_product_ids(prophet_ids) if prophet_ids else {}
+
+        results: dict[str, pd.DataFrame] = {}
+        updates = _ProphetUpdates(trained={}, default_settings={})
+        for route in set(routes.values()):
+            routed = {product_id: df for product_id, df in series.items() if routes[product_id] == route}
+            method, variant = route
+            if method == "prophet":
+                results.update(self._run_prophet(routed, models, input, updates, failed))
+            else:
+                results.update(self._run_croston(routed, input, failed, variant or CROSTON_VARIANT))
+
+        # --- Write forecasts and entries in bulk ---
+        now = datetime.now()
+        forecasts = [
+            Forecast(
+                id=str(uuid7()),
+                product_id=product_id,
+                account_id=input["account_id"],
+                prophet_model_id=None,
+                croston_model_id=None,
+                model_type=routes[product_id][0],
+                data_depth=input["data_depth"],
+                forecast_start_date=input["forecast_start_date"],
+                forecast_end_date=input["forecast_end_date"],
+                created_at=now,
+                updated_at=now,
+                deleted_at=None,
+            )
+            for product_id in results
+        ]
+        for i in range(0, len(forecasts), BATCH_WRITE_CHUNK):
+            with self.transaction() as repos:
+                self._write(repos, forecasts[i:i + BATCH_WRITE_CHUNK], results, updates)
+
+        return {
+            "forecasts": {f.product_id: f.id for f in forecasts},
+            "methods": {f.product_id: f.model_type for f in forecasts},
+            "failed": failed,
+        }
+
+    def _load_series(
+        self, repos: BatchForecastRepositories, product_ids: list[str], data_depth: int, failed: dict[str, str]
+    ) -> dict[str, pd.DataFrame]:
+        sales = repos.sale_repo.find_daily_series_by_product_ids(product_ids, data_depth)
+
+        series: dict[str, pd.DataFrame] = {}
+        for product_id, group in sales.groupby("product_id", sort=False):
+            df = group[["ds", "y"]].reset_index(drop=True)
+            if len(df) <= 30:
+                failed[str(product_id)] = "Not enough data (min 30 days)"
+                continue
+            series[str(product_id)] = df
+
+        for product_id in product_ids:
+            if product_id not in series and product_id not in failed:
+                failed[product_id] = "No sales data found"
+        return series
+
+    def _route(self, repos: BatchForecastRepositories, series: dict[str, pd.DataFrame], update_classification: bool) -> dict[str, Route]:
+        if not series:
+            return {}
+        demand = classify_demand(pd.concat(
+            [df.assign(unique_id=product_id) for product_id, df in series.items()],
+            ignore_index=True,
+        ))
+        classes = dict(zip(demand["unique_id"], demand["demand_class"]))
+
+        if update_classification:
+            repos.product_setting_repo.save_classifications(
+                {product_id: CLASSIFICATIONS[demand_class] for product_id, demand_class in classes.items()}
+            )
+        return {product_id: ROUTES[demand_class] for product_id, demand_class in classes.items()}
+
+    def _run_prophet(
+        self,
+        series: dict[str, pd.DataFrame],
+        models: dict[str, tuple[ProphetModel, ProphetModelSetting | None]],
+        input: GenerateBatchForecastInput,
+        updates: _ProphetUpdates,
+        failed: dict[str, str],
+    ) -> dict[str, pd.DataFrame]:
+        futures: dict[str, Future] = {}
+        prophet_models = {}
+        default_settings: dict[str, ProphetModelSetting] = {}
+
+        for product_id, df in series.items():
+            if product_id not in models:
+                failed[product_id] = "Prophet model was not instantiated"
+                continue
+
+            prophet_model, settings = models[product_id]
+            if settings is None:
+                settings = build_default_prophet_settings(prophet_model_id=prophet_model.id)
+                default_settings[product_id] = settings
+
+            prophet_models[product_id] = prophet_model
+            futures[product_id] = self.executor.submit(
+                forecast_prophet_product,
+                self.model_store,
+                product_id,
+                settings,
+                df,
+                prophet_model.model_path,
+                input["forecast_start_date"],
+                input["forecast_end_date"],
+                input["interval_mode"],
+            )
+
+        results: dict[str, pd.DataFrame] = {}
+        for product_id, future in futures.items():
+            try:
+                forecast_df, trained_model_path = future.result()
+            except Exception as exc:
+                failed[product_id] = failure_message(exc)
+                continue
+            results[product_id] = forecast_df
+
+            if trained_model_path is not None:
+                prophet_model = prophet_models[product_id]
+                prophet_model.model_path = trained_model_path
+                prophet_model.trained_at = datetime.now()
+                updates.trained[product_id] = prophet_model
+            if product_id in default_settings:
+                updates.default_settings[product_id] = default_settings[product_id]
+
+        return results
+
+    def _run_croston(self, series: dict[str, pd.DataFrame], input: GenerateBatchForecastInput, failed: dict[str, str], variant: str) -> dict[str, pd.DataFrame]:
+        product_ids = list(series)
+        chunks = [product_ids[i:i + CROSTON_SERIES_PER_TASK] for i in range(0, len(product_ids), CROSTON_SERIES_PER_TASK)]
+
+        futures: list[tuple[list[str], Future]] = []
+        for chunk in chunks:
+            long_df = pd.concat(
+                [series[product_id].assign(unique_id=product_id) for product_id in chunk],
+                ignore_index=True,
+            )
+            futures.append((chunk, self.executor.submit(
+                forecast_croston_products,
+                long_df,
+                input["forecast_start_date"],
+                input["forecast_end_date"],
+                variant,
+            )))
+
+        results: dict[str, pd.DataFrame] = {}
+        for chunk, future in futures:
+            try:
+                forecasts = future.result()
+            except Exception as exc:
+                for product_id in chunk:
+                    failed[product_id] = failure_message(exc)
+                continue
+
+            for product_id, forecast_df in forecasts.groupby("unique_id", sort=False):
+                results[str(product_id)] = forecast_df.drop(columns="unique_id").reset_index(drop=True)
+            for product_id in chunk:
+                if product_id not in results:
+                    failed[product_id] = "No forecast data falls within the specified date range."
+
+        return results
+
+    def _write(
+        self,
+        repos: BatchForecastRepositories,
+        forecasts: list[Forecast],
+        results: dict[str, pd.DataFrame],
+        updates: _ProphetUpdates,
+    ) -> None:
+        for forecast in forecasts:
+            if forecast.product_id in updates.trained:
+                repos.prophet_model_repo.save(updates.trained[forecast.product_id])
+            if forecast.product_id in updates.default_settings:
+                # persist default settings AFTER training
+                repos.prophet_model_repo.save_model_settings(updates.default_settings[forecast.product_id])
+
+        repos.forecast_repo.create_forecasts(forecasts)
+        repos.forecast_entry_repo.save_forecast_dataframes({f.id: results[f.product_id] for f in forecasts})
+        repos.forecast_repo.mark_processed([f.id for f in forecasts])
@@ -1,23 +1,29 @@
 from fastapi import HTTPException, status
-from typing import TypedDict, Literal
-from datetime import date, timedelta
-from forecasting_module.domain.services.forecast_manager import ForecastManager
-from forecasting_module.infra.database.repositories.forecast_entry_repo import ForecastEntryRepository
-from forecasting_module.infra.database.repositories.forecast_repo import ForecastRepository
-from forecasting_module.infra.database.repositories.product_repo import ProductRepository
-from forecasting_module.infra.database.repositories.product_setting_repo import ProductSettingRepository
-from forecasting_module.infra.database.repositories.sale_repo import SaleRepository
-from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelRepository, ProphetModelSetting, build_default_prophet_settings, build_prophet_from_settings
+from contextlib import AbstractAsyncContextManager
+from typing import Awaitable, Callable, TypedDict, Literal
+from datetime import date
+from dataclasses import dataclass
 import pandas as pd
-from prophet import Prophet
-from pathlib import Path
+from forecasting_module.domain.entities.forecast import Forecast
+from forecasting_module.domain.entities.product import Product
+from forecasting_module.domain.entities.prophet_model import ProphetModel
+from forecasting_module.domain.services.forecast_manager import ForecastManager, CROSTON_VARIANT
+from forecasting_module.infra.database.repositories.forecast_entry_repo import AsyncForecastEntryRepository
+from forecasting_module.infra.database.repositories.forecast_repo import AsyncForecastRepository
+from forecasting_module.infra.database.repositories.product_repo import AsyncProductRepository
+from forecasting_module.infra.database.repositories.sale_repo import AsyncSaleRepository
+from forecasting_module.infra.database.repositories.prophet_model_repo import (
+    AsyncProphetModelRepository,
+    ProphetModelSetting,
+    build_default_prophet_settings,
+)
+from forecasting_module.application.services.prophet_training import fit_or_load_prophet
+from forecasting_module.application.services.forecast_fingerprint import forecast_input_fingerprint
+from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore, settings_fingerprint
+from forecasting_module.infra.storage.prophet_model_cache import ProphetModelCache, model_cache
+from forecasting_module.infra.metrics import FORECASTS, time_stage
 from datetime import datetime
 
-
-BASE_DIR = Path(__file__).resolve().parents[5]
-MODELS_DIR = BASE_DIR / "storage" / "models" / "prophet"
-MODELS_DIR.mkdir(parents=True, exist_ok=True)
-
 class GenerateSingleForecastInput(TypedDict):
     forecast_id: str
     product_id: str
@@ -29,109 +35,210 @@ class GenerateSingleForecastInput(TypedDict):
 
 
 
-class GenerateSingleForecastUsecase:
-    def __init__( 
-        self, 
-        product_repo: ProductRepository, 
-        sale_repo: SaleRepository, 
-        forecast_repo: ForecastRepository, 
-        setting_repo: ProductSettingRepository, 
-        forecast_entry_repo: ForecastEntryRepository ,
-        prophet_model_repo: ProphetModelRepository, 
-    ) -> None: 
-        self.product_repo = product_repo 
-        self.sale_repo = sale_repo 
-        self.forecast_repo = forecast_repo 
-        self.forecast_entry_repo = forecast_entry_repo 
-        self.setting_repo = setting_repo
-        self.prophet_model_repo= prophet_model_repo
-
-    def handle(self, input: GenerateSingleForecastInput):
-        product = self.product_repo.find_one_by_id(input["product_id"])
-        if not product:
-            raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"message": "Product not found"})
-
-        bounds = self.sale_repo.get_date_bounds(product.id)
-        if not bounds:
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "No sales data found"})
-
-        first_date, last_date = bounds
-        total_days = (last_date - first_date).days + 1
-
-        # Compute cutoff date based on data_depth percentage
-        keep_ratio = input["data_depth"] / 100  # data_depth = 80 means 80%
-        cutoff_offset = int(total_days * (1 - keep_ratio))
-        cutoff_date = first_date + timedelta(days=cutoff_offset)
-
-        # Fetch only the relevant portion of sales
-        sales = self.sale_repo.find_by_product_id_and_date_range(
-            product.id, cutoff_date, last_date
+@dataclass
+class SingleForecastRepositories:
+    """The async repositories of one transaction."""
+    product_repo: AsyncProductRepository
+    sale_repo: AsyncSaleRepository
+    forecast_repo: AsyncForecastRepository
+    forecast_entry_repo: AsyncForecastEntryRepository
+    prophet_model_repo: AsyncProphetModelRepository
+
+
+class GenerateSingleForecastAsyncUsecase:
+    """
+    Generate one forecast with its database stages on the event loop.
+
+    Loading the forecast, settings and sales and writing the entries await async
+    repositories, so many forecasts overlap their I/O on one loop; the fit and
+    predict go through `run_in_worker` (a process pool) and never block it.
+
+    Loading and writing run in two short transactions from `transaction`, and no
+    connection is held during the fit: the write re-takes the forecast lock and
+    skips the entries when an overlapping run already stored the same inputs.
+    """
+
+    def __init__(
+        self,
+        transaction: Callable[[], AbstractAsyncContextManager[SingleForecastRepositories]],
+        model_store: ProphetModelStore,
+        run_in_worker: Callable[..., Awaitable],
+    ) -> None:
+        self.transaction = transaction
+        self.model_store = model_store
+        self.run_in_worker = run_in_worker
+
+    async def handle(self, input: GenerateSingleForecastInput) -> str:
+        method = input["forecasting_method"]
+
+        async with self.transaction() as repos:
+            with time_stage(method, "load_forecast"):
+                await repos.forecast_repo.lock_forecast(input["forecast_id"])
+
+                product = await repos.product_repo.find_one_by_id(input["product_id"])
+                product, forecast = _check_forecast(product, await repos.forecast_repo.get_forecast(input["forecast_id"]))
+
+                prophet_model, prophet_model_settings = None, None
+                if forecast.model_type == "prophet":
+                    prophet_model, prophet_model_settings = await repos.prophet_model_repo.get_model_with_settings_by_product_id(product.id)
+                plan = _plan(product, forecast, prophet_model, prophet_model_settings)
+
+            with time_stage(method, "sales_checksum"):
+                sales_checksum = await repos.sale_repo.get_daily_series_checksum(product.id, input["data_depth"])
+            input_fingerprint = _input_fingerprint(input, plan, sales_checksum)
+            if forecast.input_fingerprint == input_fingerprint:
+                FORECASTS.labels(method, "unchanged").inc()
+                return str(forecast.id)
+
+            with time_stage(method, "load_sales"):
+                df = _check_sales(await repos.sale_repo.find_daily_series(product.id, input["data_depth"]))
+
+        # includes waiting for a free worker and shipping the series to it
+        with time_stage(method, "compute"):
+            future, trained_model_path = await self.run_in_worker(
+                forecast_product_task,
+                self.model_store,
+                plan,
+                df,
+                input["forecast_start_date"],
+                input["forecast_end_date"],
+            )
+
+        async with self.transaction() as repos:
+            with time_stage(method, "write_entries"):
+                await repos.forecast_repo.lock_forecast(forecast.id)
+                _, current = _check_forecast(product, await repos.forecast_repo.get_forecast(forecast.id))
+                if current.input_fingerprint == input_fingerprint:
+                    FORECASTS.labels(method, "unchanged").inc()
+                    return str(forecast.id)
+
+                if plan.trained(trained_model_path):
+                    await repos.prophet_model_repo.save(plan.prophet_model)  # pyright: ignore
+                if plan.use_default_settings:
+                    await repos.prophet_model_repo.save_model_settings(plan.settings)  # pyright: ignore
+
+                await repos.forecast_entry_repo.replace_forecast_dataframe(forecast.id, future)
+                await repos.forecast_repo.mark_processed([forecast.id], input_fingerprint=input_fingerprint)
+        FORECASTS.labels(method, "generated").inc()
+        return str(forecast.id)
+
+
+@dataclass
+class ForecastPlan:
+    """What a forecast will be computed with, resolved from its stored rows."""
+    product_id: str
+    model_type: str
+    prophet_model: ProphetModel | None = None
+    settings: ProphetModelSetting | None = None
+    use_default_settings: bool = False
+
+    @property
+    def model_fingerprint(self) -> str:
+        return settings_fingerprint(self.settings) if self.settings is not None else CROSTON_VARIANT
+
+    def trained(self, trained_model_path: str | None) -> bool:
+        """Record a newly trained artifact on the model row; True when it must be saved."""
+        if self.prophet_model is None or trained_model_path is None:
+            return False
+        self.prophet_model.model_path = trained_model_path
+        self.prophet_model.trained_at = datetime.now()
+        return True
+
+
+def _check_forecast(product: Product | None, forecast: Forecast | None) -> tuple[Product, Forecast]:
+    if not product:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"message": "Product not found"})
+
+    if not forecast:
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail={
+            "message": "Internal Server Error",
+            "debugMessage": "Forecast was not instantiated"
+        })
+    return product, forecast
+
+
+def _plan(
+    product: Product,
+    forecast: Forecast,
+    prophet_model: ProphetModel | None,
+    prophet_model_settings: ProphetModelSetting | None,
+) -> ForecastPlan:
+    if forecast.model_type != "prophet":
+        return ForecastPlan(product.id, forecast.model_type)
+
+    if prophet_model is None:
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail={
+            "message": "Internal Server Error",
+            "debugMessage": "Prophet model was not instantiated"
+        })
+
+    use_default_settings = prophet_model_settings is None
+    if prophet_model_settings is None:
+        prophet_model_settings = build_default_prophet_settings(prophet_model_id=prophet_model.id)
+    return ForecastPlan(product.id, forecast.model_type, prophet_model, prophet_model_settings, use_default_settings)
+
+
+def _input_fingerprint(input: GenerateSingleForecastInput, plan: ForecastPlan, sales_checksum: str | None) -> str:
+    return forecast_input_fingerprint(
+        sales_checksum=sales_checksum,
+        forecasting_method=plan.model_type,
+        model_fingerprint=plan.model_fingerprint,
+        data_depth=input["data_depth"],
+        forecast_start_date=input["forecast_start_date"],
+        forecast_end_date=input["forecast_end_date"],
+    )
+
+
+def _check_sales(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "No sales data found"})
+
+    if len(df) <= 30:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "Not enough data (min 30 days)"})
+    return df
+
+
+def forecast_product(
+    model_store: ProphetModelStore,
+    plan: ForecastPlan,
+    sales: pd.DataFrame,
+    forecast_start_date: date,
+    forecast_end_date: date,
+    model_cache: ProphetModelCache | None = None,
+) -> tuple[pd.DataFrame, str | None]:
+    """
+    The CPU-bound stage: fit (or load) the model and predict the window.
+    Returns the forecast and the path of a newly trained Prophet artifact, if any.
+    """
+    forecast_mgr = ForecastManager()
+    if plan.model_type != "prophet":
+        with time_stage(plan.model_type, "predict"):
+            return forecast_mgr.croston_forecast(sales, forecast_start_date, forecast_end_date), None
+
+    with time_stage("prophet", "fit"):
+        model, trained_model_path = fit_or_load_prophet(
+            model_store,
+            plan.product_id,
+            plan.settings,  # pyright: ignore
+            sales,
+            previous_model_path=plan.prophet_model.model_path,  # pyright: ignore
+            model_cache=model_cache,
         )
-
-        if len(sales) == 0:
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "No sales found in selected range"})
-
-        # Convert to DataFrame for aggregation
-        df = pd.DataFrame([{"ds": s.date, "y": s.quantity} for s in sales])
-
-        # Ensure proper datetime type
-        df["ds"] = pd.to_datetime(df["ds"])
-
-        # Create a complete daily range between the first and last sales date
-        full_range = pd.date_range(df["ds"].min(), df["ds"].max(), freq="D")
-
-        # Reindex to include missing dates and fill with 0s
-        df = (
-            df.set_index("ds")
-              .reindex(full_range, fill_value=0)
-              .rename_axis("ds")
-              .reset_index()
+    with time_stage("prophet", "predict"):
+        future = forecast_mgr.prophet_predict(
+            model=model,
+            forecast_start_date=forecast_start_date,
+            forecast_end_date=forecast_end_date,
         )
-
-        if len(df) <= 30:
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "Not enough data (min 30 days)"})
-
-        forecast = self.forecast_repo.get_forecast(input["forecast_id"])
-        if not forecast:
-            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail={
-                "message": "Internal Server Error",
-                "debugMessage": "Forecast was not instantiated"
-            })
-
-        # clear previous forecast entries
-        self.forecast_entry_repo.delete_entries_by_forecast_id(forecast.id)
-        forecast_mgr = ForecastManager()
-        if forecast.model_type == "prophet":
-            prophet_model_settings = self.prophet_model_repo.get_model_settings_by_product_id(product.id)
-            if prophet_model_settings is None:
-                prophet_model = self.prophet_model_repo.get_model_by_product_id(product.id)
-                model = Prophet()
-                future, trained_model = forecast_mgr.prophet_forecast(
-                    model=model,
-                    forecast_end_date=input["forecast_end_date"],
-                    forecast_start_date=input["forecast_start_date"],
-                    sales=df
-                )
-
-                # persist default settings AFTER training
-                default_settings = build_default_prophet_settings(
-                    prophet_model_id=prophet_model.id,
-                    model=model
-                )
-                self.prophet_model_repo.save_model_settings(default_settings)
-            else:
-                model = build_prophet_from_settings(prophet_model_settings)
-                future, trained_model = forecast_mgr.prophet_forecast(
-                    model=model,
-                    forecast_end_date=input["forecast_end_date"],
-                    forecast_start_date=input["forecast_start_date"],
-                    sales=df
-                )
-        else:
-            future = forecast_mgr.croston_forecast(df, input["forecast_start_date"], input["forecast_end_date"])
-
-        if future is None:
-            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail={"message": "Forecasting failed"})
-
-        self.forecast_entry_repo.save_forecast_dataframe(forecast.id, future)
-        return str(forecast.id)
\ No newline at end of file
+    return future, trained_model_path
+
+
+def forecast_product_task(
+    model_store: ProphetModelStore,
+    plan: ForecastPlan,
+    sales: pd.DataFrame,
+    forecast_start_date: date,
+    forecast_end_date: date,
+) -> tuple[pd.DataFrame, str | None]:
+    # executor entry point: `model_cache` is the executing worker's own cache
+    return forecast_product(model_store, plan, sales, forecast_start_date, forecast_end_date, model_cache=model_cache)
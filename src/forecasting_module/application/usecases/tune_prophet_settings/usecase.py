@@ -0,0 +1,334 @@
+import math
+from fastapi import HTTPException, status
+from contextlib import AbstractContextManager
+from typing import Any, Callable, TypedDict, Literal
+from datetime import date
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Executor, Future
+from uuid_utils import uuid7
+import pandas as pd
+from forecasting_module.domain.services.backtest import backtest_offsets, naive_scales, rolling_cutoffs, score_backtest
+from forecasting_module.domain.services.hyperparameter_search import (
+    DEFAULT_SEARCH_SPACE,
+    TUNABLE_SETTINGS,
+    grid_candidates,
+    halving_rungs,
+    random_candidates,
+)
+from forecasting_module.infra.database.repositories.product_repo import ProductRepository
+from forecasting_module.infra.database.repositories.sale_repo import SaleRepository
+from forecasting_module.infra.database.repositories.prophet_model_repo import (
+    ProphetModelRepository,
+    ProphetModelSetting,
+    ProphetSeasonality,
+    build_default_prophet_settings,
+)
+from forecasting_module.application.services.account_products import resolve_account_product_ids
+from forecasting_module.application.usecases.backtest_forecast.usecase import backtest_prophet_window
+from forecasting_module.application.services.fan_out import failure_message
+
+
+class TuneProphetSettingsInput(TypedDict):
+    account_id: str
+    product_ids: list[str] | None
+    data_depth: int
+    # candidates are backtested on this window, replayed from rolling cutoffs
+    forecast_start_date: date
+    forecast_end_date: date
+    # setting -> values to try; None: DEFAULT_SEARCH_SPACE
+    search_space: dict[str, list[Any]] | None
+    search: Literal["grid", "random"]
+    # random search only
+    n_candidates: int
+    seed: int | None
+    n_windows: int
+    # days between cutoffs; None: the window length
+    step_days: int | None
+    # successive halving keeps the best 1/eta per rung; None: every candidate on every window
+    halving_eta: int | None
+
+
+class TunedProphetSettings(TypedDict):
+    # the winning values of the searched settings
+    params: dict[str, Any]
+    mae: float
+    rmse: float
+    mase: float | None
+    windows: int
+
+
+class DroppedCandidate(TypedDict):
+    params: dict[str, Any]
+    error: str
+
+
+class TuneProphetSettingsResult(TypedDict):
+    tuned: dict[str, TunedProphetSettings]
+    candidates: int
+    # Prophet fits run across all products and rungs
+    fits: int
+    # product -> candidates that could not be fitted (not the ones pruned by halving)
+    dropped: dict[str, list[DroppedCandidate]]
+    failed: dict[str, str]
+
+
+# --- Executor tasks (module-level so they can be pickled) ---
+
+def backtest_prophet_candidate(
+    product_id: str,
+    settings: ProphetModelSetting,
+    sales: pd.DataFrame,
+    cutoffs: list[pd.Timestamp],
+    lead: int,
+    horizon: int,
+) -> pd.DataFrame:
+    """Backtest one candidate on several cutoffs in one task, so its sales are sent once."""
+    return pd.concat(
+        [backtest_prophet_window(product_id, settings, sales, cutoff, lead, horizon) for cutoff in cutoffs],
+        ignore_index=True,
+    )
+
+
+@dataclass
+class TuneProphetSettingsRepositories:
+    """The repositories of one transaction."""
+    product_repo: ProductRepository
+    sale_repo: SaleRepository
+    prophet_model_repo: ProphetModelRepository
+
+
+@dataclass
+class _ProductSearch:
+    product_id: str
+    sales: pd.DataFrame
+    # newest first: the first windows of every rung are the ones already scored
+    cutoffs: list[pd.Timestamp]
+    lead: int
+    horizon: int
+    # candidate index -> settings, for the candidates still in the search
+    candidates: dict[int, ProphetModelSetting]
+    frames: dict[int, list[pd.DataFrame]] = field(default_factory=dict)
+    scored_windows: int = 0
+
+
+class TuneProphetSettingsUsecase:
+    """
+    Search Prophet settings per product and save the winner.
+
+    Candidates come from a grid or a random draw over the search space and are
+    scored like a backtest: MASE over rolling-origin windows. Successive halving
+    spends the windows as the budget, so most candidates are dropped after a
+    single fit on the most recent window and only the best are fitted on the rest.
+    Sales are loaded once for all products; each rung submits one task per
+    (product, candidate) to `executor` and waits for all of them before pruning.
+
+    A search can run for hours, so no connection is held during it: products and
+    sales are loaded in one transaction from `transaction` and each winner is saved
+    in its own.
+    """
+
+    def __init__(
+        self,
+        transaction: Callable[[], AbstractContextManager[TuneProphetSettingsRepositories]],
+        executor: Executor,
+    ) -> None:
+        self.transaction = transaction
+        self.executor = executor
+
+    def handle(self, input: TuneProphetSettingsInput) -> TuneProphetSettingsResult:
+        candidates = _candidates(input)
+        if input["n_windows"] < 1:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "At least one backtest window is required"})
+
+        failed: dict[str, str] = {}
+        dropped: dict[str, list[DroppedCandidate]] = {}
+        with self.transaction() as repos:
+            product_ids = resolve_account_product_ids(repos.product_repo, input["account_id"], input["product_ids"], failed)
+            searches = self._prepare(repos, product_ids, candidates, input, failed)
+
+        rungs = halving_rungs(len(candidates), input["n_windows"], input["halving_eta"])
+        fits = 0
+        scores = None
+        for rung, (windows, _) in enumerate(rungs):
+            fits += self._run_rung(searches, windows, candidates, dropped, failed)
+            searches = [s for s in searches if s.candidates]
+            if not searches:
+                break
+            scores = self._score(searches)
+
+            keep = rungs[rung + 1][1] if rung + 1 < len(rungs) else 1
+            _keep_best(searches, scores, keep, failed)
+            searches = [s for s in searches if s.candidates]
+
+        tuned: dict[str, TunedProphetSettings] = {}
+        for search in searches:
+            (index, settings), = search.candidates.items()
+            with self.transaction() as repos:
+                repos.prophet_model_repo.save_model_settings(settings)
+            row = scores[(scores["unique_id"] == search.product_id) & (scores["method"] == str(index))].iloc[0]  # pyright: ignore
+            tuned[search.product_id] = {
+                "params": candidates[index],
+                "mae": float(row.mae),
+                "rmse": float(row.rmse),
+                "mase": None if math.isnan(row.mase) else float(row.mase),
+                "windows": int(row.windows),
+            }
+
+        return {"tuned": tuned, "candidates": len(candidates), "fits": fits, "dropped": dropped, "failed": failed}
+
+    def _prepare(
+        self,
+        repos: TuneProphetSettingsRepositories,
+        product_ids: list[str],
+        candidates: list[dict[str, Any]],
+        input: TuneProphetSettingsInput,
+        failed: dict[str, str],
+    ) -> list[_ProductSearch]:
+        sales = repos.sale_repo.find_daily_series_by_product_ids(product_ids, input["data_depth"])
+        models = repos.prophet_model_repo.get_models_with_settings_by_product_ids(product_ids)
+
+        searches = []
+        for product_id, group in sales.groupby("product_id", sort=False):
+            product_id = str(product_id)
+            if product_id not in models:
+                failed[product_id] = "Prophet model was not instantiated"
+                continue
+
+            series = group[["ds", "y"]].reset_index(drop=True)
+            last_date = series["ds"].max()
+            lead, horizon = backtest_offsets(last_date.date(), input["forecast_start_date"], input["forecast_end_date"])
+            if horizon <= 0:
+                failed[product_id] = f"Forecast end date ({input['forecast_end_date']}) must be after last sale date ({last_date.date()})."
+                continue
+
+            step = input["step_days"] or horizon - lead + 1
+            # every cutoff keeps the 30 days of history a forecast needs
+            if len(series) - horizon - step * (input["n_windows"] - 1) <= 30:
+                failed[product_id] = f"Not enough data for {input['n_windows']} backtest windows (min 30 days each)"
+                continue
+
+            prophet_model, settings = models[product_id]
+            base = settings or build_default_prophet_settings(prophet_model_id=prophet_model.id)
+            searches.append(_ProductSearch(
+                product_id=product_id,
+                sales=series,
+                cutoffs=rolling_cutoffs(last_date, horizon, input["n_windows"], step)[::-1],
+                lead=lead,
+                horizon=horizon,
+                candidates={i: _candidate_settings(base, candidate) for i, candidate in enumerate(candidates)},
+            ))
+
+        loaded = set(sales["product_id"].astype(str))
+        for product_id in product_ids:
+            if product_id not in loaded:
+                failed[product_id] = "No sales data found"
+        return searches
+
+    def _run_rung(
+        self,
+        searches: list[_ProductSearch],
+        windows: int,
+        candidates: list[dict[str, Any]],
+        dropped: dict[str, list[DroppedCandidate]],
+        failed: dict[str, str],
+    ) -> int:
+        """Fit the surviving candidates on the rung's windows they were not scored on yet."""
+        futures: list[tuple[_ProductSearch, int, Future]] = []
+        fits = 0
+        for search in searches:
+            cutoffs = search.cutoffs[search.scored_windows:windows]
+            for index, settings in search.candidates.items():
+                futures.append((search, index, self.executor.submit(
+                    backtest_prophet_candidate,
+                    search.product_id, settings, search.sales, cutoffs, search.lead, search.horizon,
+                )))
+                fits += len(cutoffs)
+
+        for search, index, future in futures:
+            try:
+                search.frames.setdefault(index, []).append(future.result())
+            except Exception as exc:
+                # a candidate that cannot be fitted drops out; the product fails only without any left
+                del search.candidates[index]
+                dropped.setdefault(search.product_id, []).append(
+                    {"params": candidates[index], "error": failure_message(exc)}
+                )
+                if not search.candidates:
+                    failed[search.product_id] = "No candidate could be fitted"
+
+        for search in searches:
+            search.scored_windows = windows
+        return fits
+
+    def _score(self, searches: list[_ProductSearch]) -> pd.DataFrame:
+        """Scores of every surviving candidate over all the windows it was fitted on, as `score_backtest`."""
+        long = pd.concat(
+            [
+                frame.assign(method=str(index))
+                for search in searches
+                for index in search.candidates
+                for frame in search.frames[index]
+            ],
+            ignore_index=True,
+        )
+        # one forecast column per candidate; products that dropped a candidate leave it empty
+        cv = long.pivot_table(
+            index=["unique_id", "cutoff", "ds", "y"], columns="method", values="prophet", aggfunc="first"
+        ).reset_index()
+        cv.columns.name = None
+
+        history = pd.concat(
+            [search.sales.assign(unique_id=search.product_id) for search in searches],
+            ignore_index=True,
+        )
+        methods = [c for c in cv.columns if c not in ("unique_id", "cutoff", "ds", "y")]
+        return score_backtest(cv, naive_scales(history, cv), methods)
+
+
+def _candidates(input: TuneProphetSettingsInput) -> list[dict[str, Any]]:
+    space = input["search_space"] or DEFAULT_SEARCH_SPACE
+    unknown = [name for name in space if name not in TUNABLE_SETTINGS]
+    if unknown:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": f"Settings cannot be searched: {', '.join(unknown)}"})
+    if any(not values for values in space.values()):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail={"message": "Every searched setting needs at least one value"})
+
+    if input["search"] == "random":
+        return random_candidates(space, input["n_candidates"], input["seed"])
+    return grid_candidates(space)
+
+
+def _candidate_settings(base: ProphetModelSetting, candidate: dict[str, Any]) -> ProphetModelSetting:
+    """`base` with the candidate's values; its changepoints and the settings row id are kept."""
+    params = dict(candidate)
+    if "seasons" in params:
+        params["seasons"] = [
+            ProphetSeasonality(
+                id=str(uuid7()),
+                model_setting_id=base.id,
+                name=s["name"],
+                period=float(s["period"]),
+                fourier_order=int(s["fourier_order"]),
+                prior_scale=s.get("prior_scale"),
+                mode=s.get("mode"),
+            )
+            for s in params["seasons"]
+        ]
+    return replace(base, **params)
+
+
+def _keep_best(searches: list[_ProductSearch], scores: pd.DataFrame, keep: int, failed: dict[str, str]) -> None:
+    # lowest MASE first; MAE where MASE is undefined (constant history)
+    ranked = scores.assign(rank_key=scores["mase"].fillna(scores["mae"])).sort_values(["unique_id", "rank_key"])
+    best = ranked.groupby("unique_id", sort=False).head(keep)
+
+    kept: dict[str, set[int]] = {}
+    for product_id, method in zip(best["unique_id"], best["method"]):
+        kept.setdefault(str(product_id), set()).add(int(method))
+    for search in searches:
+        survivors = kept.get(search.product_id, set())
+        if not survivors:
+            # every fit succeeded but none forecast a day that could be scored
+            failed[search.product_id] = "No candidate could be scored"
+        search.candidates = {i: s for i, s in search.candidates.items() if i in survivors}
+        search.frames = {i: f for i, f in search.frames.items() if i in survivors}
@@ -0,0 +1,144 @@
+import os
+import atexit
+import asyncio
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar, ParamSpec
+from fastapi import HTTPException, status
+from dotenv import load_dotenv
+from forecasting_module.config.jit import JIT_WARM_UP
+
+load_dotenv()
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", os.cpu_count() or 1))
+FORECAST_MAX_IN_FLIGHT = int(os.getenv("FORECAST_MAX_IN_FLIGHT", FORECAST_WORKERS * 2))
+FORECAST_BUSY_RETRY_AFTER = int(os.getenv("FORECAST_BUSY_RETRY_AFTER", 5))
+
+
+def _init_worker() -> None:
+    # runs once in each fresh worker process
+    from forecasting_module.infra.metrics import mark_process_dead
+    atexit.register(mark_process_dead)
+    if JIT_WARM_UP:
+        from forecasting_module.domain.services.forecast_manager import warm_up_croston
+        warm_up_croston()
+
+
+def _ready() -> None:
+    pass
+
+
+class BoundedExecutor(Executor):
+    """
+    Submits to `executor` with at most `max_pending` of its tasks queued or running
+    there; `submit` blocks until one finishes. Offline jobs fan out through it, so
+    tasks submitted straight to the pool (single forecasts) queue behind at most
+    `max_pending` of theirs instead of their whole backlog.
+    """
+
+    def __init__(self, executor: Executor, max_pending: int) -> None:
+        self._executor = executor
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+class ForecastWorkerPool:
+    """
+    Process pool for CPU-bound forecasting work.
+
+    At most `max_in_flight` jobs are accepted at a time (running plus queued
+    inside the executor); anything beyond that is rejected with a 503 so the
+    caller can retry instead of piling up behind long fits.
+    """
+
+    def __init__(self, max_workers: int, max_in_flight: int) -> None:
+        self.max_workers = max_workers
+        self.max_in_flight = max(max_in_flight, max_workers)
+        self.in_flight = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._offline_executor: BoundedExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a process that holds open connections and threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    @property
+    def offline_executor(self) -> BoundedExecutor:
+        """
+        The executor for batch, backtest and tuning fan-outs: shared by all of
+        them, with one queued or running task per worker at most.
+        """
+        if self._offline_executor is None:
+            self._offline_executor = BoundedExecutor(self.executor, self.max_workers)
+        return self._offline_executor
+
+    def is_saturated(self) -> bool:
+        return self.in_flight >= self.max_in_flight
+
+    @contextmanager
+    def _admit(self):
+        if self.is_saturated():
+            raise HTTPException(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"message": "Forecast workers are busy, retry later"},
+                headers={"Retry-After": str(FORECAST_BUSY_RETRY_AFTER)},
+            )
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    async def run(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run `fn` in a worker process."""
+        with self._admit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def run_threaded(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """
+        Run `fn` in a thread of this process. Meant for orchestration (database I/O
+        plus fanning work out to `executor`); counts as a single in-flight job.
+        """
+        with self._admit():
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def warm_up(self) -> None:
+        """Start every worker now, so their initializer runs before the first request."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _ready) for _ in range(self.max_workers)))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._offline_executor = None
+
+
+worker_pool = ForecastWorkerPool(
+    max_workers=FORECAST_WORKERS,
+    max_in_flight=FORECAST_MAX_IN_FLIGHT,
+)
@@ -0,0 +1,15 @@
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+from forecasting_module.config.storage import STORAGE_DIR
+
+load_dotenv()
+
+# numba reads NUMBA_CACHE_DIR when it is first imported, so this module must be
+# imported before numba (directly or through statsforecast). Worker processes
+# inherit the variable and share the compiled kernels on disk (numba creates the directory).
+NUMBA_CACHE_DIR = Path(os.getenv("NUMBA_CACHE_DIR", STORAGE_DIR / "numba_cache"))
+os.environ["NUMBA_CACHE_DIR"] = str(NUMBA_CACHE_DIR)
+
+# Compile and load the Croston kernels when the API and each worker start
+JIT_WARM_UP = os.getenv("JIT_WARM_UP", "true").lower() == "true"
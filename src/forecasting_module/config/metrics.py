@@ -0,0 +1,21 @@
+import os
+import atexit
+import shutil
+import tempfile
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# prometheus_client reads PROMETHEUS_MULTIPROC_DIR when it is first imported, so this
+# module must be imported before it; the package __init__ does so. Every process (the API, the job runner and the
+# forecast workers, which inherit the variable) writes its samples to files there and
+# `/metrics` aggregates them. Without an explicit directory each main process gets a
+# fresh one, so samples of a previous run are never summed in.
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="forecasting-metrics-")
+    atexit.register(shutil.rmtree, os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+PROMETHEUS_MULTIPROC_DIR = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+
+# Serve `/metrics` from a standalone job runner (the API serves it on its own port)
+FORECAST_JOB_RUNNER_METRICS_PORT = int(os.getenv("FORECAST_JOB_RUNNER_METRICS_PORT", 0))
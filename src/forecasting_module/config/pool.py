@@ -1,5 +1,5 @@
 import os 
-from psycopg_pool import ConnectionPool
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,14 +9,26 @@ DATABASE_URL = (
     f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 )
 
+# Opened by the app lifespan (and the worker initializer), not at import
 pool = ConnectionPool(
     conninfo=DATABASE_URL,
+    open=False,
     min_size=int(os.getenv("DB_MIN_CONN", 1)),
     max_size=int(os.getenv("DB_MAX_CONN", 10)),
     num_workers=3,  # optional
     timeout=10,     # seconds
 )
 
+# Serves the event loop: API requests, the job queue and the I/O stages of
+# single forecasts. Opened with `await async_pool.open()` in the lifespan.
+async_pool = AsyncConnectionPool(
+    conninfo=DATABASE_URL,
+    open=False,
+    min_size=int(os.getenv("DB_ASYNC_MIN_CONN", os.getenv("DB_MIN_CONN", 1))),
+    max_size=int(os.getenv("DB_ASYNC_MAX_CONN", os.getenv("DB_MAX_CONN", 10))),
+    timeout=10,
+)
+
 def get_all_users():
     with pool.connection() as conn:
         with conn.cursor() as cur:
@@ -24,6 +36,7 @@ def get_all_users():
             return cur.fetchall()
 
 if __name__ == "__main__":
+    pool.open()
     users = get_all_users()
     for user in users:
         print(user)
@@ -0,0 +1,12 @@
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parents[3]
+STORAGE_DIR = BASE_DIR / "storage"
+MODELS_DIR = STORAGE_DIR / "models" / "prophet"
+PROFILES_DIR = STORAGE_DIR / "profiles"
+
+
+def init_storage() -> None:
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
@@ -16,3 +16,4 @@ class Forecast:
     created_at: datetime
     updated_at: datetime
     deleted_at: datetime | None
+    input_fingerprint: str | None = None
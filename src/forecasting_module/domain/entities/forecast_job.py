@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
+
+ForecastJobKind = Literal["single", "batch", "backtest", "tune"]
+ForecastJobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+@dataclass
+class ForecastJob:
+    id: str
+    kind: ForecastJobKind
+    status: ForecastJobStatus
+    payload: dict[str, Any]
+    result: dict[str, Any] | None
+    error: dict[str, Any] | None
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
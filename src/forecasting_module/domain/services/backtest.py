@@ -0,0 +1,88 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+
+
+# Seasonal period of the naive forecast that scales MASE: daily sales repeat weekly
+MASE_SEASONALITY = 7
+
+
+def backtest_offsets(last_date: date, forecast_start_date: date, forecast_end_date: date) -> tuple[int, int]:
+    """
+    Position of a forecast window relative to the last day of history, as
+    (lead, horizon): the window covers days `lead`..`horizon` after it. A backtest
+    replays the same offsets from every cutoff.
+    """
+    horizon = (forecast_end_date - last_date).days
+    lead = max((forecast_start_date - last_date).days, 1)
+    return lead, horizon
+
+
+def rolling_cutoffs(last_date: pd.Timestamp, horizon: int, n_windows: int, step: int) -> list[pd.Timestamp]:
+    """Last training day of each window, as in StatsForecast.cross_validation: the last window ends on `last_date`."""
+    return [last_date - pd.Timedelta(days=horizon + step * (n_windows - 1 - i)) for i in range(n_windows)]
+
+
+def naive_scales(series: pd.DataFrame, cutoffs: pd.DataFrame, seasonality: int = MASE_SEASONALITY) -> pd.DataFrame:
+    """
+    MASE denominators: the in-sample MAE of the seasonal naive forecast on each
+    series' history up to each cutoff.
+
+    Args:
+        series (pd.DataFrame): Long dense daily series ['unique_id', 'ds', 'y'].
+        cutoffs (pd.DataFrame): ['unique_id', 'cutoff'] pairs to scale.
+
+    Returns:
+        pd.DataFrame: ['unique_id', 'cutoff', 'scale']; NaN when the history is
+        shorter than a season or constant.
+    """
+    df = series[["unique_id", "ds", "y"]].sort_values(["unique_id", "ds"])
+    diff = df.groupby("unique_id", sort=False)["y"].diff(seasonality).abs()
+    df = df.assign(
+        diff_sum=diff.fillna(0).groupby(df["unique_id"], sort=False).cumsum(),
+        diff_count=diff.notna().groupby(df["unique_id"], sort=False).cumsum(),
+    )
+
+    scales = cutoffs[["unique_id", "cutoff"]].drop_duplicates().merge(
+        df, left_on=["unique_id", "cutoff"], right_on=["unique_id", "ds"], how="left"
+    )
+    scale = scales["diff_sum"] / scales["diff_count"]
+    return scales[["unique_id", "cutoff"]].assign(scale=scale.where(scale > 0))
+
+
+def score_backtest(cv: pd.DataFrame, scales: pd.DataFrame, methods: list[str]) -> pd.DataFrame:
+    """
+    Accuracy of rolling-origin forecasts per series and method.
+
+    Args:
+        cv (pd.DataFrame): ['unique_id', 'cutoff', 'ds', 'y'] plus one forecast
+            column per method, for the scored days of every window.
+        scales (pd.DataFrame): `naive_scales` of the same windows.
+        methods (list[str]): Forecast columns of `cv` to score.
+
+    Returns:
+        pd.DataFrame: ['unique_id', 'method', 'mae', 'rmse', 'mase', 'windows'].
+        MAE and MASE are averaged over windows, RMSE is taken over all scored days.
+        Missing forecasts are left out, so a method is only scored where it ran.
+    """
+    long = cv.melt(
+        id_vars=["unique_id", "cutoff", "ds", "y"], value_vars=methods, var_name="method", value_name="yhat"
+    ).dropna(subset=["yhat"])
+    error = long["yhat"] - long["y"]
+    long = long.assign(abs_error=error.abs(), sq_error=error ** 2)
+
+    windows = (
+        long.groupby(["unique_id", "method", "cutoff"], sort=False)
+            .agg(mae=("abs_error", "mean"), mse=("sq_error", "mean"))
+            .reset_index()
+            .merge(scales, on=["unique_id", "cutoff"], how="left")
+    )
+    windows["mase"] = windows["mae"] / windows["scale"]
+
+    scores = (
+        windows.groupby(["unique_id", "method"], sort=False)
+               .agg(mae=("mae", "mean"), mse=("mse", "mean"), mase=("mase", "mean"), windows=("cutoff", "nunique"))
+               .reset_index()
+    )
+    scores["rmse"] = np.sqrt(scores.pop("mse"))
+    return scores[["unique_id", "method", "mae", "rmse", "mase", "windows"]]
@@ -0,0 +1,123 @@
+from forecasting_module.config.jit import NUMBA_CACHE_DIR  # noqa: F401  (before numba)
+from typing import Callable
+import numpy as np
+from numba import njit
+
+
+# Same constants as statsforecast's CrostonClassic/CrostonOptimized/CrostonSBA/TSB
+SES_ALPHA = 0.1
+OPTIMIZED_ALPHA_BOUNDS = (0.1, 0.3)
+SBA_FACTOR = 0.95
+TSB_ALPHA_D = 0.1
+TSB_ALPHA_P = 0.1
+
+GOLDEN_RATIO = (np.sqrt(5.0) - 1.0) / 2.0
+GOLDEN_SECTION_TOL = 1e-10
+
+
+# Kernels work on a dense daily float64 array (days without demand as 0) and return
+# the one-step forecast, which Croston-type methods keep flat over any horizon.
+# `cache=True` stores the compiled code under NUMBA_CACHE_DIR for every process.
+
+@njit(cache=True, nogil=True)
+def _ses_forecast(x: np.ndarray, alpha: float) -> float:
+    level = x[0]
+    for i in range(x.size):
+        level = alpha * x[i] + (1.0 - alpha) * level
+    return level
+
+
+@njit(cache=True, nogil=True)
+def _ses_sse(x: np.ndarray, alpha: float) -> float:
+    level = x[0]
+    sse = 0.0
+    for i in range(1, x.size):
+        level = alpha * x[i - 1] + (1.0 - alpha) * level
+        sse += (x[i] - level) ** 2
+    return sse
+
+
+@njit(cache=True, nogil=True)
+def _optimized_ses_forecast(x: np.ndarray, lower: float, upper: float) -> float:
+    # golden-section search of the alpha minimising the in-sample squared error
+    a, b = lower, upper
+    c = b - GOLDEN_RATIO * (b - a)
+    d = a + GOLDEN_RATIO * (b - a)
+    while abs(b - a) > GOLDEN_SECTION_TOL:
+        if _ses_sse(x, c) < _ses_sse(x, d):
+            b = d
+        else:
+            a = c
+        c = b - GOLDEN_RATIO * (b - a)
+        d = a + GOLDEN_RATIO * (b - a)
+    return _ses_forecast(x, (a + b) / 2.0)
+
+
+@njit(cache=True, nogil=True)
+def _intervals(y: np.ndarray) -> np.ndarray:
+    nonzero = np.flatnonzero(y != 0) + 1
+    out = np.empty(nonzero.size, dtype=np.float64)
+    previous = 0
+    for i in range(nonzero.size):
+        out[i] = nonzero[i] - previous
+        previous = nonzero[i]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ratio(demand: float, interval: float) -> float:
+    return demand / interval if interval != 0.0 else demand
+
+
+@njit(cache=True, nogil=True)
+def croston_classic(y: np.ndarray) -> float:
+    demand = y[y > 0]
+    if demand.size == 0:
+        return y[-1]
+    return _ratio(_ses_forecast(demand, SES_ALPHA), _ses_forecast(_intervals(y), SES_ALPHA))
+
+
+@njit(cache=True, nogil=True)
+def croston_optimized(y: np.ndarray) -> float:
+    demand = y[y > 0]
+    if demand.size == 0:
+        return y[-1]
+    lower, upper = OPTIMIZED_ALPHA_BOUNDS
+    return _ratio(
+        _optimized_ses_forecast(demand, lower, upper),
+        _optimized_ses_forecast(_intervals(y), lower, upper),
+    )
+
+
+@njit(cache=True, nogil=True)
+def croston_sba(y: np.ndarray) -> float:
+    return croston_classic(y) * SBA_FACTOR
+
+
+@njit(cache=True, nogil=True)
+def tsb(y: np.ndarray) -> float:
+    demand = y[y > 0]
+    if demand.size == 0:
+        return 0.0
+    probability = (y != 0).astype(np.float64)
+    return _ses_forecast(probability, TSB_ALPHA_P) * _ses_forecast(demand, TSB_ALPHA_D)
+
+
+CROSTON_KERNELS: dict[str, Callable[[np.ndarray], float]] = {
+    "CrostonClassic": croston_classic,
+    "CrostonOptimized": croston_optimized,
+    "CrostonSBA": croston_sba,
+    "TSB": tsb,
+}
+
+
+def croston_point_forecast(y: np.ndarray, variant: str) -> float:
+    # one compiled signature: contiguous float64, whatever the caller passes in
+    return float(CROSTON_KERNELS[variant](np.ascontiguousarray(y, dtype=np.float64)))
+
+
+def warm_up_croston_kernels() -> None:
+    """Compile every kernel, or load it from NUMBA_CACHE_DIR when already compiled."""
+    y = np.array([0.0, 2.0, 0.0, 0.0, 1.0, 3.0])
+    for variant in CROSTON_KERNELS:
+        croston_point_forecast(y, variant)
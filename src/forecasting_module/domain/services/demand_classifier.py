@@ -0,0 +1,71 @@
+from typing import Literal
+import numpy as np
+import pandas as pd
+
+
+# Syntetos-Boylan cut-offs on the average demand interval and the squared
+# coefficient of variation of non-zero demand sizes.
+ADI_CUTOFF = 1.32
+CV2_CUTOFF = 0.49
+
+DemandClass = Literal["smooth", "erratic", "intermittent", "lumpy"]
+
+# smooth and erratic demand has enough signal for Prophet; intermittent demand goes
+# to Croston, lumpy demand to its bias-corrected SBA variant
+ROUTES: dict[str, tuple[Literal["prophet", "croston"], str | None]] = {
+    "smooth": ("prophet", None),
+    "erratic": ("prophet", None),
+    "intermittent": ("croston", "CrostonOptimized"),
+    "lumpy": ("croston", "CrostonSBA"),
+}
+
+# value stored in `product_setting.classification`
+CLASSIFICATIONS: dict[str, Literal["slow", "fast"]] = {
+    "smooth": "fast",
+    "erratic": "fast",
+    "intermittent": "slow",
+    "lumpy": "slow",
+}
+
+
+def classify_demand(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Classify many daily demand series at once.
+
+    Args:
+        data (pd.DataFrame): Long-format dense daily series with columns 'unique_id'
+            and 'y' (days without demand as 0).
+
+    Returns:
+        pd.DataFrame: One row per series with ['unique_id', 'adi', 'cv2', 'demand_class'].
+        ADI is days per day with demand (inf when there is none); CV² is computed on
+        the non-zero demand sizes.
+    """
+    y = data["y"].to_numpy(dtype="float64")
+    has_demand = y > 0
+    sizes = pd.Series(np.where(has_demand, y, np.nan), index=data.index)
+
+    grouped = sizes.groupby(data["unique_id"], sort=False)
+    periods = grouped.size()
+    demands = grouped.count()
+    mean = grouped.mean()
+    var = grouped.var(ddof=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adi = (periods / demands).to_numpy(dtype="float64")
+        cv2 = (var / mean ** 2).fillna(0).to_numpy(dtype="float64")
+
+    intermittent = adi >= ADI_CUTOFF
+    variable = cv2 >= CV2_CUTOFF
+    demand_class = np.select(
+        [~intermittent & ~variable, ~intermittent & variable, intermittent & ~variable],
+        ["smooth", "erratic", "intermittent"],
+        default="lumpy",
+    )
+
+    return pd.DataFrame({
+        "unique_id": periods.index.to_numpy(),
+        "adi": adi,
+        "cv2": cv2,
+        "demand_class": demand_class,
+    })
@@ -1,11 +1,32 @@
 from datetime import date
-from typing import Literal, TypedDict
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, Callable, Literal, TypedDict
 import numpy as np
 import pandas as pd
 from fastapi import HTTPException
-from prophet import Prophet
-from statsforecast import StatsForecast
-from statsforecast.models import CrostonClassic, CrostonOptimized, CrostonSBA
+from forecasting_module.domain.services.prophet_predictor import IntervalMode, ProphetParameters, ProphetPredictor
+
+# prophet, statsforecast and numba take seconds to import and hundreds of MB to hold:
+# they are imported on first use of their method, so a process only pays for what it runs
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+
+# Croston variant used unless one is chosen explicitly; part of a forecast's input fingerprint.
+CROSTON_VARIANT = "CrostonOptimized"
+
+
+@cache
+def croston_models() -> dict[str, Callable[[], Any]]:
+    from statsforecast.models import CrostonClassic, CrostonOptimized, CrostonSBA, TSB
+    from forecasting_module.domain.services.croston_kernels import TSB_ALPHA_D, TSB_ALPHA_P
+
+    return {
+        "CrostonClassic": CrostonClassic,
+        "CrostonOptimized": CrostonOptimized,
+        "CrostonSBA": CrostonSBA,
+        "TSB": partial(TSB, alpha_d=TSB_ALPHA_D, alpha_p=TSB_ALPHA_P),
+    }
 
 
 class ForecastOneInput(TypedDict):
@@ -27,27 +48,12 @@ class ForecastAllInput(TypedDict):
 
 
 class ForecastManager:
-    def prophet_forecast(
-        self,
-        sales: pd.DataFrame,
-        forecast_start_date: date,
-        forecast_end_date: date,
-        model: Prophet
-    )-> tuple[pd.DataFrame, Prophet] :
+    def prophet_fit(self, model: "Prophet", sales: pd.DataFrame, init: dict | None = None) -> "Prophet":
         """
-        Generate a Prophet forecast between forecast_start_date and forecast_end_date.
+        Fit an unfitted Prophet model on historical daily sales ('ds', 'y').
 
-        Args:
-            sales (pd.DataFrame): Historical daily sales data.
-                Must contain:
-                  - 'ds': datetime column
-                  - 'y': numeric sales quantity
-            forecast_start_date (date): First day to include in output.
-            forecast_end_date (date): Last day to include in output.
-            model (Prophet | None): Optional pre-trained model.
-
-        Returns:
-            pd.DataFrame: Prophet forecast including ['ds', 'yhat', 'yhat_lower', 'yhat_upper'].
+        `init` seeds the optimizer (see `prophet_warm_start_params`); parameters whose
+        shape does not match the new model are replaced by Prophet's defaults.
         """
         if sales.empty:
             raise HTTPException(409, {"message": "Sales data is empty — cannot forecast."})
@@ -57,11 +63,40 @@ class ForecastManager:
 
         df = sales.sort_values("ds").copy()
         df["ds"] = pd.to_datetime(df["ds"])
-        
-        model.fit(df)
-            
 
-        last_date = df["ds"].max().date()
+        if init is not None:
+            model.fit(df, init=init)
+        else:
+            model.fit(df)
+        return model
+
+    def prophet_warm_start_params(self, model: "Prophet") -> dict:
+        """
+        Extract the MAP estimates of a fitted model in the shape expected by `fit(init=...)`.
+        """
+        return {
+            "k": model.params["k"][0][0],
+            "m": model.params["m"][0][0],
+            "sigma_obs": model.params["sigma_obs"][0][0],
+            "delta": model.params["delta"][0],
+            "beta": model.params["beta"][0],
+        }
+
+    def prophet_predict(
+        self,
+        model: "Prophet",
+        forecast_start_date: date,
+        forecast_end_date: date,
+        interval_mode: IntervalMode = "full",
+    ) -> pd.DataFrame:
+        """
+        Predict with an already fitted Prophet model, restricted to the forecast window.
+
+        Models within `ProphetPredictor`'s scope are predicted with NumPy from their
+        parameters, for the window's days only, with intervals as per `interval_mode`.
+        The rest go through `Prophet.predict`, which always samples.
+        """
+        last_date = model.history["ds"].max().date() # pyright: ignore
         days_to_forecast = (forecast_end_date - last_date).days
 
         if days_to_forecast <= 0:
@@ -70,7 +105,18 @@ class ForecastManager:
                 {"message": f"Forecast end date ({forecast_end_date}) must be after last sale date ({last_date})."}
             )
 
-        # Generate future dataframe
+        params = ProphetParameters.from_model(model)
+        if params is not None:
+            forecast = ProphetPredictor(params).predict(forecast_start_date, forecast_end_date, interval_mode)
+            if forecast.empty:
+                raise HTTPException(
+                    409,
+                    {"message": "No forecast data falls within the specified date range."}
+                )
+            return forecast
+
+        # Prophet walks its trend uncertainty day by day from the last sale, so the
+        # fallback predicts the whole gap and filters afterwards
         future = model.make_future_dataframe(
             periods=days_to_forecast,
             freq="D",
@@ -93,7 +139,7 @@ class ForecastManager:
                 {"message": "No forecast data falls within the specified date range."}
             )
 
-        return forecast, model
+        return forecast
 
 
 
@@ -102,34 +148,168 @@ class ForecastManager:
         data: pd.DataFrame,
         forecast_start_date: date,
         forecast_end_date: date,
+        variant: str = CROSTON_VARIANT,
     ) -> pd.DataFrame:
+        """
+        Forecast one dense daily series with the compiled Croston kernels, skipping
+        the StatsForecast frame and dispatch used for many series.
+
+        Returns:
+            pd.DataFrame: ['ds', 'yhat', 'yhat_lower', 'yhat_upper'] for the window
+            days after the last date in `data`.
+        """
         # Ensure proper columns
         if not {"ds", "y"}.issubset(data.columns):
             raise ValueError("Data must contain 'ds' (date) and 'y' (value) columns.")
 
-        # Add unique_id for StatsForecast
-        data["unique_id"] = "product_1"
+        data = data[["ds", "y"]].sort_values("ds")
+        last_date = pd.to_datetime(data["ds"]).max()
+        if forecast_end_date <= last_date.date():
+            raise ValueError("forecast_end_date must be after the last date in your data.")
+
+        from forecasting_module.domain.services.croston_kernels import croston_point_forecast
+
+        yhat = croston_point_forecast(data["y"].to_numpy(), variant)
+
+        ds = pd.date_range(
+            max(pd.Timestamp(forecast_start_date), last_date + pd.Timedelta(days=1)),
+            pd.Timestamp(forecast_end_date),
+            freq="D",
+        )
+        if ds.empty:
+            raise HTTPException(
+                409,
+                {"message": "No forecast data falls within the specified date range."}
+            )
+        # Croston has no intervals: report the point forecast as its own bounds
+        return pd.DataFrame({"ds": ds, "yhat": yhat, "yhat_lower": yhat, "yhat_upper": yhat})
+
+    def croston_forecast_many(
+        self,
+        data: pd.DataFrame,
+        forecast_start_date: date,
+        forecast_end_date: date,
+        n_jobs: int = 1,
+        variant: str = CROSTON_VARIANT,
+    ) -> pd.DataFrame:
+        """
+        Forecast many series with Croston in a single StatsForecast call.
+
+        Args:
+            data (pd.DataFrame): Long-format daily sales with columns
+                'unique_id' (series key, e.g. product id), 'ds' and 'y'.
+            forecast_start_date (date): First day to include in output.
+            forecast_end_date (date): Last day to include in output.
+            n_jobs (int): Processes used by StatsForecast to fit the series.
+            variant (str): One of `croston_models()`.
+
+        Returns:
+            pd.DataFrame: ['unique_id', 'ds', 'yhat', 'yhat_lower', 'yhat_upper'] for
+            every series with days inside the window (and after its last date).
+        """
+        if not {"unique_id", "ds", "y"}.issubset(data.columns):
+            raise ValueError("Data must contain 'unique_id', 'ds' (date) and 'y' (value) columns.")
+
+        data = data[["unique_id", "ds", "y"]].copy()
         data["ds"] = pd.to_datetime(data["ds"])
-        data = data.sort_values("ds")
+        data = data.sort_values(["unique_id", "ds"])
 
-        # --- Initialize model ---
-        sf = StatsForecast(models=[CrostonOptimized()], freq="D")
+        from statsforecast import StatsForecast
 
-        # --- Calculate forecast horizon (h) ---
-        last_date = data["ds"].max().date()
-        h = (forecast_end_date - last_date).days
+        # --- Initialize model ---
+        sf = StatsForecast(models=[croston_models()[variant]()], freq="D", n_jobs=n_jobs)
 
-        if h <= 0:
+        last_dates = data.groupby("unique_id", sort=False)["ds"].max()
+        if forecast_end_date <= last_dates.min().date():
             raise ValueError("forecast_end_date must be after the last date in your data.")
 
-        # --- Forecast ---
-        forecasts = sf.forecast(df=data, h=h).reset_index() # pyright: ignore
+        # --- Forecast one step: Croston's forecast is flat over the horizon ---
+        forecasts = sf.forecast(df=data, h=1) # pyright: ignore
+        if "unique_id" not in forecasts.columns:
+            forecasts = forecasts.reset_index()
+
+        # --- Broadcast it over the window days after each series' last date ---
+        window = pd.date_range(
+            max(pd.Timestamp(forecast_start_date), last_dates.min() + pd.Timedelta(days=1)),
+            pd.Timestamp(forecast_end_date),
+            freq="D",
+        ).to_numpy()
+        first_days = (last_dates + pd.Timedelta(days=1)).reindex(forecasts["unique_id"]).to_numpy()
+
+        unique_ids = np.repeat(forecasts["unique_id"].to_numpy(), len(window))
+        yhat = np.repeat(forecasts[variant].to_numpy(), len(window))
+        ds = np.tile(window, len(forecasts))
+        keep = ds >= np.repeat(first_days, len(window))
+
+        # Croston has no intervals: report the point forecast as its own bounds
+        return pd.DataFrame({
+            "unique_id": unique_ids[keep],
+            "ds": ds[keep],
+            "yhat": yhat[keep],
+            "yhat_lower": yhat[keep],
+            "yhat_upper": yhat[keep],
+        })
+
+    def croston_cross_validation(
+        self,
+        data: pd.DataFrame,
+        lead: int,
+        horizon: int,
+        n_windows: int,
+        step_size: int,
+        variants: list[str] | None = None,
+        n_jobs: int = 1,
+    ) -> pd.DataFrame:
+        """
+        Rolling-origin forecasts of many series with Croston, every variant and every
+        cutoff in a single StatsForecast cross-validation call.
+
+        Args:
+            data (pd.DataFrame): Long-format dense daily sales ['unique_id', 'ds', 'y'].
+            lead (int): First day after each cutoff to keep (see `backtest_offsets`).
+            horizon (int): Last day after each cutoff to forecast.
+            n_windows (int): Number of cutoffs; the last window ends on each series' last day.
+            step_size (int): Days between consecutive cutoffs.
+            variants (list[str] | None): Names from `croston_models()`; all by default.
+            n_jobs (int): Processes used by StatsForecast to fit the series.
+
+        Returns:
+            pd.DataFrame: ['unique_id', 'cutoff', 'ds', 'y', *variants] for days
+            `lead`..`horizon` after each cutoff.
+        """
+        if not {"unique_id", "ds", "y"}.issubset(data.columns):
+            raise ValueError("Data must contain 'unique_id', 'ds' (date) and 'y' (value) columns.")
+
+        variants = variants or list(croston_models())
+        data = data[["unique_id", "ds", "y"]].copy()
+        data["ds"] = pd.to_datetime(data["ds"])
+        data = data.sort_values(["unique_id", "ds"])
+
+        from statsforecast import StatsForecast
+
+        sf = StatsForecast(models=[croston_models()[variant]() for variant in variants], freq="D", n_jobs=n_jobs)
+        cv = sf.cross_validation(df=data, h=horizon, n_windows=n_windows, step_size=step_size) # pyright: ignore
+        if "unique_id" not in cv.columns:
+            cv = cv.reset_index()
+
+        cv = cv[(cv["ds"] - cv["cutoff"]).dt.days >= lead]
+        return cv[["unique_id", "cutoff", "ds", "y", *variants]].reset_index(drop=True)
 
-        # --- Filter to your desired forecast window ---
-        forecasts["ds"] = pd.to_datetime(forecasts["ds"])
-        mask = (forecasts["ds"].dt.date >= forecast_start_date) & (forecasts["ds"].dt.date <= forecast_end_date)
-        forecasts = forecasts.loc[mask]
 
-        print(forecasts)
-        return forecasts
+def warm_up_croston() -> None:
+    """
+    Compile (or load from NUMBA_CACHE_DIR) the single-series kernels and the
+    StatsForecast models used for batches, so the first request in a fresh process
+    does not pay for it.
+    """
+    from statsforecast import StatsForecast
+    from forecasting_module.domain.services.croston_kernels import warm_up_croston_kernels
 
+    warm_up_croston_kernels()
+    data = pd.DataFrame({
+        "unique_id": "warm-up",
+        "ds": pd.date_range("2000-01-01", periods=6, freq="D"),
+        "y": [0.0, 2.0, 0.0, 0.0, 1.0, 3.0],
+    })
+    for model in croston_models().values():
+        StatsForecast(models=[model()], freq="D").forecast(df=data, h=1)
@@ -0,0 +1,74 @@
+import math
+import random
+from typing import Any
+
+
+# Settings a search space may vary; "seasons" values are lists of custom seasonalities
+TUNABLE_SETTINGS = (
+    "changepoint_prior_scale",
+    "changepoint_range",
+    "seasonality_prior_scale",
+    "seasonality_mode",
+    "yearly_seasonality",
+    "weekly_seasonality",
+    "seasons",
+)
+
+# The grid suggested by Prophet's documentation for the two prior scales
+DEFAULT_SEARCH_SPACE: dict[str, list[Any]] = {
+    "changepoint_prior_scale": [0.001, 0.01, 0.1, 0.5],
+    "seasonality_prior_scale": [0.01, 0.1, 1.0, 10.0],
+    "seasonality_mode": ["additive", "multiplicative"],
+}
+
+
+def grid_candidates(space: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Every combination of the space's values, in a stable order."""
+    return [_candidate_at(space, i) for i in range(_grid_size(space))]
+
+
+def random_candidates(space: dict[str, list[Any]], n_candidates: int, seed: int | None = None) -> list[dict[str, Any]]:
+    """
+    `n_candidates` distinct combinations drawn uniformly from the grid, without
+    enumerating it; the whole grid when it is not larger.
+    """
+    size = _grid_size(space)
+    if size <= n_candidates:
+        return grid_candidates(space)
+    indices = random.Random(seed).sample(range(size), n_candidates)
+    return [_candidate_at(space, i) for i in indices]
+
+
+def halving_rungs(n_candidates: int, n_windows: int, eta: int | None) -> list[tuple[int, int]]:
+    """
+    Successive halving schedule as (windows, candidates) per rung.
+
+    The budget of a candidate is the number of backtest windows it is scored on:
+    every candidate starts on the most recent window(s), and each rung keeps the
+    best 1/`eta` for `eta` times as many windows, until the survivors are scored
+    on all `n_windows`. Without `eta` every candidate is scored on every window.
+    """
+    if eta is None or eta < 2 or n_windows < eta:
+        return [(n_windows, n_candidates)]
+
+    n_rungs = int(math.log(n_windows, eta) + 1e-9) + 1
+    rungs = []
+    for k in range(n_rungs):
+        windows = max(1, round(n_windows / eta ** (n_rungs - 1 - k)))
+        candidates = max(1, math.ceil(n_candidates / eta ** k))
+        rungs.append((windows, candidates))
+    rungs[-1] = (n_windows, rungs[-1][1])
+    return rungs
+
+
+def _grid_size(space: dict[str, list[Any]]) -> int:
+    return math.prod(len(values) for values in space.values())
+
+
+def _candidate_at(space: dict[str, list[Any]], index: int) -> dict[str, Any]:
+    # mixed-radix decoding: the last setting varies fastest, as in itertools.product
+    candidate = {}
+    for name, values in reversed(space.items()):
+        index, position = divmod(index, len(values))
+        candidate[name] = values[position]
+    return dict(reversed(candidate.items()))
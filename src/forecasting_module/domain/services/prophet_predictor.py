@@ -0,0 +1,329 @@
+import os
+from dataclasses import dataclass
+from datetime import date
+from statistics import NormalDist
+from typing import Any, Literal
+import numpy as np
+import pandas as pd
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Days sampled at once: bounds interval memory to uncertainty_samples x chunk.
+PROPHET_INTERVAL_CHUNK_DAYS = int(os.getenv("PROPHET_INTERVAL_CHUNK_DAYS", 90))
+# Target standard error (in probability) of the interval quantiles in "adaptive" mode.
+PROPHET_INTERVAL_PRECISION = float(os.getenv("PROPHET_INTERVAL_PRECISION", 0.02))
+MIN_ADAPTIVE_SAMPLES = 50
+
+# "full": settings' uncertainty_samples, "adaptive": as many as the precision needs,
+# "point": normal approximation, no sampling
+IntervalMode = Literal["full", "adaptive", "point"]
+
+# sampled trend deviation carried across days: slope, level and the last day's change
+TrendState = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+@dataclass
+class SeasonalityParameters:
+    name: str
+    period: float
+    fourier_order: int
+    mode: Literal["additive", "multiplicative"]
+
+
+@dataclass
+class ProphetParameters:
+    """
+    Everything needed to predict from a fitted Prophet model (MAP fit, linear or flat growth,
+    seasonalities only). Plain values only, so it can be cached, pickled or stored as JSON.
+    """
+    growth: Literal["linear", "flat"]
+    start: str                # first training date (ISO)
+    last_date: str            # last training date (ISO)
+    t_scale_days: float
+    y_scale: float
+    floor: float
+    k: float
+    m: float
+    sigma_obs: float
+    delta: list[float]
+    beta: list[float]
+    changepoints_t: list[float]
+    seasonalities: list[SeasonalityParameters]
+    interval_width: float
+    uncertainty_samples: int
+
+    @classmethod
+    def from_model(cls, model: Any) -> "ProphetParameters | None":
+        """
+        Extract the parameters of a fitted Prophet model, or None when the model uses
+        a feature the NumPy predictor does not implement (logistic growth, holidays,
+        extra regressors, conditional seasonalities, MCMC sampling).
+        """
+        if model.history is None or model.growth not in ("linear", "flat"):
+            return None
+        if model.holidays is not None or model.country_holidays is not None or model.extra_regressors:
+            return None
+        if model.mcmc_samples > 0:
+            return None
+        if any(props["condition_name"] is not None for props in model.seasonalities.values()):
+            return None
+
+        return cls(
+            growth=model.growth,
+            start=model.start.isoformat(),
+            last_date=model.history["ds"].max().date().isoformat(),
+            t_scale_days=model.t_scale.total_seconds() / SECONDS_PER_DAY,
+            y_scale=float(model.y_scale),
+            floor=float(model.y_min) if model.scaling == "minmax" else 0.0,
+            k=float(model.params["k"][0][0]),
+            m=float(model.params["m"][0][0]),
+            sigma_obs=float(model.params["sigma_obs"][0][0]),
+            delta=[float(v) for v in model.params["delta"][0]],
+            beta=[float(v) for v in model.params["beta"][0]],
+            changepoints_t=[float(v) for v in model.changepoints_t],
+            seasonalities=[
+                SeasonalityParameters(name, float(props["period"]), int(props["fourier_order"]), props["mode"])
+                for name, props in model.seasonalities.items()
+            ],
+            interval_width=float(model.interval_width),
+            uncertainty_samples=int(model.uncertainty_samples or 0),
+        )
+
+
+class ProphetPredictor:
+    """
+    Vectorized re-implementation of `Prophet.predict` for future daily dates.
+
+    Trend, seasonal terms and yhat are computed with the same formulas as Prophet and
+    agree with it to floating point rounding (relative error below 1e-9). Intervals
+    come from the same generative model Prophet samples: a trend path with random
+    slope changes (Laplace, at the historical changepoint rate) plus Gaussian noise.
+    With the same `np.random` seed and a window starting the day after training,
+    the draws are identical to Prophet's vectorized sampler. Otherwise they are
+    Monte Carlo estimates of the same quantiles and agree within sampling error
+    (a few percent of the interval width at 1000 samples). Windows longer than
+    PROPHET_INTERVAL_CHUNK_DAYS are sampled chunk by chunk, so their draws differ
+    from Prophet's but follow the same distribution.
+
+    Work is proportional to the window, not to its distance from the last training day.
+    """
+
+    def __init__(self, params: ProphetParameters):
+        self.params = params
+        self.start = np.datetime64(params.start, "s")
+        self.last_date = date.fromisoformat(params.last_date)
+        self.delta = np.asarray(params.delta, dtype="float64")
+        self.beta = np.asarray(params.beta, dtype="float64")
+        self.changepoints_t = np.asarray(params.changepoints_t, dtype="float64")
+
+        additive = []
+        for s in params.seasonalities:
+            additive.extend([s.mode == "additive"] * (2 * s.fourier_order))
+        self.additive_mask = np.asarray(additive, dtype=bool)
+
+    def predict(
+        self,
+        forecast_start_date: date,
+        forecast_end_date: date,
+        interval_mode: IntervalMode = "full",
+    ) -> pd.DataFrame:
+        """
+        Forecast the days of the window that fall after training. Days between the end
+        of training and the window are never materialized: only their effect on the
+        trend uncertainty is sampled.
+        """
+        first_day = max(np.datetime64(forecast_start_date), np.datetime64(self.last_date) + 1)
+        ds = np.arange(first_day, np.datetime64(forecast_end_date) + 1, dtype="datetime64[D]")
+        n_skipped = int((first_day - np.datetime64(self.last_date)).astype(int)) - 1
+
+        t = (ds.astype("datetime64[s]") - self.start).astype("float64") / SECONDS_PER_DAY / self.params.t_scale_days
+
+        trend = self._trend(t)
+        additive, multiplicative = self._seasonal_terms(ds)
+        forecast = pd.DataFrame({
+            "ds": ds.astype("datetime64[ns]"),
+            "yhat": trend * (1 + multiplicative) + additive,
+        })
+
+        if self.params.uncertainty_samples and len(ds):
+            lower, upper = self._intervals(n_skipped, trend, additive, multiplicative, interval_mode)
+            forecast["yhat_lower"] = lower
+            forecast["yhat_upper"] = upper
+        else:
+            forecast["yhat_lower"] = forecast["yhat"]
+            forecast["yhat_upper"] = forecast["yhat"]
+        return forecast
+
+    def _trend(self, t: np.ndarray) -> np.ndarray:
+        p = self.params
+        if p.growth == "flat":
+            trend = np.full_like(t, p.m)
+        else:
+            deltas_t = (self.changepoints_t[None, :] <= t[:, None]) * self.delta
+            k_t = deltas_t.sum(axis=1) + p.k
+            m_t = (deltas_t * -self.changepoints_t).sum(axis=1) + p.m
+            trend = k_t * t + m_t
+        return trend * p.y_scale + p.floor
+
+    def _seasonal_terms(self, ds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if not self.params.seasonalities:
+            zeros = np.zeros(len(ds))
+            return zeros, zeros
+
+        days = ds.astype("datetime64[D]").astype("float64")  # days since epoch
+        x_t = 2 * np.pi * days
+        columns = []
+        for s in self.params.seasonalities:
+            for i in range(s.fourier_order):
+                c = (i + 1) / s.period * x_t
+                columns.append(np.sin(c))
+                columns.append(np.cos(c))
+        X = np.column_stack(columns)
+
+        additive = X @ (self.beta * self.additive_mask) * self.params.y_scale
+        multiplicative = X @ (self.beta * ~self.additive_mask)
+        return additive, multiplicative
+
+    def _intervals(
+        self,
+        n_skipped: int,
+        trend: np.ndarray,
+        additive: np.ndarray,
+        multiplicative: np.ndarray,
+        interval_mode: IntervalMode,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        p = self.params
+        if interval_mode == "point":
+            return self._approximate_intervals(n_skipped, trend, additive, multiplicative)
+
+        n_samples = p.uncertainty_samples
+        if interval_mode == "adaptive":
+            n_samples = min(n_samples, self._samples_for_precision(PROPHET_INTERVAL_PRECISION))
+
+        lower_p = 100 * (1.0 - p.interval_width) / 2
+        upper_p = 100 * (1.0 + p.interval_width) / 2
+        lower = np.empty(len(trend))
+        upper = np.empty(len(trend))
+
+        # sample the window in chunks of days so peak memory is n_samples x chunk
+        state = self._skipped_trend_state(n_samples, n_skipped)
+        for begin in range(0, len(trend), PROPHET_INTERVAL_CHUNK_DAYS):
+            chunk = slice(begin, begin + PROPHET_INTERVAL_CHUNK_DAYS)
+            n_steps = len(trend[chunk])
+
+            # draw order matches Prophet's sampler: slope changes, their sizes, then noise
+            uncertainty, state = self._trend_uncertainty(n_samples, n_steps, state)
+            trends = trend[chunk] + uncertainty * p.y_scale
+            noise = np.random.normal(0, p.sigma_obs, trends.shape) * p.y_scale
+            samples = trends * (1 + multiplicative[chunk]) + additive[chunk] + noise
+
+            lower[chunk], upper[chunk] = np.percentile(samples, [lower_p, upper_p], axis=0)
+        return lower, upper
+
+    def _samples_for_precision(self, precision: float) -> int:
+        """
+        Samples needed for the interval's tail quantile to have a standard error of
+        `precision` (in probability): sqrt(q (1 - q) / n) <= precision.
+        """
+        q = (1.0 - self.params.interval_width) / 2
+        return max(MIN_ADAPTIVE_SAMPLES, int(np.ceil(q * (1 - q) / precision ** 2)))
+
+    def _approximate_intervals(
+        self,
+        n_skipped: int,
+        trend: np.ndarray,
+        additive: np.ndarray,
+        multiplicative: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Normal approximation of the sampled intervals, without drawing anything.
+
+        Uses the exact variance of the simulated trend deviation (a day-h change has
+        weight h - j + 0.5 on day h, and each day's change has variance 2 b^2 times its
+        likelihood) plus the observation noise. The tails are lighter than the sampled
+        ones because trend changes are Laplace-distributed.
+        """
+        p = self.params
+        z = NormalDist().inv_cdf((1.0 + p.interval_width) / 2)
+
+        trend_var = np.zeros(len(trend))
+        if p.growth == "linear":
+            single_diff, likelihood, mean_delta = self._trend_change_model()
+            h = n_skipped + np.arange(1, len(trend) + 1, dtype="float64")
+            weights = (h - 1) * h * (2 * h - 1) / 6 + (h - 1) * h / 2 + h / 4  # sum of (i + 0.5)^2, i < h
+            trend_var = likelihood * 2 * mean_delta ** 2 * weights * (single_diff * p.y_scale) ** 2
+
+        std = np.sqrt(trend_var * (1 + multiplicative) ** 2 + (p.sigma_obs * p.y_scale) ** 2)
+        yhat = trend * (1 + multiplicative) + additive
+        return yhat - z * std, yhat + z * std
+
+    def _trend_change_model(self) -> tuple[float, float, float]:
+        """Step in t per day, daily likelihood of a slope change and its mean absolute size."""
+        single_diff = 1 / self.params.t_scale_days
+        likelihood = len(self.changepoints_t) * single_diff
+        mean_delta = float(np.mean(np.abs(self.delta))) + 1e-8
+        return single_diff, likelihood, mean_delta
+
+    def _trend_uncertainty(
+        self,
+        n_samples: int,
+        n_steps: int,
+        state: TrendState,
+    ) -> tuple[np.ndarray, TrendState]:
+        """
+        Sample `n_steps` days of trend deviation (in units of t) continuing from `state`,
+        and return the state after the last day.
+        """
+        if self.params.growth == "flat":
+            return np.zeros((n_samples, n_steps)), state
+
+        single_diff, likelihood, mean_delta = self._trend_change_model()
+        slope, level, carry = state
+
+        slope_change = np.random.uniform(size=(n_samples, n_steps)) < likelihood
+        shifts = np.random.laplace(0, mean_delta, size=slope_change.shape) * slope_change
+
+        # each change is spread over two consecutive days, as in Prophet
+        previous = np.hstack([carry[:, None], shifts])[:, :-1]
+        slopes = slope[:, None] + ((previous + shifts) / 2).cumsum(axis=1)
+        levels = level[:, None] + slopes.cumsum(axis=1)
+        return levels * single_diff, (slopes[:, -1], levels[:, -1], shifts[:, -1])
+
+    def _skipped_trend_state(self, n_samples: int, n_skipped: int) -> TrendState:
+        """
+        Sample the trend deviation accumulated over `n_skipped` days before the window:
+        its slope, its level (in slope-days) and the last day's change, half of which
+        spills into the window's first day. Equivalent in distribution to simulating
+        every skipped day, but only the changes themselves are drawn.
+        """
+        slope = np.zeros(n_samples)
+        level = np.zeros(n_samples)
+        carry = np.zeros(n_samples)
+        if self.params.growth == "flat" or n_skipped == 0:
+            return slope, level, carry
+
+        _, likelihood, mean_delta = self._trend_change_model()
+        if likelihood <= 0:
+            return slope, level, carry
+        likelihood = min(likelihood, 1.0)
+
+        carry = (np.random.uniform(size=n_samples) < likelihood) * np.random.laplace(0, mean_delta, n_samples)
+        slope += carry / 2
+        level += carry / 2
+
+        n_days = n_skipped - 1
+        if n_days > 0:
+            # days of the changes (1-based), from geometric gaps between successes
+            expected = n_days * likelihood
+            width = int(np.ceil(expected + 6 * np.sqrt(expected) + 10))
+            days = np.random.geometric(likelihood, size=(n_samples, width)).cumsum(axis=1)
+            while (days[:, -1] <= n_days).any():
+                more = np.random.geometric(likelihood, size=(n_samples, width)).cumsum(axis=1)
+                days = np.hstack([days, more + days[:, -1:]])
+
+            sizes = np.random.laplace(0, mean_delta, days.shape) * (days <= n_days)
+            slope += sizes.sum(axis=1)
+            # a change on day j adds half its size to days j and j + 1, both before the window
+            level += (sizes * (n_skipped + 0.5 - days)).sum(axis=1)
+        return slope, level, carry
@@ -0,0 +1,54 @@
+import io
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg import AsyncCursor
+from psycopg.cursor import Cursor
+
+
+def fetch_frame(cur: Cursor, query: str, params: tuple, schema: pa.Schema) -> pd.DataFrame:
+    """
+    Run `query` through COPY ... TO STDOUT and parse the result with Arrow.
+
+    Rows are never materialized as Python tuples: the CSV stream goes straight into
+    typed Arrow columns and then into the DataFrame. `schema` lists the selected
+    columns in order; date columns are returned as datetime64[ns].
+    """
+    buffer = io.BytesIO()
+    with cur.copy(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", params) as copy:
+        for block in copy:
+            buffer.write(block)
+    return _read_frame(buffer, schema)
+
+
+async def fetch_frame_async(cur: AsyncCursor, query: str, params: tuple, schema: pa.Schema) -> pd.DataFrame:
+    """`fetch_frame` over an async cursor."""
+    buffer = io.BytesIO()
+    async with cur.copy(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", params) as copy:
+        async for block in copy:
+            buffer.write(block)
+    return _read_frame(buffer, schema)
+
+
+def _read_frame(buffer: io.BytesIO, schema: pa.Schema) -> pd.DataFrame:
+    if buffer.tell() == 0:
+        return pd.DataFrame({
+            field.name: pd.Series(dtype=_pandas_dtype(field.type)) for field in schema
+        })
+
+    buffer.seek(0)
+    table = pa_csv.read_csv(
+        buffer,
+        read_options=pa_csv.ReadOptions(column_names=schema.names),
+        convert_options=pa_csv.ConvertOptions(column_types=schema),
+    )
+    for i, field in enumerate(schema):
+        if pa.types.is_date(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp("ns")))
+    return table.to_pandas()
+
+
+def _pandas_dtype(arrow_type: pa.DataType):
+    if pa.types.is_date(arrow_type):
+        return "datetime64[ns]"
+    return arrow_type.to_pandas_dtype()
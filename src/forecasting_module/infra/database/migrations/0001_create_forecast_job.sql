@@ -0,0 +1,21 @@
+-- Queue of forecast generation jobs, claimed by workers with FOR UPDATE SKIP LOCKED.
+CREATE TABLE IF NOT EXISTS forecast_job (
+    id                UUID PRIMARY KEY,
+    kind              TEXT NOT NULL CHECK (kind IN ('single', 'batch')),
+    status            TEXT NOT NULL DEFAULT 'queued'
+                      CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    payload           JSONB NOT NULL,
+    result            JSONB,
+    error             JSONB,
+    attempts          INTEGER NOT NULL DEFAULT 0,
+    locked_by         TEXT,
+    lease_expires_at  TIMESTAMPTZ,
+    created_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at        TIMESTAMPTZ,
+    finished_at       TIMESTAMPTZ
+);
+
+-- Claimable jobs only: queued ones, and running ones whose lease may have expired.
+CREATE INDEX IF NOT EXISTS forecast_job_claimable_idx
+    ON forecast_job (created_at)
+    WHERE status IN ('queued', 'running');
@@ -0,0 +1,6 @@
+-- At most one active job per distinct input: duplicates join the active job instead.
+ALTER TABLE forecast_job ADD COLUMN IF NOT EXISTS dedup_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS forecast_job_active_dedup_key_idx
+    ON forecast_job (dedup_key)
+    WHERE status IN ('queued', 'running');
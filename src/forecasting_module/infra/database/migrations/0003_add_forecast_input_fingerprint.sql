@@ -0,0 +1,2 @@
+-- Fingerprint of the inputs the forecast's entries were computed from (see forecast_input_fingerprint).
+ALTER TABLE forecast ADD COLUMN IF NOT EXISTS input_fingerprint TEXT;
@@ -0,0 +1,4 @@
+-- Backtests go through the job queue alongside forecasts.
+ALTER TABLE forecast_job DROP CONSTRAINT IF EXISTS forecast_job_kind_check;
+ALTER TABLE forecast_job ADD CONSTRAINT forecast_job_kind_check
+    CHECK (kind IN ('single', 'batch', 'backtest'));
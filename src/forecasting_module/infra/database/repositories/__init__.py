@@ -1,5 +1,26 @@
-from .forecast_entry_repo import ForecastEntryRepository
-from .forecast_repo import ForecastRepository
-from .sale_repo import SaleRepository
-from .product_setting_repo import ProductSettingRepository
-from .product_repo import ProductRepository
+from importlib import import_module
+
+# Re-exports resolve on first access, so importing one repository module (e.g. the
+# job queue's from the API) does not load pandas and pyarrow through the others.
+_EXPORTS = {
+    "ForecastEntryRepository": ".forecast_entry_repo",
+    "ForecastRepository": ".forecast_repo",
+    "ForecastJobRepository": ".forecast_job_repo",
+    "SaleRepository": ".sale_repo",
+    "ProductSettingRepository": ".product_setting_repo",
+    "ProductRepository": ".product_repo",
+    "AsyncForecastEntryRepository": ".forecast_entry_repo",
+    "AsyncForecastRepository": ".forecast_repo",
+    "AsyncForecastJobRepository": ".forecast_job_repo",
+    "AsyncSaleRepository": ".sale_repo",
+    "AsyncProductRepository": ".product_repo",
+    "AsyncProphetModelRepository": ".prophet_model_repo",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
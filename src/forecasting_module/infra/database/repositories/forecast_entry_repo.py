@@ -1,36 +1,95 @@
+import io
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg import AsyncCursor
 from psycopg.cursor import Cursor
-from typing import List, Tuple
 from uuid_utils import uuid7
 
+COPY_ENTRIES_QUERY = """
+    COPY forecast_entry (
+        id, forecast_id, yhat, yhat_upper, yhat_lower, date
+    ) FROM STDIN WITH (FORMAT csv)
+"""
+
+DELETE_ENTRIES_QUERY = "DELETE FROM forecast_entry WHERE forecast_id = ANY(%s)"
+
 class ForecastEntryRepository:
     def __init__(self, cur: Cursor):
         self.cur = cur
 
-    def delete_entries_by_forecast_id(self, forecast_id: str) -> None:
-        delete_query = """
-            DELETE FROM forecast_entry
-            WHERE forecast_id = %s
+    def save_forecast_dataframes(self, forecast_dfs: dict[str, pd.DataFrame]) -> None:
+        self.save_forecast_entries(self._concat(forecast_dfs))
+
+    def save_forecast_entries(self, entries: pd.DataFrame) -> None:
         """
-        self.cur.execute(delete_query, (forecast_id,))
-        
-
-    def save_forecast_dataframe(self, forecast_id: str, forecast_df: pd.DataFrame) -> None:
-        rows: List[Tuple[str, str, float, float, float, str]] = []
-        for _, row in forecast_df.iterrows():
-            rows.append((
-                str(uuid7()),
-                str(forecast_id),
-                float(row["yhat"]),           
-                float(row["yhat_upper"]),     
-                float(row["yhat_lower"]),     
-                str(row["ds"]),
-            ))
-
-
-        insert_query = """
-            INSERT INTO forecast_entry (
-                id, forecast_id, yhat, yhat_upper, yhat_lower, date
-            ) VALUES (%s, %s, %s, %s, %s, %s)
+        Bulk insert forecast entries through COPY.
+
+        `entries` is a long frame with columns ['forecast_id', 'ds', 'yhat',
+        'yhat_lower', 'yhat_upper']. Columns are serialized with Arrow's CSV
+        writer straight from their arrays, so no per-row Python tuples are built
+        and the whole batch is a single round trip.
         """
-        self.cur.executemany(insert_query, rows)
+        if entries.empty:
+            return
+
+        payload = self._to_csv(entries)
+        with self.cur.copy(COPY_ENTRIES_QUERY) as copy:
+            copy.write(payload)
+
+    def _to_csv(self, entries: pd.DataFrame) -> bytes:
+        table = pa.table({
+            "id": [str(uuid7()) for _ in range(len(entries))],
+            "forecast_id": entries["forecast_id"].astype(str).to_numpy(),
+            "yhat": entries["yhat"].to_numpy(dtype="float64"),
+            "yhat_upper": entries["yhat_upper"].to_numpy(dtype="float64"),
+            "yhat_lower": entries["yhat_lower"].to_numpy(dtype="float64"),
+            "date": pd.to_datetime(entries["ds"]).to_numpy(dtype="datetime64[D]"),
+        })
+        payload = io.BytesIO()
+        pa_csv.write_csv(table, payload, pa_csv.WriteOptions(include_header=False))
+        return payload.getvalue()
+
+    def _concat(self, forecast_dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        if not forecast_dfs:
+            return pd.DataFrame(columns=["forecast_id", "ds", "yhat", "yhat_lower", "yhat_upper"])
+
+        frames = list(forecast_dfs.values())
+        entries = pd.concat(frames, ignore_index=True)
+        entries["forecast_id"] = np.repeat(
+            np.array([str(forecast_id) for forecast_id in forecast_dfs], dtype=object),
+            [len(df) for df in frames],
+        )
+        return entries
+
+
+class AsyncForecastEntryRepository:
+    """Async counterpart of the `ForecastEntryRepository` writes made per request."""
+
+    def __init__(self, cur: AsyncCursor):
+        self.cur = cur
+
+    async def save_forecast_entries(self, entries: pd.DataFrame) -> None:
+        if entries.empty:
+            return
+
+        payload = self._to_csv(entries)
+        async with self.cur.copy(COPY_ENTRIES_QUERY) as copy:
+            await copy.write(payload)
+
+    async def replace_forecast_dataframe(self, forecast_id: str, forecast_df: pd.DataFrame) -> None:
+        await self.replace_forecast_entries([str(forecast_id)], self._concat({forecast_id: forecast_df}))
+
+    async def replace_forecast_entries(self, forecast_ids: list[str], entries: pd.DataFrame) -> None:
+        """
+        Atomically swap the entries of `forecast_ids` for `entries`: readers see either
+        the old or the new entries, never a half-written forecast. The ids are explicit
+        so a forecast without new entries still loses its stale ones.
+        """
+        async with self.cur.connection.transaction():
+            await self.cur.execute(DELETE_ENTRIES_QUERY, (forecast_ids,))
+            await self.save_forecast_entries(entries)
+
+    _to_csv = ForecastEntryRepository._to_csv
+    _concat = ForecastEntryRepository._concat
@@ -0,0 +1,188 @@
+from typing import Any
+from psycopg import AsyncCursor
+from psycopg.cursor import Cursor
+from psycopg.types.json import Jsonb
+from forecasting_module.domain.entities.forecast_job import ForecastJob, ForecastJobKind
+
+JOB_COLUMNS = """
+    id, kind, status, payload, result, error, attempts, created_at, started_at, finished_at
+"""
+
+ENQUEUE_QUERY = """
+    INSERT INTO forecast_job (id, kind, payload, dedup_key)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (dedup_key) WHERE status IN ('queued', 'running')
+    DO NOTHING
+    RETURNING id
+"""
+
+ACTIVE_JOB_QUERY = """
+    SELECT id
+    FROM forecast_job
+    WHERE dedup_key = %s AND status IN ('queued', 'running')
+"""
+
+CLAIM_QUERY = f"""
+    UPDATE forecast_job
+    SET status = 'running',
+        attempts = attempts + 1,
+        locked_by = %s,
+        lease_expires_at = now() + make_interval(secs => %s),
+        started_at = now()
+    WHERE id = (
+        SELECT id
+        FROM forecast_job
+        WHERE status = 'queued'
+           OR (status = 'running' AND lease_expires_at < now())
+        ORDER BY created_at
+        FOR UPDATE SKIP LOCKED
+        LIMIT 1
+    )
+    RETURNING {JOB_COLUMNS}
+"""
+
+EXTEND_LEASE_QUERY = """
+    UPDATE forecast_job
+    SET lease_expires_at = now() + make_interval(secs => %s)
+    WHERE id = %s AND locked_by = %s AND status = 'running'
+"""
+
+RELEASE_QUERY = """
+    UPDATE forecast_job
+    SET status = 'queued', attempts = attempts - 1, locked_by = NULL, lease_expires_at = NULL
+    WHERE id = %s AND locked_by = %s AND status = 'running'
+"""
+
+FINISH_QUERY = """
+    UPDATE forecast_job
+    SET status = %s,
+        result = %s,
+        error = %s,
+        locked_by = NULL,
+        lease_expires_at = NULL,
+        finished_at = now()
+    WHERE id = %s AND locked_by = %s
+"""
+
+FIND_ONE_BY_ID_QUERY = f"SELECT {JOB_COLUMNS} FROM forecast_job WHERE id = %s"
+
+
+def _finish_params(
+    job_id: str,
+    worker_id: str,
+    status: str,
+    result: dict[str, Any] | None,
+    error: dict[str, Any] | None,
+) -> tuple:
+    return (
+        status,
+        Jsonb(result) if result is not None else None,
+        Jsonb(error) if error is not None else None,
+        job_id,
+        worker_id,
+    )
+
+
+class ForecastJobRepository:
+    def __init__(self, cur: Cursor):
+        self.cur = cur
+
+    def enqueue(self, job_id: str, kind: ForecastJobKind, payload: dict[str, Any], dedup_key: str) -> str | None:
+        """
+        Insert a queued job, unless a job with the same `dedup_key` is still queued or
+        running. Returns the id of the job that will produce the result, or None when
+        the conflicting job finished before it could be read (the caller retries).
+        """
+        self.cur.execute(ENQUEUE_QUERY, (job_id, kind, Jsonb(payload), dedup_key))
+        row = self.cur.fetchone()
+        if row:
+            return str(row[0])
+
+        self.cur.execute(ACTIVE_JOB_QUERY, (dedup_key,))
+        row = self.cur.fetchone()
+        return str(row[0]) if row else None
+
+    def claim(self, worker_id: str, lease_seconds: int) -> ForecastJob | None:
+        """
+        Take the oldest queued job (or a running one whose worker let its lease expire)
+        and lease it to `worker_id`. SKIP LOCKED lets concurrent workers claim
+        different jobs without waiting on each other.
+        """
+        self.cur.execute(CLAIM_QUERY, (worker_id, lease_seconds))
+        row = self.cur.fetchone()
+        return self.to_entity(row) if row else None
+
+    def extend_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        self.cur.execute(EXTEND_LEASE_QUERY, (lease_seconds, job_id, worker_id))
+        return self.cur.rowcount == 1
+
+    def release(self, job_id: str, worker_id: str) -> None:
+        """Put a claimed job back in the queue without counting the attempt."""
+        self.cur.execute(RELEASE_QUERY, (job_id, worker_id))
+
+    def complete(self, job_id: str, worker_id: str, result: dict[str, Any]) -> None:
+        self.cur.execute(FINISH_QUERY, _finish_params(job_id, worker_id, "succeeded", result, None))
+
+    def fail(self, job_id: str, worker_id: str, error: dict[str, Any]) -> None:
+        self.cur.execute(FINISH_QUERY, _finish_params(job_id, worker_id, "failed", None, error))
+
+    def find_one_by_id(self, job_id: str) -> ForecastJob | None:
+        self.cur.execute(FIND_ONE_BY_ID_QUERY, (job_id,))
+        row = self.cur.fetchone()
+        return self.to_entity(row) if row else None
+
+    def to_entity(self, row: tuple) -> ForecastJob:
+        return ForecastJob(
+            id=str(row[0]),
+            kind=row[1],
+            status=row[2],
+            payload=row[3],
+            result=row[4],
+            error=row[5],
+            attempts=row[6],
+            created_at=row[7],
+            started_at=row[8],
+            finished_at=row[9],
+        )
+
+
+class AsyncForecastJobRepository:
+    """`ForecastJobRepository` over an async cursor, for the API and the job runner."""
+
+    def __init__(self, cur: AsyncCursor):
+        self.cur = cur
+
+    async def enqueue(self, job_id: str, kind: ForecastJobKind, payload: dict[str, Any], dedup_key: str) -> str | None:
+        await self.cur.execute(ENQUEUE_QUERY, (job_id, kind, Jsonb(payload), dedup_key))
+        row = await self.cur.fetchone()
+        if row:
+            return str(row[0])
+
+        await self.cur.execute(ACTIVE_JOB_QUERY, (dedup_key,))
+        row = await self.cur.fetchone()
+        return str(row[0]) if row else None
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> ForecastJob | None:
+        await self.cur.execute(CLAIM_QUERY, (worker_id, lease_seconds))
+        row = await self.cur.fetchone()
+        return self.to_entity(row) if row else None
+
+    async def extend_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        await self.cur.execute(EXTEND_LEASE_QUERY, (lease_seconds, job_id, worker_id))
+        return self.cur.rowcount == 1
+
+    async def release(self, job_id: str, worker_id: str) -> None:
+        await self.cur.execute(RELEASE_QUERY, (job_id, worker_id))
+
+    async def complete(self, job_id: str, worker_id: str, result: dict[str, Any]) -> None:
+        await self.cur.execute(FINISH_QUERY, _finish_params(job_id, worker_id, "succeeded", result, None))
+
+    async def fail(self, job_id: str, worker_id: str, error: dict[str, Any]) -> None:
+        await self.cur.execute(FINISH_QUERY, _finish_params(job_id, worker_id, "failed", None, error))
+
+    async def find_one_by_id(self, job_id: str) -> ForecastJob | None:
+        await self.cur.execute(FIND_ONE_BY_ID_QUERY, (job_id,))
+        row = await self.cur.fetchone()
+        return self.to_entity(row) if row else None
+
+    to_entity = ForecastJobRepository.to_entity
@@ -1,17 +1,50 @@
+from psycopg import AsyncCursor
 from psycopg.cursor import Cursor
 from forecasting_module.domain.entities.forecast import Forecast
 from typing import Optional, Tuple, Any
 
+LOCK_FORECAST_QUERY = "SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))"
+
+MARK_PROCESSED_QUERY = """
+    UPDATE forecast
+    SET processed = TRUE, input_fingerprint = %s, updated_at = now()
+    WHERE id = ANY(%s)
+"""
+
+GET_FORECAST_QUERY = """
+    SELECT
+        id,
+        product_id,
+        account_id,
+        prophet_model_id,
+        croston_model_id,
+        model_type,
+        data_depth,
+        forecast_start_date,
+        forecast_end_date,
+        created_at,
+        updated_at,
+        input_fingerprint
+    FROM forecast
+    WHERE
+        id = %s
+    AND deleted_at IS NULL
+"""
+
 class ForecastRepository:
     def __init__(self, cur: Cursor):
         self.cur = cur
 
     def create_forecast(self, forecast: Forecast):
+        self.create_forecasts([forecast])
+
+    def create_forecasts(self, forecasts: list[Forecast]):
         sql = """
         INSERT INTO forecast ( 
             id,
             product_id,
             account_id,
+            model_type,
             data_depth,
             forecast_start_date,
             forecast_end_date,
@@ -20,49 +53,67 @@ class ForecastRepository:
             updated_at,
             deleted_at
         ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
         )
         """
-        self.cur.execute(
+        self.cur.executemany(
             sql,
-            (
-                forecast.id,
-                forecast.product_id,
-                forecast.account_id,
-                forecast.data_depth,
-                forecast.forecast_start_date,
-                forecast.forecast_end_date,
-                False,
-                forecast.created_at,
-                forecast.updated_at,
-                forecast.deleted_at,
-            ),
+            [
+                (
+                    forecast.id,
+                    forecast.product_id,
+                    forecast.account_id,
+                    forecast.model_type,
+                    forecast.data_depth,
+                    forecast.forecast_start_date,
+                    forecast.forecast_end_date,
+                    False,
+                    forecast.created_at,
+                    forecast.updated_at,
+                    forecast.deleted_at,
+                )
+                for forecast in forecasts
+            ],
         )
 
-    def get_forecast(self, sales_forecast_id: str) -> Optional[Forecast]:
-        sql = """
-            SELECT  
-                id,
-                product_id,
-                account_id,
-                prophet_model_id,
-                croston_model_id,
-                model_type,
-                data_depth,
-                forecast_start_date,
-                forecast_end_date,
-                created_at,
-                updated_at
-            from forecast
-            WHERE 
-                id = %s
-            AND deleted_at IS NULL
+    def lock_forecast(self, forecast_id: str) -> None:
+        """
+        Serialize work on one forecast across processes and replicas until the
+        current transaction ends.
         """
-        self.cur.execute(sql, (str(sales_forecast_id),))
+        self.cur.execute(LOCK_FORECAST_QUERY, (f"forecast:{forecast_id}",))
+
+    def mark_processed(self, forecast_ids: list[str], input_fingerprint: str | None = None) -> None:
+        self.cur.execute(MARK_PROCESSED_QUERY, (input_fingerprint, [str(forecast_id) for forecast_id in forecast_ids]))
+
+    def get_forecast(self, sales_forecast_id: str) -> Optional[Forecast]:
+        self.cur.execute(GET_FORECAST_QUERY, (str(sales_forecast_id),))
         row: Optional[Tuple[Any, ...]] = self.cur.fetchone()
         if row is None:
             return None
-        forecast = Forecast(
-            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8],row[9], row[10], None
+        return self.to_entity(row)
+
+    def to_entity(self, row: tuple) -> Forecast:
+        return Forecast(
+            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8],row[9], row[10], None, row[11]
         )
-        return forecast
+
+
+class AsyncForecastRepository:
+    """Async counterpart of the `ForecastRepository` calls made per request."""
+
+    def __init__(self, cur: AsyncCursor):
+        self.cur = cur
+
+    async def lock_forecast(self, forecast_id: str) -> None:
+        await self.cur.execute(LOCK_FORECAST_QUERY, (f"forecast:{forecast_id}",))
+
+    async def mark_processed(self, forecast_ids: list[str], input_fingerprint: str | None = None) -> None:
+        await self.cur.execute(MARK_PROCESSED_QUERY, (input_fingerprint, [str(forecast_id) for forecast_id in forecast_ids]))
+
+    async def get_forecast(self, sales_forecast_id: str) -> Optional[Forecast]:
+        await self.cur.execute(GET_FORECAST_QUERY, (str(sales_forecast_id),))
+        row = await self.cur.fetchone()
+        return self.to_entity(row) if row else None
+
+    to_entity = ForecastRepository.to_entity
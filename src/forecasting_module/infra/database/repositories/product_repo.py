@@ -1,6 +1,9 @@
+from psycopg import AsyncCursor
 from psycopg.cursor import Cursor
 from forecasting_module.domain.entities.product import Product
 
+FIND_ONE_BY_ID_QUERY = "SELECT id, sale_count FROM product WHERE id = %s AND deleted_at IS NULL"
+
 class ProductRepository:
     def __init__(self, cur: Cursor):
         self.cur = cur
@@ -10,12 +13,37 @@ class ProductRepository:
         rows = self.cur.fetchall()
         return [self.to_entity(row) for row in rows]
 
-    def find_one_by_id(self, id: str) -> Product | None:
+    def find_all_by_account_id(self, account_id: str) -> list[Product]:
         self.cur.execute(
-            "SELECT id, sale_count FROM product WHERE id = %s AND deleted_at IS NULL", (id,)
+            "SELECT id, sale_count FROM product WHERE account_id = %s AND deleted_at IS NULL", (account_id,)
         )
+        rows = self.cur.fetchall()
+        return [self.to_entity(row) for row in rows]
+
+    def find_all_by_account_id_and_ids(self, account_id: str, ids: list[str]) -> list[Product]:
+        self.cur.execute(
+            "SELECT id, sale_count FROM product WHERE account_id = %s AND id = ANY(%s) AND deleted_at IS NULL",
+            (account_id, ids),
+        )
+        rows = self.cur.fetchall()
+        return [self.to_entity(row) for row in rows]
+
+    def find_one_by_id(self, id: str) -> Product | None:
+        self.cur.execute(FIND_ONE_BY_ID_QUERY, (id,))
         row = self.cur.fetchone()
         return self.to_entity(row) if row else None
 
     def to_entity(self, row: tuple) -> Product:
         return Product(row[0], row[1])
+
+
+class AsyncProductRepository:
+    def __init__(self, cur: AsyncCursor):
+        self.cur = cur
+
+    async def find_one_by_id(self, id: str) -> Product | None:
+        await self.cur.execute(FIND_ONE_BY_ID_QUERY, (id,))
+        row = await self.cur.fetchone()
+        return self.to_entity(row) if row else None
+
+    to_entity = ProductRepository.to_entity
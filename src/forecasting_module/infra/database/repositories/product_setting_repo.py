@@ -20,3 +20,10 @@ class ProductSettingRepository:
         if row is None:
             return None
         return ProductSetting(row[0], row[1], row[2])
+
+    def save_classifications(self, classifications: dict[str, str]) -> None:
+        """Set `classification` for many products (product_id -> "slow" | "fast")."""
+        self.cur.executemany(
+            "UPDATE product_setting SET classification = %s WHERE product_id = %s",
+            [(classification, product_id) for product_id, classification in classifications.items()],
+        )
@@ -1,10 +1,10 @@
+from psycopg import AsyncCursor
 from psycopg.cursor import Cursor
 from forecasting_module.domain.entities.prophet_model import ProphetModel
 from datetime import date
 from dataclasses import dataclass
 from datetime import date
 from typing import Optional, Literal
-from prophet import Prophet
 from uuid_utils import uuid7
 import pandas as pd
 
@@ -36,7 +36,8 @@ class ProphetChangepoint:
 @dataclass
 class ProphetModelSetting:
     id: str
-    prophet_model_id: str
+    # None only for settings that are never saved (a backtest of a product without a model)
+    prophet_model_id: Optional[str]
 
     growth: GrowthType
 
@@ -60,7 +61,7 @@ class ProphetModelSetting:
     seasons: list[ProphetSeasonality]
     changepoints: list[ProphetChangepoint]
 
-def build_default_prophet_settings(prophet_model_id: str, model: Prophet) -> ProphetModelSetting:
+def build_default_prophet_settings(prophet_model_id: str | None) -> ProphetModelSetting:
     return ProphetModelSetting(
         id=str(uuid7()),
         prophet_model_id=prophet_model_id,
@@ -87,13 +88,19 @@ def build_default_prophet_settings(prophet_model_id: str, model: Prophet) -> Pro
         changepoints=[]
     )
 
+def _seasonality_flag(value: SeasonalityBool | None) -> str | bool | None:
+    # stored as text; Prophet takes "auto" or a bool (a string is read as a Fourier order)
+    return {"true": True, "false": False}.get(value, value)  # pyright: ignore
+
 def build_prophet_from_settings(settings: ProphetModelSetting):
+    from prophet import Prophet
+
     model = Prophet(
         growth=settings.growth,
         changepoint_range=settings.changepoint_range,
-        yearly_seasonality=settings.yearly_seasonality,
-        weekly_seasonality=settings.weekly_seasonality,
-        daily_seasonality=settings.daily_seasonality,
+        yearly_seasonality=_seasonality_flag(settings.yearly_seasonality),
+        weekly_seasonality=_seasonality_flag(settings.weekly_seasonality),
+        daily_seasonality=_seasonality_flag(settings.daily_seasonality),
         seasonality_mode=settings.seasonality_mode,
         seasonality_prior_scale=settings.seasonality_prior_scale,
         holidays_prior_scale=settings.holidays_prior_scale,
@@ -117,6 +124,160 @@ def build_prophet_from_settings(settings: ProphetModelSetting):
     return model
 
 
+MODELS_WITH_SETTINGS_QUERY = """
+    SELECT
+        m.id,
+        m.product_id,
+        m.name,
+        m.file_path,
+        m.active,
+        m.trained_at,
+
+        s.id,
+        s.prophet_model_id,
+        s.growth,
+        s.changepoint_range,
+        s.changepoint_prior_scale,
+
+        s.yearly_seasonality,
+        s.weekly_seasonality,
+        s.daily_seasonality,
+
+        s.seasonality_mode,
+        s.seasonality_prior_scale,
+        s.holidays_prior_scale,
+
+        s.interval_width,
+        s.uncertainty_samples,
+
+        s.scaling,
+        s.holidays_mode,
+
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', ps.id,
+                'model_setting_id', ps.model_setting_id,
+                'name', ps.name,
+                'period', ps.period,
+                'fourier_order', ps.fourier_order,
+                'prior_scale', ps.prior_scale,
+                'mode', ps.mode
+            ) ORDER BY ps.name, ps.period)
+            FROM prophet_model_seasonality ps
+            WHERE ps.model_setting_id = s.id
+        ), '[]'::json) AS seasons,
+
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', pc.id,
+                'model_setting_id', pc.model_setting_id,
+                'ds', pc.ds
+            ) ORDER BY pc.ds)
+            FROM prophet_model_changepoint pc
+            WHERE pc.model_setting_id = s.id
+        ), '[]'::json) AS changepoints
+    FROM prophet_model m
+    LEFT JOIN prophet_model_setting s ON s.prophet_model_id = m.id
+    WHERE m.product_id = ANY(%s);
+"""
+
+SAVE_MODEL_SETTINGS_QUERY = """
+    INSERT INTO prophet_model_setting (
+        id,
+        prophet_model_id,
+        growth,
+        changepoint_range,
+        changepoint_prior_scale,
+
+        yearly_seasonality,
+        weekly_seasonality,
+        daily_seasonality,
+
+        seasonality_mode,
+        seasonality_prior_scale,
+        holidays_prior_scale,
+
+        interval_width,
+        uncertainty_samples,
+
+        scaling,
+        holidays_mode
+    )
+    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    ON CONFLICT (id)
+    DO UPDATE SET
+        prophet_model_id = EXCLUDED.prophet_model_id,
+        growth = EXCLUDED.growth,
+        changepoint_range = EXCLUDED.changepoint_range,
+        changepoint_prior_scale = EXCLUDED.changepoint_prior_scale,
+
+        yearly_seasonality = EXCLUDED.yearly_seasonality,
+        weekly_seasonality = EXCLUDED.weekly_seasonality,
+        daily_seasonality = EXCLUDED.daily_seasonality,
+
+        seasonality_mode = EXCLUDED.seasonality_mode,
+        seasonality_prior_scale = EXCLUDED.seasonality_prior_scale,
+        holidays_prior_scale = EXCLUDED.holidays_prior_scale,
+
+        interval_width = EXCLUDED.interval_width,
+        uncertainty_samples = EXCLUDED.uncertainty_samples,
+
+        scaling = EXCLUDED.scaling,
+        holidays_mode = EXCLUDED.holidays_mode
+"""
+
+DELETE_SEASONALITIES_QUERY = """
+    DELETE FROM prophet_model_seasonality
+    WHERE model_setting_id = %s;
+"""
+
+SAVE_SEASONALITY_QUERY = """
+    INSERT INTO prophet_model_seasonality (
+        id,
+        model_setting_id,
+        name,
+        period,
+        fourier_order,
+        prior_scale,
+        mode
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+"""
+
+DELETE_CHANGEPOINTS_QUERY = """
+    DELETE FROM prophet_model_changepoint
+    WHERE model_setting_id = %s;
+"""
+
+SAVE_CHANGEPOINT_QUERY = """
+    INSERT INTO prophet_model_changepoint (
+        id,
+        model_setting_id,
+        ds
+    )
+    VALUES (%s, %s, %s);
+"""
+
+SAVE_MODEL_QUERY = """
+    INSERT INTO prophet_model (
+        id,
+        product_id,
+        name,
+        file_path,
+        active,
+        trained_at
+    )
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (id)
+    DO UPDATE SET
+        product_id = EXCLUDED.product_id,
+        name = EXCLUDED.name,
+        file_path = EXCLUDED.file_path,
+        active = EXCLUDED.active,
+        trained_at = EXCLUDED.trained_at;
+"""
+
+
 class ProphetModelRepository:
     def __init__(self, cur: Cursor):
         self.cur = cur
@@ -135,79 +296,29 @@ class ProphetModelRepository:
 
         return result[0] if result else False
 
-    def get_model_by_product_id(self, product_id: str) -> ProphetModel | None:
-        query = """
-            SELECT
-                id,
-                product_id,
-                name,
-                file_path,
-                active,
-                trained_at
-            FROM prophet_model
-            WHERE product_id = %s;
-        """
+    def save_model_settings(self, setting: ProphetModelSetting):
+        """Upsert the settings row and replace its seasonalities and changepoints."""
+        self.cur.execute(SAVE_MODEL_SETTINGS_QUERY, self._setting_params(setting))
 
-        self.cur.execute(query, (product_id,))
-        result = self.cur.fetchone()
+        self.cur.execute(DELETE_SEASONALITIES_QUERY, (setting.id,))
+        if setting.seasons:
+            self.cur.executemany(SAVE_SEASONALITY_QUERY, self._seasonality_params(setting))
 
-        if not result:
-            return None
+        self.cur.execute(DELETE_CHANGEPOINTS_QUERY, (setting.id,))
+        if setting.changepoints:
+            self.cur.executemany(SAVE_CHANGEPOINT_QUERY, self._changepoint_params(setting))
 
-        return ProphetModel(
-            id=result[0],
-            product_id=result[1],
-            name=result[2],
-            model_path=result[3],
-            active=result[4],
-            trained_at=result[5]
-        )
-        
-    def save_model_settings(self, setting: ProphetModelSetting):
-        self.cur.execute("""
-            INSERT INTO prophet_model_setting (
-                id,
-                prophet_model_id,
-                growth,
-                changepoint_range,
-                changepoint_prior_scale,
-
-                yearly_seasonality,
-                weekly_seasonality,
-                daily_seasonality,
-
-                seasonality_mode,
-                seasonality_prior_scale,
-                holidays_prior_scale,
-
-                interval_width,
-                uncertainty_samples,
-
-                scaling,
-                holidays_mode
-            )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            ON CONFLICT (id)
-            DO UPDATE SET
-                prophet_model_id = EXCLUDED.prophet_model_id,
-                growth = EXCLUDED.growth,
-                changepoint_range = EXCLUDED.changepoint_range,
-                changepoint_prior_scale = EXCLUDED.changepoint_prior_scale,
-
-                yearly_seasonality = EXCLUDED.yearly_seasonality,
-                weekly_seasonality = EXCLUDED.weekly_seasonality,
-                daily_seasonality = EXCLUDED.daily_seasonality,
-
-                seasonality_mode = EXCLUDED.seasonality_mode,
-                seasonality_prior_scale = EXCLUDED.seasonality_prior_scale,
-                holidays_prior_scale = EXCLUDED.holidays_prior_scale,
-
-                interval_width = EXCLUDED.interval_width,
-                uncertainty_samples = EXCLUDED.uncertainty_samples,
-
-                scaling = EXCLUDED.scaling,
-                holidays_mode = EXCLUDED.holidays_mode
-        """, (
+    def _seasonality_params(self, setting: ProphetModelSetting) -> list[tuple]:
+        return [
+            (s.id, setting.id, s.name, s.period, s.fourier_order, s.prior_scale, s.mode)
+            for s in setting.seasons
+        ]
+
+    def _changepoint_params(self, setting: ProphetModelSetting) -> list[tuple]:
+        return [(c.id, setting.id, c.ds) for c in setting.changepoints]
+
+    def _setting_params(self, setting: ProphetModelSetting) -> tuple:
+        return (
             setting.id,
             setting.prophet_model_id,
             setting.growth,
@@ -227,84 +338,60 @@ class ProphetModelRepository:
 
             setting.scaling,
             setting.holidays_mode
-        ))
+        )
 
-    def get_model_settings_by_product_id(self, product_id: str) -> ProphetModelSetting | None:
-        query = """
-            SELECT
-                id,
-                prophet_model_id,
-                growth,
-                changepoint_range,
-                changepoint_prior_scale,
-
-                yearly_seasonality,
-                weekly_seasonality,
-                daily_seasonality,
-
-                seasonality_mode,
-                seasonality_prior_scale,
-                holidays_prior_scale,
-
-                interval_width,
-                uncertainty_samples,
-
-                scaling,
-                holidays_mode
-            FROM prophet_model_setting
-            WHERE prophet_model_id = (
-                SELECT id FROM prophet_model WHERE product_id = %s
-            );
+    def get_models_with_settings_by_product_ids(
+        self, product_ids: list[str]
+    ) -> dict[str, tuple[ProphetModel, ProphetModelSetting | None]]:
         """
+        Model rows with their full settings trees (seasonalities and changepoints),
+        in one query for any number of products, keyed by product id. Products
+        without a model are absent.
+        """
+        self.cur.execute(MODELS_WITH_SETTINGS_QUERY, (product_ids,))
+        return self._to_models(self.cur.fetchall())
+
+    def _to_models(self, rows: list[tuple]) -> dict[str, tuple[ProphetModel, ProphetModelSetting | None]]:
+        models: dict[str, tuple[ProphetModel, ProphetModelSetting | None]] = {}
+        for row in rows:
+            model = ProphetModel(
+                id=row[0],
+                product_id=row[1],
+                name=row[2],
+                model_path=row[3],
+                active=row[4],
+                trained_at=row[5]
+            )
+            setting = self._to_setting(row[6:]) if row[6] is not None else None
+            models[str(model.product_id)] = (model, setting)
+        return models
 
-        self.cur.execute(query, (product_id,))
-        row = self.cur.fetchone()
-
-        if not row:
-            return None
-
-        setting_id = row[0]
-        model_id = row[1]
-
-        self.cur.execute("""
-            SELECT id, model_setting_id, name, period, fourier_order, prior_scale, mode
-            FROM prophet_model_seasonality
-            WHERE model_setting_id = %s;
-        """, (setting_id,))
-        seasons_rows = self.cur.fetchall()
-
+    def _to_setting(self, row: tuple) -> ProphetModelSetting:
         seasons = [
             ProphetSeasonality(
-                id=r[0],
-                model_setting_id=r[1],
-                name=r[2],
-                period=float(r[3]),
-                fourier_order=r[4],
-                prior_scale=r[5],
-                mode=r[6]
+                id=r["id"],
+                model_setting_id=r["model_setting_id"],
+                name=r["name"],
+                period=float(r["period"]),
+                fourier_order=r["fourier_order"],
+                prior_scale=r["prior_scale"],
+                mode=r["mode"]
             )
-            for r in seasons_rows
+            for r in row[15]
         ]
 
-        self.cur.execute("""
-            SELECT id, model_setting_id, ds
-            FROM prophet_model_changepoint
-            WHERE model_setting_id = %s;
-        """, (setting_id,))
-        cp_rows = self.cur.fetchall()
-
         changepoints = [
             ProphetChangepoint(
-                id=r[0],
-                model_setting_id=r[1],
-                ds=r[2]
+                id=r["id"],
+                model_setting_id=r["model_setting_id"],
+                ds=date.fromisoformat(r["ds"][:10])
             )
-            for r in cp_rows
+            for r in row[16]
         ]
 
         return ProphetModelSetting(
-            id=setting_id,
-            prophet_model_id=model_id,
+            id=row[0],
+            prophet_model_id=row[1],
 
             growth=row[2],
             changepoint_range=row[3],
@@ -329,30 +416,53 @@ class ProphetModelRepository:
         )
 
     def save(self, model: ProphetModel):
-        query = """
-            INSERT INTO prophet_model (
-                id,
-                product_id,
-                name,
-                file_path,
-                active,
-                trained_at
-            )
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id)
-            DO UPDATE SET
-                product_id = EXCLUDED.product_id,
-                name = EXCLUDED.name,
-                file_path = EXCLUDED.file_path,
-                active = EXCLUDED.active,
-                trained_at = EXCLUDED.trained_at;
-        """
+        self.cur.execute(SAVE_MODEL_QUERY, self._model_params(model))
 
-        self.cur.execute(query, (
+    def _model_params(self, model: ProphetModel) -> tuple:
+        return (
             model.id,
             model.product_id,
             model.name,
             model.model_path,
             model.active,
             model.trained_at
-        ))
+        )
+
+
+class AsyncProphetModelRepository:
+    """Async counterpart of the `ProphetModelRepository` calls made per request."""
+
+    def __init__(self, cur: AsyncCursor):
+        self.cur = cur
+
+    async def get_model_with_settings_by_product_id(
+        self, product_id: str
+    ) -> tuple[ProphetModel | None, ProphetModelSetting | None]:
+        """
+        Load the product's model row together with its full settings tree
+        (seasonalities and changepoints) in a single query.
+        """
+        await self.cur.execute(MODELS_WITH_SETTINGS_QUERY, ([product_id],))
+        models = self._to_models(await self.cur.fetchall())
+        return models.get(str(product_id), (None, None))
+
+    async def save_model_settings(self, setting: ProphetModelSetting):
+        await self.cur.execute(SAVE_MODEL_SETTINGS_QUERY, self._setting_params(setting))
+
+        await self.cur.execute(DELETE_SEASONALITIES_QUERY, (setting.id,))
+        if setting.seasons:
+            await self.cur.executemany(SAVE_SEASONALITY_QUERY, self._seasonality_params(setting))
+
+        await self.cur.execute(DELETE_CHANGEPOINTS_QUERY, (setting.id,))
+        if setting.changepoints:
+            await self.cur.executemany(SAVE_CHANGEPOINT_QUERY, self._changepoint_params(setting))
+
+    async def save(self, model: ProphetModel):
+        await self.cur.execute(SAVE_MODEL_QUERY, self._model_params(model))
+
+    _to_models = ProphetModelRepository._to_models
+    _to_setting = ProphetModelRepository._to_setting
+    _setting_params = ProphetModelRepository._setting_params
+    _seasonality_params = ProphetModelRepository._seasonality_params
+    _changepoint_params = ProphetModelRepository._changepoint_params
+    _model_params = ProphetModelRepository._model_params
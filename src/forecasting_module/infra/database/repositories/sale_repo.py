@@ -1,43 +1,161 @@
-from datetime import date
+import pandas as pd
+import pyarrow as pa
+from psycopg import AsyncCursor
 from psycopg.cursor import Cursor
-from forecasting_module.domain.entities.sale import Sale
+from forecasting_module.infra.database.columnar import fetch_frame, fetch_frame_async
+
+
+DAILY_SALES_SCHEMA = pa.schema([("ds", pa.date32()), ("y", pa.float64())])
+PRODUCT_DAILY_SALES_SCHEMA = pa.schema([("product_id", pa.string()), ("ds", pa.date32()), ("y", pa.float64())])
+
+# Dense daily series of one product, cut to the most recent `data_depth` percent of its history
+DAILY_SERIES_QUERY = """
+    WITH bounds AS (
+        SELECT
+            MIN(date) AS first_date,
+            MAX(date) AS last_date
+        FROM sale
+        WHERE
+            product_id = %s
+            AND deleted_at IS NULL
+    ),
+    daily AS (
+        SELECT
+            s.date,
+            SUM(s.quantity) AS quantity
+        FROM sale s, bounds b
+        WHERE
+            s.product_id = %s
+            AND s.deleted_at IS NULL
+            AND s.date >= b.first_date + ((b.last_date - b.first_date + 1) * (100 - %s)) / 100
+        GROUP BY s.date
+    )
+    SELECT
+        d::date AS ds,
+        COALESCE(daily.quantity, 0) AS y
+    FROM generate_series(
+        (SELECT MIN(date) FROM daily),
+        (SELECT MAX(date) FROM daily),
+        interval '1 day'
+    ) AS d
+    LEFT JOIN daily ON daily.date = d::date
+    ORDER BY ds ASC
+"""
+
+# Checksum of what DAILY_SERIES_QUERY returns, without transferring the series
+DAILY_SERIES_CHECKSUM_QUERY = """
+    WITH bounds AS (
+        SELECT
+            MIN(date) AS first_date,
+            MAX(date) AS last_date
+        FROM sale
+        WHERE
+            product_id = %s
+            AND deleted_at IS NULL
+    ),
+    daily AS (
+        SELECT
+            s.date,
+            SUM(s.quantity) AS quantity
+        FROM sale s, bounds b
+        WHERE
+            s.product_id = %s
+            AND s.deleted_at IS NULL
+            AND s.date >= b.first_date + ((b.last_date - b.first_date + 1) * (100 - %s)) / 100
+        GROUP BY s.date
+    )
+    SELECT md5(string_agg(date::text || ':' || quantity::text, ',' ORDER BY date))
+    FROM daily
+"""
 
 class SaleRepository:
     def __init__(self, cur: Cursor):
         self.cur = cur
 
-    def get_date_bounds(self, product_id: str) -> tuple[date, date] | None:
-        sql = """
-            SELECT 
-                MIN(date) AS first_date,
-                MAX(date) AS last_date
-            FROM sale
-            WHERE 
-                product_id = %s 
-                AND deleted_at IS NULL
+    def find_daily_series(self, product_id: str, data_depth: int) -> pd.DataFrame:
+        """
+        Dense daily series for one product in a single round trip.
+
+        Keeps the most recent `data_depth` percent of the product's sales history,
+        sums sales per day and fills days without sales with 0 between the first and
+        last sale of that window. Returns ['ds' (datetime64), 'y' (float)]; empty when
+        the product has no sales.
+        """
+        return fetch_frame(self.cur, DAILY_SERIES_QUERY, (product_id, product_id, data_depth), DAILY_SALES_SCHEMA)
+
+    def get_daily_series_checksum(self, product_id: str, data_depth: int) -> str | None:
+        """
+        Checksum of the sales `find_daily_series` would return, computed in the
+        database so the series itself is not transferred. None when there are no sales.
         """
-        self.cur.execute(sql, (product_id,))
+        self.cur.execute(DAILY_SERIES_CHECKSUM_QUERY, (product_id, product_id, data_depth))
         row = self.cur.fetchone()
-        return (row[0], row[1]) if row and row[0] and row[1] else None
+        return row[0] if row else None
+
+    def find_daily_series_by_product_ids(
+        self, product_ids: list[str], data_depth: int
+    ) -> pd.DataFrame:
+        """
+        `find_daily_series` for many products at once, each cut to the most recent
+        `data_depth` percent of its own history.
 
-    def find_by_product_id_and_date_range(
-        self, product_id: str, start_date: date, end_date: date
-    ) -> list[Sale]:
+        Returns a long DataFrame with columns ['product_id', 'ds', 'y'], sorted by product and date.
+        Products without sales are absent.
+        """
         sql = """
-            SELECT 
-                SUM(quantity) AS total_quantity,
-                date
-            FROM sale
-            WHERE 
-                product_id = %s
-                AND deleted_at IS NULL
-                AND date BETWEEN %s AND %s
-            GROUP BY product_id, date
-            ORDER BY date ASC
+            WITH bounds AS (
+                SELECT
+                    product_id,
+                    MIN(date) AS first_date,
+                    MAX(date) AS last_date
+                FROM sale
+                WHERE
+                    product_id = ANY(%s)
+                    AND deleted_at IS NULL
+                GROUP BY product_id
+            ),
+            daily AS (
+                SELECT
+                    s.product_id,
+                    s.date,
+                    SUM(s.quantity) AS quantity
+                FROM sale s
+                JOIN bounds b ON b.product_id = s.product_id
+                WHERE
+                    s.deleted_at IS NULL
+                    AND s.date >= b.first_date + ((b.last_date - b.first_date + 1) * (100 - %s)) / 100
+                GROUP BY s.product_id, s.date
+            ),
+            spans AS (
+                SELECT
+                    product_id,
+                    MIN(date) AS first_date,
+                    MAX(date) AS last_date
+                FROM daily
+                GROUP BY product_id
+            )
+            SELECT
+                sp.product_id,
+                d::date AS ds,
+                COALESCE(daily.quantity, 0) AS y
+            FROM spans sp
+            CROSS JOIN LATERAL generate_series(sp.first_date, sp.last_date, interval '1 day') AS d
+            LEFT JOIN daily ON daily.product_id = sp.product_id AND daily.date = d::date
+            ORDER BY sp.product_id, ds ASC
         """
-        self.cur.execute(sql, (product_id, start_date, end_date))
-        rows = self.cur.fetchall()
-        return [Sale(row[0], row[1]) for row in rows]
+        return fetch_frame(self.cur, sql, (product_ids, data_depth), PRODUCT_DAILY_SALES_SCHEMA)
+
 
+class AsyncSaleRepository:
+    """Async counterpart of the `SaleRepository` reads used per request."""
+
+    def __init__(self, cur: AsyncCursor):
+        self.cur = cur
 
+    async def find_daily_series(self, product_id: str, data_depth: int) -> pd.DataFrame:
+        return await fetch_frame_async(self.cur, DAILY_SERIES_QUERY, (product_id, product_id, data_depth), DAILY_SALES_SCHEMA)
 
+    async def get_daily_series_checksum(self, product_id: str, data_depth: int) -> str | None:
+        await self.cur.execute(DAILY_SERIES_CHECKSUM_QUERY, (product_id, product_id, data_depth))
+        row = await self.cur.fetchone()
+        return row[0] if row else None
@@ -0,0 +1,106 @@
+import os
+import time
+from contextlib import contextmanager
+from functools import cache
+from typing import Iterator
+from psycopg_pool.base import BasePool
+from forecasting_module.config.metrics import PROMETHEUS_MULTIPROC_DIR
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# From a Croston predict (milliseconds) to a cold Prophet fit on a long history (a minute)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+FORECAST_STAGE_SECONDS = Histogram(
+    "forecast_stage_seconds",
+    "Time spent in each stage of generating a forecast",
+    ["method", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+FORECASTS = Counter(
+    "forecasts",
+    "Single forecasts handled, by whether they were regenerated or their inputs were unchanged",
+    ["method", "outcome"],
+)
+PROPHET_MODELS = Counter(
+    "forecast_prophet_models",
+    "Fitted Prophet models used, by where they came from (cache, store or a new fit)",
+    ["source"],
+)
+MODEL_CACHE_REQUESTS = Counter(
+    "forecast_model_cache_requests",
+    "Lookups in the per-worker model cache",
+    ["result"],
+)
+MODEL_CACHE_EVICTIONS = Counter(
+    "forecast_model_cache_evictions",
+    "Models evicted from the per-worker model cache to stay within its byte budget",
+)
+MODEL_CACHE_ENTRIES = Gauge(
+    "forecast_model_cache_entries",
+    "Models held in the model caches of live workers",
+    multiprocess_mode="livesum",
+)
+MODEL_CACHE_BYTES = Gauge(
+    "forecast_model_cache_bytes",
+    "Approximate bytes held in the model caches of live workers",
+    multiprocess_mode="livesum",
+)
+
+
+@contextmanager
+def time_stage(method: str, stage: str) -> Iterator[None]:
+    """Observe the wall time of the block, unless it raises."""
+    start = time.perf_counter()
+    yield
+    FORECAST_STAGE_SECONDS.labels(method, stage).observe(time.perf_counter() - start)
+
+
+class PoolStatsCollector:
+    """
+    Connection pool gauges and counters, read from `get_stats()` at scrape time.
+
+    Checkout latency is exported as the total wait over the number of requests, so
+    `rate(db_pool_wait_seconds_total) / rate(db_pool_requests_total)` is the mean
+    time a request waited for a connection.
+    """
+
+    def __init__(self, pools: dict[str, BasePool]):
+        self.pools = pools
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_connections", "Connections open in the pool", labels=["pool"])
+        in_use = GaugeMetricFamily("db_pool_connections_in_use", "Connections checked out of the pool", labels=["pool"])
+        max_size = GaugeMetricFamily("db_pool_connections_max", "Maximum size of the pool", labels=["pool"])
+        waiting = GaugeMetricFamily("db_pool_requests_waiting", "Requests waiting for a connection", labels=["pool"])
+        requests = CounterMetricFamily("db_pool_requests", "Connections requested from the pool", labels=["pool"])
+        wait = CounterMetricFamily("db_pool_wait_seconds", "Time requests spent waiting for a connection", labels=["pool"])
+        errors = CounterMetricFamily("db_pool_request_errors", "Requests that got no connection (timeout or error)", labels=["pool"])
+
+        for name, pool in self.pools.items():
+            stats = pool.get_stats()
+            size.add_metric([name], stats.get("pool_size", 0))
+            in_use.add_metric([name], stats.get("pool_size", 0) - stats.get("pool_available", 0))
+            max_size.add_metric([name], stats.get("pool_max", 0))
+            waiting.add_metric([name], stats.get("requests_waiting", 0))
+            requests.add_metric([name], stats.get("requests_num", 0))
+            wait.add_metric([name], stats.get("requests_wait_ms", 0) / 1000)
+            errors.add_metric([name], stats.get("requests_errors", 0))
+
+        yield from (size, in_use, max_size, waiting, requests, wait, errors)
+
+
+@cache
+def metrics_registry() -> CollectorRegistry:
+    """Samples of this process and its workers, plus this process's connection pools."""
+    from forecasting_module.config.pool import async_pool, pool
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=PROMETHEUS_MULTIPROC_DIR)
+    registry.register(PoolStatsCollector({"sync": pool, "async": async_pool}))
+    return registry
+
+
+def mark_process_dead() -> None:
+    """Drop this process's live gauges; registered at exit by the forecast workers."""
+    multiprocess.mark_process_dead(os.getpid(), PROMETHEUS_MULTIPROC_DIR)
@@ -0,0 +1,52 @@
+import os
+import random
+import cProfile
+from pathlib import Path
+from typing import Callable, TypeVar, ParamSpec
+from dotenv import load_dotenv
+from forecasting_module.config.storage import PROFILES_DIR
+
+load_dotenv()
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Share of single forecast jobs profiled without being asked to (0 disables sampling)
+FORECAST_PROFILE_SAMPLE_RATE = float(os.getenv("FORECAST_PROFILE_SAMPLE_RATE", 0))
+# Most recent profiles kept in PROFILES_DIR; older ones are deleted after each write
+FORECAST_PROFILE_KEEP = int(os.getenv("FORECAST_PROFILE_KEEP", 200))
+
+
+def should_profile(requested: bool) -> bool:
+    return requested or (FORECAST_PROFILE_SAMPLE_RATE > 0 and random.random() < FORECAST_PROFILE_SAMPLE_RATE)
+
+
+def profile_path(forecast_id: str, job_id: str) -> Path:
+    return PROFILES_DIR / f"{forecast_id}-{job_id}.prof"
+
+
+def run_profiled(path: Path, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    Run `fn` under cProfile and write its stats to `path` (readable with `pstats`
+    or snakeviz), keeping only the newest `FORECAST_PROFILE_KEEP` profiles next to it.
+    Module-level so it can be sent to a worker process in place of `fn`.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        profiler.dump_stats(path)
+        _prune(path.parent)
+
+
+def _prune(profiles_dir: Path) -> None:
+    profiles = []
+    for profile in profiles_dir.glob("*.prof"):
+        try:
+            profiles.append((profile.stat().st_mtime, profile))
+        except FileNotFoundError:
+            # pruned meanwhile by another worker
+            continue
+    profiles.sort(reverse=True)
+    for _, stale in profiles[FORECAST_PROFILE_KEEP:]:
+        stale.unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+from forecasting_module.infra.metrics import (
+    MODEL_CACHE_BYTES,
+    MODEL_CACHE_ENTRIES,
+    MODEL_CACHE_EVICTIONS,
+    MODEL_CACHE_REQUESTS,
+)
+
+
+PROPHET_MODEL_CACHE_BYTES = int(os.getenv("PROPHET_MODEL_CACHE_BYTES", 256 * 1024 * 1024))
+
+
+@dataclass
+class _CacheEntry:
+    model: Any
+    size: int
+    last_date: date
+
+
+class ProphetModelCache:
+    """
+    Per-process LRU cache of fitted models, bounded by an approximate byte budget.
+
+    Keys are model store paths (`<product>/<settings hash>/<sales hash>.json`), so an
+    entry is only ever served for the exact product, settings and training data it
+    was fitted on. Sizes are the serialized artifact sizes, a stable proxy for the
+    memory a model holds (its history frame dominates).
+
+    Caching a product's fit drops its entries fitted under other settings or on an
+    older training window, so saved settings and new sales retire stale models in
+    every worker without cross-process signalling.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            MODEL_CACHE_REQUESTS.labels("miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        MODEL_CACHE_REQUESTS.labels("hit").inc()
+        return entry.model
+
+    def put(self, key: str, model: Any, size: int, last_date: date) -> None:
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+
+        # a fit under new settings, or on newer sales, makes the product's older fits stale
+        product_id, settings_hash = key.split("/")[:2]
+        for other_key, other in list(self._entries.items()):
+            other_product_id, other_settings_hash = other_key.split("/")[:2]
+            if other_product_id != product_id:
+                continue
+            if other_settings_hash != settings_hash or other.last_date < last_date:
+                self._remove(other_key)
+
+        self._entries[key] = _CacheEntry(model, size, last_date)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+            MODEL_CACHE_EVICTIONS.inc()
+        self._report_size()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    def _report_size(self) -> None:
+        MODEL_CACHE_ENTRIES.set(len(self._entries))
+        MODEL_CACHE_BYTES.set(self.current_bytes)
+
+
+model_cache = ProphetModelCache(PROPHET_MODEL_CACHE_BYTES)
@@ -0,0 +1,108 @@
+import os
+import json
+import hashlib
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+import pandas as pd
+from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelSetting
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+
+# Number of artifacts kept per product; older ones are pruned after each save.
+MODEL_STORE_KEEP = int(os.getenv("MODEL_STORE_KEEP", 3))
+
+_SETTING_ID_FIELDS = {"id", "prophet_model_id", "model_setting_id"}
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items() if k not in _SETTING_ID_FIELDS}
+    if isinstance(value, list):
+        # seasons and changepoints: their order (as loaded or built) does not change the fit
+        return sorted((_canonical(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    return value
+
+
+def settings_fingerprint(settings: ProphetModelSetting) -> str:
+    """Hash of everything in the settings that changes how a model is fitted (ids and list order excluded)."""
+    payload = json.dumps(_canonical(asdict(settings)), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def sales_fingerprint(sales: pd.DataFrame) -> str:
+    """Hash of the training window: its dates and every daily value in it."""
+    ds = pd.to_datetime(sales["ds"])
+    h = hashlib.sha256()
+    h.update(str(ds.min()).encode())
+    h.update(str(ds.max()).encode())
+    h.update(sales["y"].to_numpy(dtype="float64").tobytes())
+    return h.hexdigest()[:16]
+
+
+class ProphetModelStore:
+    """
+    Content-addressed store of fitted Prophet models.
+
+    Artifacts live at `<models_dir>/<product_id>/<settings hash>/<sales hash>.json`,
+    so a model is only reused for the exact settings and training data it was fitted on.
+    Paths handed out (and recorded in `prophet_model.file_path`) are relative to `models_dir`.
+    """
+
+    def __init__(self, models_dir: Path):
+        self.models_dir = models_dir
+
+    def path_for(self, product_id: str, settings: ProphetModelSetting, sales: pd.DataFrame) -> str:
+        return f"{product_id}/{settings_fingerprint(settings)}/{sales_fingerprint(sales)}.json"
+
+    def load(self, path: str | None) -> "Prophet | None":
+        if not path:
+            return None
+        full_path = self.models_dir / path
+        if not full_path.is_file():
+            return None
+        from prophet.serialize import model_from_json
+
+        return model_from_json(full_path.read_text())
+
+    def size(self, path: str) -> int:
+        full_path = self.models_dir / path
+        return full_path.stat().st_size if full_path.is_file() else 0
+
+    def load_warm_start(self, product_id: str, previous_path: str | None, settings: ProphetModelSetting) -> "Prophet | None":
+        """
+        Load the product's previous fit if it was trained with the same settings,
+        so it can seed a refit on new data. Returns None when settings changed.
+        """
+        if not previous_path:
+            return None
+        if not previous_path.startswith(f"{product_id}/{settings_fingerprint(settings)}/"):
+            return None
+        return self.load(previous_path)
+
+    def save(self, model: "Prophet", path: str) -> None:
+        from prophet.serialize import model_to_json
+
+        full_path = self.models_dir / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp_path = full_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(model_to_json(model))
+        os.replace(tmp_path, full_path)
+
+        self._prune(full_path.parents[1])
+
+    def _prune(self, product_dir: Path) -> None:
+        artifacts = []
+        for artifact in product_dir.glob("*/*.json"):
+            try:
+                artifacts.append((artifact.stat().st_mtime, artifact))
+            except FileNotFoundError:
+                # pruned meanwhile by another worker saving the same product
+                continue
+        artifacts.sort(reverse=True)
+        for _, stale in artifacts[MODEL_STORE_KEEP:]:
+            stale.unlink(missing_ok=True)
@@ -1,13 +1,42 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from forecasting_module.config.executor import worker_pool
+from forecasting_module.config.jit import JIT_WARM_UP
+from forecasting_module.config.pool import async_pool, pool
+from forecasting_module.config.storage import init_storage
+from forecasting_module.infra.metrics import metrics_registry
+from forecasting_module.infra.workers.forecast_job_runner import ForecastJobRunner, FORECAST_JOB_CONCURRENCY, FORECAST_JOB_RUNNER_ENABLED
 from .forecasts.forecast_router import forecast_router
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_storage()
+    pool.open()
+    await async_pool.open()
+    if JIT_WARM_UP:
+        await worker_pool.warm_up()
+    job_runner = ForecastJobRunner(FORECAST_JOB_CONCURRENCY)
+    if FORECAST_JOB_RUNNER_ENABLED:
+        job_runner.start()
+    yield
+    await job_runner.stop()
+    worker_pool.shutdown()
+    await async_pool.close()
+    pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/healthcheck")
 def healthcheck():
     return {"message": "ok"}
 
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
+
 app.include_router(forecast_router, prefix="/forecasts")
 
 
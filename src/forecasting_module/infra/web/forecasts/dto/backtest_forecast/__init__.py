@@ -0,0 +1,3 @@
+from .body import BacktestForecastBody
+
+__all__ = ["BacktestForecastBody"]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+from datetime import date
+
+class BacktestForecastBody(BaseModel):
+    account_id: str = Field(alias="accountId")
+    product_ids: list[str] | None = Field(default=None, alias="productIds")
+    data_depth: int = Field(alias="dataDepth")
+    # scored at the same offsets from every cutoff as from the last sale
+    forecast_start_date: date = Field(alias="forecastStartDate")
+    forecast_end_date: date = Field(alias="forecastEndDate")
+    methods: list[Literal["prophet", "croston"]] = Field(default=["prophet", "croston"], min_length=1)
+    n_windows: int = Field(default=3, ge=1, alias="nWindows")
+    # days between cutoffs; defaults to the window length
+    step_days: int | None = Field(default=None, ge=1, alias="stepDays")
+
+    class Config:
+        populate_by_name = True
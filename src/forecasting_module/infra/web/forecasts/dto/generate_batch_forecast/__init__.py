@@ -0,0 +1,3 @@
+from .body import GenerateBatchForecastBody
+
+__all__ = ["GenerateBatchForecastBody"]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+from datetime import date
+
+class GenerateBatchForecastBody(BaseModel):
+    account_id: str = Field(alias="accountId")
+    product_ids: list[str] | None = Field(default=None, alias="productIds")
+    data_depth: int = Field(alias="dataDepth")
+    forecast_start_date: date = Field(alias="forecastStartDate")
+    forecast_end_date: date = Field(alias="forecastEndDate")
+    # "auto" picks Prophet or a Croston variant per product from its demand pattern
+    forecasting_method: Literal["prophet", "croston", "auto"] = Field(alias="forecastingMethod")
+    # Prophet intervals: "full" sampling, "adaptive" sample count, or "point" approximation
+    interval_mode: Literal["full", "adaptive", "point"] = Field(default="full", alias="intervalMode")
+    # with "auto", store each product's demand classification ("slow"/"fast")
+    update_classification: bool = Field(default=False, alias="updateClassification")
+
+    class Config:
+        populate_by_name = True
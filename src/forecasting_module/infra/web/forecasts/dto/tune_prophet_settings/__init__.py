@@ -0,0 +1,3 @@
+from .body import TuneProphetSettingsBody
+
+__all__ = ["TuneProphetSettingsBody"]
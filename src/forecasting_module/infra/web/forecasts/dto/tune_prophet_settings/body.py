@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+from datetime import date
+
+class SeasonalityBody(BaseModel):
+    name: str
+    period: float = Field(gt=0)
+    fourier_order: int = Field(ge=1, alias="fourierOrder")
+    prior_scale: float | None = Field(default=None, alias="priorScale")
+    mode: Literal["additive", "multiplicative"] | None = None
+
+    class Config:
+        populate_by_name = True
+
+class SearchSpaceBody(BaseModel):
+    # values to try per setting; settings left out keep the product's current value
+    changepoint_prior_scale: list[float] | None = Field(default=None, alias="changepointPriorScale")
+    changepoint_range: list[float] | None = Field(default=None, alias="changepointRange")
+    seasonality_prior_scale: list[float] | None = Field(default=None, alias="seasonalityPriorScale")
+    seasonality_mode: list[Literal["additive", "multiplicative"]] | None = Field(default=None, alias="seasonalityMode")
+    yearly_seasonality: list[Literal["auto", "true", "false"]] | None = Field(default=None, alias="yearlySeasonality")
+    weekly_seasonality: list[Literal["auto", "true", "false"]] | None = Field(default=None, alias="weeklySeasonality")
+    # each value is a complete set of custom seasonalities
+    seasons: list[list[SeasonalityBody]] | None = None
+
+    class Config:
+        populate_by_name = True
+
+class TuneProphetSettingsBody(BaseModel):
+    account_id: str = Field(alias="accountId")
+    product_ids: list[str] | None = Field(default=None, alias="productIds")
+    data_depth: int = Field(alias="dataDepth")
+    # candidates are backtested on this window, replayed from rolling cutoffs
+    forecast_start_date: date = Field(alias="forecastStartDate")
+    forecast_end_date: date = Field(alias="forecastEndDate")
+    # omitted: the prior scales and seasonality mode grid
+    search_space: SearchSpaceBody | None = Field(default=None, alias="searchSpace")
+    search: Literal["grid", "random"] = "grid"
+    n_candidates: int = Field(default=20, ge=1, alias="nCandidates")
+    seed: int | None = None
+    n_windows: int = Field(default=3, ge=1, alias="nWindows")
+    step_days: int | None = Field(default=None, ge=1, alias="stepDays")
+    # successive halving keeps the best 1/eta per rung; null scores every candidate on every window
+    halving_eta: int | None = Field(default=3, ge=2, alias="halvingEta")
+
+    class Config:
+        populate_by_name = True
@@ -1,48 +1,136 @@
-from fastapi import APIRouter
-from forecasting_module.config.pool import pool
-from forecasting_module.application.usecases.generate_single_forecast.usecase import GenerateSingleForecastUsecase
-from forecasting_module.infra.database.repositories.forecast_entry_repo import ForecastEntryRepository
-from forecasting_module.infra.database.repositories.forecast_repo import ForecastRepository
-from forecasting_module.infra.database.repositories.product_repo import ProductRepository
-from forecasting_module.infra.database.repositories.product_setting_repo import ProductSettingRepository
-from forecasting_module.infra.database.repositories.sale_repo import SaleRepository
-from forecasting_module.infra.database.repositories.prophet_model_repo import ProphetModelRepository
+from uuid import UUID
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import FileResponse
+from forecasting_module.config.storage import PROFILES_DIR
+from forecasting_module.domain.entities.forecast_job import ForecastJob
+from forecasting_module.infra.workers.forecast_job_queue import enqueue_forecast_job, find_forecast_job
 from forecasting_module.infra.web.forecasts.dto.generate_single_forecast import GenerateSingleForecastBody
+from forecasting_module.infra.web.forecasts.dto.generate_batch_forecast import GenerateBatchForecastBody
+from forecasting_module.infra.web.forecasts.dto.backtest_forecast import BacktestForecastBody
+from forecasting_module.infra.web.forecasts.dto.tune_prophet_settings import TuneProphetSettingsBody
 
 forecast_router = APIRouter()
 
 
-@forecast_router.post("/{product_id}")
+def to_job_view(job: ForecastJob) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.error,
+        "createdAt": job.created_at,
+        "startedAt": job.started_at,
+        "finishedAt": job.finished_at,
+    }
+
+
+@forecast_router.get("/jobs/{job_id}")
+async def get_forecast_job(job_id: UUID):
+    job = await find_forecast_job(str(job_id))
+    if job is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"message": "Forecast job not found"})
+    return { "data": to_job_view(job) }
+
+
+@forecast_router.get("/jobs/{job_id}/profile")
+async def get_forecast_job_profile(job_id: UUID):
+    job = await find_forecast_job(str(job_id))
+    if job is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"message": "Forecast job not found"})
+
+    name = (job.result or {}).get("profile")
+    if name is None or not (PROFILES_DIR / name).exists():
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"message": "Forecast job has no profile"})
+    return FileResponse(PROFILES_DIR / name, media_type="application/octet-stream", filename=name)
+
+
+# declared before "/{product_id}" so "batch" is not taken for a product id
+@forecast_router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def generate_batch_forecast_route(
+    body: GenerateBatchForecastBody
+):
+    job_id = await enqueue_forecast_job(
+        "batch",
+        {
+            "account_id": body.account_id,
+            "product_ids": body.product_ids,
+            "data_depth": body.data_depth,
+            "forecast_start_date": body.forecast_start_date.isoformat(),
+            "forecast_end_date": body.forecast_end_date.isoformat(),
+            "forecasting_method": body.forecasting_method,
+            "interval_mode": body.interval_mode,
+            "update_classification": body.update_classification,
+        },
+    )
+    return { "data": { "jobId": job_id } }
+
+
+# MAE/RMSE/MASE per product and method over rolling cutoffs; nothing is written
+@forecast_router.post("/backtest", status_code=status.HTTP_202_ACCEPTED)
+async def backtest_forecast_route(
+    body: BacktestForecastBody
+):
+    job_id = await enqueue_forecast_job(
+        "backtest",
+        {
+            "account_id": body.account_id,
+            "product_ids": body.product_ids,
+            "data_depth": body.data_depth,
+            "forecast_start_date": body.forecast_start_date.isoformat(),
+            "forecast_end_date": body.forecast_end_date.isoformat(),
+            "methods": body.methods,
+            "n_windows": body.n_windows,
+            "step_days": body.step_days,
+        },
+    )
+    return { "data": { "jobId": job_id } }
+
+
+# searches Prophet settings per product and saves the best; later forecasts refit on them
+@forecast_router.post("/prophet-settings/tune", status_code=status.HTTP_202_ACCEPTED)
+async def tune_prophet_settings_route(
+    body: TuneProphetSettingsBody
+):
+    search_space = body.search_space.model_dump(exclude_none=True) if body.search_space else None
+    job_id = await enqueue_forecast_job(
+        "tune",
+        {
+            "account_id": body.account_id,
+            "product_ids": body.product_ids,
+            "data_depth": body.data_depth,
+            "forecast_start_date": body.forecast_start_date.isoformat(),
+            "forecast_end_date": body.forecast_end_date.isoformat(),
+            "search_space": search_space,
+            "search": body.search,
+            "n_candidates": body.n_candidates,
+            "seed": body.seed,
+            "n_windows": body.n_windows,
+            "step_days": body.step_days,
+            "halving_eta": body.halving_eta,
+        },
+    )
+    return { "data": { "jobId": job_id } }
+
+
+@forecast_router.post("/{product_id}", status_code=status.HTTP_202_ACCEPTED)
 async def generate_forecast(
     product_id: str,
-    body: GenerateSingleForecastBody
-):  
-    forecast_id = None
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            product_repo = ProductRepository(cur)
-            sale_repo = SaleRepository(cur)
-            forecast_repo = ForecastRepository(cur)
-            forecast_entry_repo = ForecastEntryRepository(cur)
-            setting_repo= ProductSettingRepository(cur)
-            prophet_model_repo= ProphetModelRepository(cur)
-            usecase = GenerateSingleForecastUsecase(
-                product_repo, 
-                sale_repo, 
-                forecast_repo, 
-                setting_repo, 
-                forecast_entry_repo,
-                prophet_model_repo
-            )
-            forecast_id = usecase.handle(
-                {
-                    "account_id": body.account_id, 
-                    "forecast_id": body.forecast_id,
-                    "data_depth": body.data_depth, 
-                    "forecast_end_date": body.forecast_end_date, 
-                    "forecast_start_date": body.forecast_start_date, 
-                    "forecasting_method": body.forecasting_method, 
-                    "product_id": product_id
-                }
-            )
-    return { "data": forecast_id }
+    body: GenerateSingleForecastBody,
+    x_forecast_profile: bool = Header(default=False),
+):
+    payload = {
+        "account_id": body.account_id,
+        "forecast_id": body.forecast_id,
+        "data_depth": body.data_depth,
+        "forecast_end_date": body.forecast_end_date.isoformat(),
+        "forecast_start_date": body.forecast_start_date.isoformat(),
+        "forecasting_method": body.forecasting_method,
+        "product_id": product_id
+    }
+    # `X-Forecast-Profile: true` profiles the fit and predict; fetch it from /jobs/{jobId}/profile
+    if x_forecast_profile:
+        payload["profile"] = True
+    job_id = await enqueue_forecast_job("single", payload)
+    return { "data": { "jobId": job_id, "forecastId": body.forecast_id } }
@@ -0,0 +1,38 @@
+import json
+import hashlib
+from typing import Any
+from uuid_utils import uuid7
+from forecasting_module.config.pool import async_pool
+from forecasting_module.domain.entities.forecast_job import ForecastJob, ForecastJobKind
+from forecasting_module.infra.database.repositories.forecast_job_repo import AsyncForecastJobRepository
+
+
+ENQUEUE_ATTEMPTS = 3
+
+
+# Producer side of the forecast job queue, called from the API event loop.
+# `payload` holds the usecase input with dates as ISO strings.
+
+def job_dedup_key(kind: ForecastJobKind, payload: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True).encode()).hexdigest()
+
+
+async def enqueue_forecast_job(kind: ForecastJobKind, payload: dict[str, Any]) -> str:
+    """
+    Enqueue a job and return its id. Identical requests made while a job for the
+    same input is queued or running get that job's id, so they share its result.
+    """
+    dedup_key = job_dedup_key(kind, payload)
+    for _ in range(ENQUEUE_ATTEMPTS):
+        async with async_pool.connection() as conn:
+            async with conn.cursor() as cur:
+                job_id = await AsyncForecastJobRepository(cur).enqueue(str(uuid7()), kind, payload, dedup_key)
+        if job_id is not None:
+            return job_id
+    raise RuntimeError("Could not enqueue forecast job")
+
+
+async def find_forecast_job(job_id: str) -> ForecastJob | None:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            return await AsyncForecastJobRepository(cur).find_one_by_id(job_id)
@@ -0,0 +1,224 @@
+import os
+import socket
+import asyncio
+import logging
+from datetime import date
+from typing import Any
+from fastapi import HTTPException, status
+from dotenv import load_dotenv
+from forecasting_module.config.pool import async_pool, pool
+from forecasting_module.config.executor import FORECAST_BUSY_RETRY_AFTER, worker_pool
+from forecasting_module.config.jit import JIT_WARM_UP
+from forecasting_module.config.metrics import FORECAST_JOB_RUNNER_METRICS_PORT
+from forecasting_module.config.storage import init_storage
+from forecasting_module.domain.entities.forecast_job import ForecastJob
+from forecasting_module.infra.database.repositories.forecast_job_repo import AsyncForecastJobRepository
+from forecasting_module.infra.profiling import profile_path, should_profile
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+FORECAST_JOB_CONCURRENCY = int(os.getenv("FORECAST_JOB_CONCURRENCY", worker_pool.max_workers))
+FORECAST_JOB_POLL_INTERVAL = float(os.getenv("FORECAST_JOB_POLL_INTERVAL", 1.0))
+FORECAST_JOB_LEASE_SECONDS = int(os.getenv("FORECAST_JOB_LEASE_SECONDS", 300))
+FORECAST_JOB_MAX_ATTEMPTS = int(os.getenv("FORECAST_JOB_MAX_ATTEMPTS", 3))
+# Run the consumer inside the API process; turn off when dedicated runners serve the queue.
+FORECAST_JOB_RUNNER_ENABLED = os.getenv("FORECAST_JOB_RUNNER_ENABLED", "true").lower() == "true"
+
+DATE_FIELDS = ("forecast_start_date", "forecast_end_date")
+
+
+async def _with_job_repo(fn, *args):
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            return await fn(AsyncForecastJobRepository(cur), *args)
+
+
+def _job_input(payload: dict[str, Any]) -> dict[str, Any]:
+    job_input = dict(payload)
+    job_input.pop("profile", None)
+    for field in DATE_FIELDS:
+        job_input[field] = date.fromisoformat(job_input[field])
+    return job_input
+
+
+def _error(exc: BaseException) -> dict[str, Any]:
+    if isinstance(exc, HTTPException):
+        detail = exc.detail if isinstance(exc.detail, dict) else {"message": str(exc.detail)}
+        return {"status": exc.status_code, **detail}
+    return {
+        "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "message": "Internal Server Error",
+        "debugMessage": str(exc) or type(exc).__name__,
+    }
+
+
+class ForecastJobRunner:
+    """
+    Consumer of the Postgres forecast job queue.
+
+    `concurrency` loops each claim one job at a time and hand it to the worker pool.
+    A claimed job is leased to this runner and the lease is renewed while the job
+    runs; if the runner dies, the lease expires and another runner picks the job up.
+    A runner that finds its lease gone stops waiting for the job and never finishes it.
+    Several replicas can consume the same queue.
+    """
+
+    def __init__(self, concurrency: int, worker_id: str | None = None) -> None:
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            if worker_pool.is_saturated():
+                # a claimed job would only be handed back with a 503
+                await self._idle(FORECAST_JOB_POLL_INTERVAL)
+                continue
+
+            try:
+                job = await _with_job_repo(
+                    AsyncForecastJobRepository.claim, self.worker_id, FORECAST_JOB_LEASE_SECONDS
+                )
+            except Exception:
+                logger.exception("Could not claim a forecast job")
+                job = None
+
+            if job is None:
+                await self._idle(FORECAST_JOB_POLL_INTERVAL)
+                continue
+
+            if not await self._process(job):
+                # released: the oldest job is this one again, give the workers time to drain
+                await self._idle(FORECAST_BUSY_RETRY_AFTER)
+
+    async def _idle(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _process(self, job: ForecastJob) -> bool:
+        """Run `job` to completion or failure; False when it was released back to the queue."""
+        if job.attempts > FORECAST_JOB_MAX_ATTEMPTS:
+            await _with_job_repo(AsyncForecastJobRepository.fail, job.id, self.worker_id, {
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": "Internal Server Error",
+                "debugMessage": f"Job was abandoned by its worker {job.attempts - 1} times",
+            })
+            return True
+
+        execution = asyncio.create_task(self._execute(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            await asyncio.wait({execution, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not execution.done():
+                # the lease expired and the job may be someone else's now: drop it unfinished
+                logger.warning("Lost the lease of forecast job %s; abandoning it", job.id)
+                execution.cancel()
+                await asyncio.gather(execution, return_exceptions=True)
+                return True
+            result = execution.result()
+        except HTTPException as exc:
+            if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+                # workers saturated by other callers: hand the job back untouched
+                await _with_job_repo(AsyncForecastJobRepository.release, job.id, self.worker_id)
+                return False
+            await _with_job_repo(AsyncForecastJobRepository.fail, job.id, self.worker_id, _error(exc))
+            return True
+        except Exception as exc:
+            logger.exception("Forecast job %s failed", job.id)
+            await _with_job_repo(AsyncForecastJobRepository.fail, job.id, self.worker_id, _error(exc))
+            return True
+        finally:
+            heartbeat.cancel()
+            execution.cancel()
+
+        await _with_job_repo(AsyncForecastJobRepository.complete, job.id, self.worker_id, result)
+        return True
+
+    async def _execute(self, job: ForecastJob) -> dict[str, Any]:
+        # imported on first job: keeps pandas and the usecases out of an idle API process
+        from forecasting_module.infra.workers.forecast_jobs import backtest_forecast, generate_single_forecast_async, generate_batch_forecast, tune_prophet_settings
+
+        job_input = _job_input(job.payload)
+        if job.kind == "single":
+            path = None
+            if should_profile(job.payload.get("profile", False)):
+                path = profile_path(job_input["forecast_id"], job.id)
+            forecast_id = await generate_single_forecast_async(job_input, path) # pyright: ignore
+            # no profile when the inputs were unchanged and nothing was computed
+            if path is not None and path.exists():
+                return {"forecastId": forecast_id, "profile": path.name}
+            return {"forecastId": forecast_id}
+
+        if job.kind == "backtest":
+            result = await worker_pool.run_threaded(
+                backtest_forecast, job_input, worker_pool.offline_executor # pyright: ignore
+            )
+            return dict(result)
+
+        if job.kind == "tune":
+            result = await worker_pool.run_threaded(
+                tune_prophet_settings, job_input, worker_pool.offline_executor # pyright: ignore
+            )
+            return dict(result)
+
+        result = await worker_pool.run_threaded(
+            generate_batch_forecast, job_input, worker_pool.offline_executor # pyright: ignore
+        )
+        return dict(result)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew the lease of `job_id` until cancelled; returns once the lease is lost."""
+        while True:
+            await asyncio.sleep(FORECAST_JOB_LEASE_SECONDS / 3)
+            try:
+                extended = await _with_job_repo(
+                    AsyncForecastJobRepository.extend_lease, job_id, self.worker_id, FORECAST_JOB_LEASE_SECONDS
+                )
+            except Exception:
+                logger.exception("Could not extend the lease of forecast job %s", job_id)
+                continue
+            if not extended:
+                return
+
+
+async def main() -> None:
+    init_storage()
+    pool.open()
+    await async_pool.open()
+    if JIT_WARM_UP:
+        await worker_pool.warm_up()
+    if FORECAST_JOB_RUNNER_METRICS_PORT:
+        from prometheus_client import start_http_server
+        from forecasting_module.infra.metrics import metrics_registry
+        start_http_server(FORECAST_JOB_RUNNER_METRICS_PORT, registry=metrics_registry())
+    runner = ForecastJobRunner(FORECAST_JOB_CONCURRENCY)
+    runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.stop()
+        worker_pool.shutdown()
+        await async_pool.close()
+        pool.close()
+
+
+# Standalone consumer: `python -m forecasting_module.infra.workers.forecast_job_runner`
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
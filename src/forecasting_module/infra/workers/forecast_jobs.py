@@ -0,0 +1,119 @@
+from forecasting_module.config.pool import async_pool, pool
+from forecasting_module.config.executor import worker_pool
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from pathlib import Path
+from forecasting_module.config.storage import MODELS_DIR
+from forecasting_module.application.usecases.generate_single_forecast.usecase import (
+    GenerateSingleForecastAsyncUsecase,
+    GenerateSingleForecastInput,
+    SingleForecastRepositories,
+)
+from forecasting_module.application.usecases.generate_batch_forecast.usecase import (
+    BatchForecastRepositories,
+    GenerateBatchForecastInput,
+    GenerateBatchForecastResult,
+    GenerateBatchForecastUsecase,
+)
+from forecasting_module.application.usecases.backtest_forecast.usecase import (
+    BacktestForecastInput,
+    BacktestForecastRepositories,
+    BacktestForecastResult,
+    BacktestForecastUsecase,
+)
+from forecasting_module.application.usecases.tune_prophet_settings.usecase import (
+    TuneProphetSettingsInput,
+    TuneProphetSettingsRepositories,
+    TuneProphetSettingsResult,
+    TuneProphetSettingsUsecase,
+)
+from forecasting_module.infra.database.repositories.forecast_entry_repo import AsyncForecastEntryRepository, ForecastEntryRepository
+from forecasting_module.infra.database.repositories.forecast_repo import AsyncForecastRepository, ForecastRepository
+from forecasting_module.infra.database.repositories.product_repo import AsyncProductRepository, ProductRepository
+from forecasting_module.infra.database.repositories.product_setting_repo import ProductSettingRepository
+from forecasting_module.infra.database.repositories.sale_repo import AsyncSaleRepository, SaleRepository
+from forecasting_module.infra.database.repositories.prophet_model_repo import AsyncProphetModelRepository, ProphetModelRepository
+from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore
+from forecasting_module.infra.profiling import run_profiled
+
+
+# Runs on the API event loop: database stages await `async_pool`, the fit goes to the worker pool.
+# With `profile_path`, the worker stage runs under cProfile and its stats are written there.
+
+@asynccontextmanager
+async def _single_forecast_transaction():
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            yield SingleForecastRepositories(
+                AsyncProductRepository(cur),
+                AsyncSaleRepository(cur),
+                AsyncForecastRepository(cur),
+                AsyncForecastEntryRepository(cur),
+                AsyncProphetModelRepository(cur),
+            )
+
+
+async def generate_single_forecast_async(input: GenerateSingleForecastInput, profile_path: Path | None = None) -> str:
+    run_in_worker = worker_pool.run
+    if profile_path is not None:
+        run_in_worker = partial(worker_pool.run, run_profiled, profile_path)
+
+    usecase = GenerateSingleForecastAsyncUsecase(
+        _single_forecast_transaction,
+        ProphetModelStore(MODELS_DIR),
+        run_in_worker=run_in_worker,
+    )
+    return await usecase.handle(input)
+
+
+# Runs in a thread of the API process; the per-product fits go to `executor`.
+
+@contextmanager
+def _batch_transaction():
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            yield BatchForecastRepositories(
+                ProductRepository(cur),
+                SaleRepository(cur),
+                ForecastRepository(cur),
+                ForecastEntryRepository(cur),
+                ProphetModelRepository(cur),
+                ProductSettingRepository(cur),
+            )
+
+
+def generate_batch_forecast(input: GenerateBatchForecastInput, executor: Executor) -> GenerateBatchForecastResult:
+    return GenerateBatchForecastUsecase(_batch_transaction, ProphetModelStore(MODELS_DIR), executor).handle(input)
+
+
+# Runs in a thread of the API process; Croston chunks and Prophet windows go to `executor`.
+
+@contextmanager
+def _backtest_transaction():
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            yield BacktestForecastRepositories(
+                ProductRepository(cur),
+                SaleRepository(cur),
+                ProphetModelRepository(cur),
+            )
+
+
+def backtest_forecast(input: BacktestForecastInput, executor: Executor) -> BacktestForecastResult:
+    return BacktestForecastUsecase(_backtest_transaction, executor).handle(input)
+
+
+@contextmanager
+def _tune_transaction():
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            yield TuneProphetSettingsRepositories(
+                ProductRepository(cur),
+                SaleRepository(cur),
+                ProphetModelRepository(cur),
+            )
+
+
+def tune_prophet_settings(input: TuneProphetSettingsInput, executor: Executor) -> TuneProphetSettingsResult:
+    return TuneProphetSettingsUsecase(_tune_transaction, executor).handle(input)
@@ -0,0 +1,32 @@
+import pytest
+from fastapi import HTTPException
+from forecasting_module.application.services.account_products import resolve_account_product_ids
+from forecasting_module.domain.entities.product import Product
+
+
+class ProductRepository:
+    products = {"a1": "account-a", "a2": "account-a", "b1": "account-b"}
+
+    def find_all_by_account_id(self, account_id):
+        return [Product(id, 0) for id, owner in self.products.items() if owner == account_id]
+
+    def find_all_by_account_id_and_ids(self, account_id, ids):
+        return [p for p in self.find_all_by_account_id(account_id) if p.id in ids]
+
+
+def test_all_products_of_the_account_by_default():
+    assert resolve_account_product_ids(ProductRepository(), "account-a", None, {}) == ["a1", "a2"]  # pyright: ignore
+
+
+def test_requested_products_of_other_accounts_are_rejected():
+    failed = {}
+    resolved = resolve_account_product_ids(ProductRepository(), "account-a", ["a2", "b1", "missing"], failed)  # pyright: ignore
+
+    assert resolved == ["a2"]
+    assert failed == {"b1": "Product not found", "missing": "Product not found"}
+
+
+def test_no_owned_products_is_not_found():
+    with pytest.raises(HTTPException) as exc:
+        resolve_account_product_ids(ProductRepository(), "account-a", ["b1"], {})  # pyright: ignore
+    assert exc.value.status_code == 404
@@ -0,0 +1,51 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+from forecasting_module.domain.services.backtest import backtest_offsets, naive_scales, rolling_cutoffs, score_backtest
+
+
+def _series() -> pd.DataFrame:
+    ds = pd.date_range("2026-01-01", periods=28, freq="D")
+    y = np.tile([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0], 4) + np.arange(28) // 7  # weekly pattern, +1 per week
+    return pd.DataFrame({"unique_id": "p", "ds": ds, "y": y})
+
+
+def test_offsets_and_cutoffs_replay_the_window():
+    assert backtest_offsets(date(2026, 1, 31), date(2026, 2, 3), date(2026, 2, 10)) == (3, 10)
+    assert rolling_cutoffs(pd.Timestamp("2026-01-31"), 10, 3, 5) == [
+        pd.Timestamp("2026-01-11"), pd.Timestamp("2026-01-16"), pd.Timestamp("2026-01-21"),
+    ]
+
+
+def test_naive_scale_is_the_in_sample_seasonal_naive_mae():
+    series = _series()
+    cutoffs = pd.DataFrame({"unique_id": ["p", "p"], "cutoff": pd.to_datetime(["2026-01-05", "2026-01-21"])})
+
+    scales = naive_scales(series, cutoffs).set_index("cutoff")["scale"]
+
+    # fewer than a season of history: undefined; then every weekly difference is 1
+    assert np.isnan(scales[pd.Timestamp("2026-01-05")])
+    assert scales[pd.Timestamp("2026-01-21")] == pytest.approx(1.0)
+
+
+def test_scores_average_windows_and_skip_missing_forecasts():
+    cutoffs = pd.to_datetime(["2026-01-14", "2026-01-21"])
+    cv = pd.DataFrame({
+        "unique_id": "p",
+        "cutoff": np.repeat(cutoffs, 2),
+        "ds": pd.to_datetime(["2026-01-15", "2026-01-16", "2026-01-22", "2026-01-23"]),
+        "y": [10.0, 10.0, 10.0, 10.0],
+        "a": [12.0, 8.0, 11.0, 11.0],
+        "b": [10.0, 10.0, np.nan, np.nan],
+    })
+    scales = pd.DataFrame({"unique_id": "p", "cutoff": cutoffs, "scale": [2.0, 1.0]})
+
+    scores = score_backtest(cv, scales, ["a", "b"]).set_index("method")
+
+    assert scores.loc["a", "mae"] == pytest.approx((2.0 + 1.0) / 2)
+    assert scores.loc["a", "rmse"] == pytest.approx(np.sqrt((4 + 4 + 1 + 1) / 4))
+    assert scores.loc["a", "mase"] == pytest.approx((2.0 / 2.0 + 1.0 / 1.0) / 2)
+    assert scores.loc["a", "windows"] == 2
+    assert scores.loc["b", "mae"] == 0.0
+    assert scores.loc["b", "windows"] == 1
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from forecasting_module.domain.services.croston_kernels import CROSTON_KERNELS, croston_point_forecast
+from forecasting_module.domain.services.forecast_manager import croston_models
+
+# the optimized kernel finds the smoothing alpha by its own search, so it agrees only to the optimizer's precision
+TOLERANCE = {"CrostonOptimized": 1e-8}
+
+
+def _intermittent(seed: int, n: int, zero_rate: float) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    y = rng.poisson(4.0, n).astype(np.float64) + 1
+    y[rng.random(n) < zero_rate] = 0.0
+    return y
+
+
+@pytest.mark.parametrize("variant", list(CROSTON_KERNELS))
+@pytest.mark.parametrize("seed, n, zero_rate", [(0, 60, 0.5), (1, 365, 0.8), (2, 730, 0.95), (3, 40, 0.0)])
+def test_kernels_match_statsforecast(variant, seed, n, zero_rate):
+    y = _intermittent(seed, n, zero_rate)
+    if not y.any():
+        y[-1] = 1.0
+
+    expected = croston_models()[variant]().forecast(y=y, h=1)["mean"][0]
+
+    assert croston_point_forecast(y, variant) == pytest.approx(expected, rel=TOLERANCE.get(variant, 1e-9))
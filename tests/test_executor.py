@@ -0,0 +1,50 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from forecasting_module.config.executor import BoundedExecutor
+
+
+def test_bounded_executor_limits_pending_tasks():
+    pending = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def task(i: int) -> int:
+        nonlocal pending
+        time.sleep(0.005)
+        with lock:
+            pending -= 1
+        return i
+
+    def submit(executor: BoundedExecutor, i: int):
+        nonlocal pending, peak
+        future = executor.submit(task, i)
+        with lock:
+            pending += 1
+            peak = max(peak, pending)
+        return future
+
+    with ThreadPoolExecutor(4) as pool:
+        bounded = BoundedExecutor(pool, max_pending=2)
+        futures = [submit(bounded, i) for i in range(20)]
+        assert [f.result() for f in futures] == list(range(20))
+
+    assert peak <= 2
+
+
+def test_direct_submissions_do_not_wait_for_the_offline_backlog():
+    order = []
+
+    def task(name: str) -> None:
+        time.sleep(0.01)
+        order.append(name)
+
+    with ThreadPoolExecutor(1) as pool:
+        bounded = BoundedExecutor(pool, max_pending=1)
+        offline = threading.Thread(target=lambda: [bounded.submit(task, f"offline-{i}") for i in range(10)])
+        offline.start()
+        time.sleep(0.015)
+        pool.submit(task, "single").result()
+        offline.join()
+
+    assert order.index("single") <= 3
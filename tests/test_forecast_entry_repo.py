@@ -0,0 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from forecasting_module.domain.services.forecast_manager import ForecastManager
+from forecasting_module.infra.database.repositories.forecast_entry_repo import AsyncForecastEntryRepository
+
+
+class _Copy:
+    def __init__(self, written: list[bytes]):
+        self.written = written
+
+    async def write(self, payload: bytes) -> None:
+        self.written.append(payload)
+
+
+class _Cursor:
+    def __init__(self):
+        self.executed: list[tuple] = []
+        self.written: list[bytes] = []
+        self.connection = self
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, sql: str, params: tuple) -> None:
+        self.executed.append(params)
+
+    @asynccontextmanager
+    async def copy(self, sql: str):
+        yield _Copy(self.written)
+
+
+def test_replacing_with_no_entries_still_deletes_the_stale_ones():
+    cur = _Cursor()
+    empty = pd.DataFrame(columns=["ds", "yhat", "yhat_lower", "yhat_upper"])
+
+    asyncio.run(AsyncForecastEntryRepository(cur).replace_forecast_dataframe("f1", empty))  # pyright: ignore
+
+    assert cur.executed == [(["f1"],)]
+    assert cur.written == []
+
+
+def test_croston_rejects_a_window_without_days():
+    sales = pd.DataFrame({"ds": pd.date_range("2025-01-01", periods=60, freq="D"), "y": 1.0})
+
+    with pytest.raises(HTTPException) as exc:
+        ForecastManager().croston_forecast(sales, date(2025, 4, 10), date(2025, 4, 1))
+
+    assert exc.value.status_code == 409
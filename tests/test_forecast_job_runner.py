@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+from fastapi import HTTPException, status
+from forecasting_module.domain.entities.forecast_job import ForecastJob
+from forecasting_module.infra.database.repositories.forecast_job_repo import AsyncForecastJobRepository
+from forecasting_module.infra.workers import forecast_job_runner
+from forecasting_module.infra.workers.forecast_job_runner import ForecastJobRunner
+
+
+def _job() -> ForecastJob:
+    return ForecastJob(
+        id="job-1", kind="single", status="running", payload={}, result=None, error=None,
+        attempts=1, created_at=datetime.now(), started_at=datetime.now(), finished_at=None,
+    )
+
+
+def _run_for(runner: ForecastJobRunner, seconds: float) -> None:
+    async def run():
+        runner.start()
+        await asyncio.sleep(seconds)
+        await runner.stop()
+    asyncio.run(run())
+
+
+def test_released_job_is_not_reclaimed_immediately(monkeypatch):
+    calls = []
+
+    async def with_job_repo(fn, *args):
+        calls.append(fn)
+        return _job() if fn is AsyncForecastJobRepository.claim else None
+
+    async def busy(self, job):
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail={"message": "busy"})
+
+    monkeypatch.setattr(forecast_job_runner, "_with_job_repo", with_job_repo)
+    monkeypatch.setattr(forecast_job_runner, "FORECAST_BUSY_RETRY_AFTER", 10)
+    monkeypatch.setattr(ForecastJobRunner, "_execute", busy)
+
+    _run_for(ForecastJobRunner(concurrency=1, worker_id="test"), 0.2)
+
+    assert calls.count(AsyncForecastJobRepository.claim) == 1
+    assert calls.count(AsyncForecastJobRepository.release) == 1
+
+
+def test_no_claims_while_workers_are_saturated(monkeypatch):
+    calls = []
+
+    async def with_job_repo(fn, *args):
+        calls.append(fn)
+        return None
+
+    monkeypatch.setattr(forecast_job_runner, "_with_job_repo", with_job_repo)
+    monkeypatch.setattr(forecast_job_runner.worker_pool, "is_saturated", lambda: True)
+
+    _run_for(ForecastJobRunner(concurrency=2, worker_id="test"), 0.2)
+
+    assert calls == []
+
+
+def test_job_whose_lease_is_lost_is_abandoned(monkeypatch):
+    calls = []
+    cancelled = asyncio.Event()
+
+    async def with_job_repo(fn, *args):
+        calls.append(fn)
+        if fn is AsyncForecastJobRepository.claim:
+            return _job() if calls.count(fn) == 1 else None
+        return False  # extend_lease: another runner holds the job now
+
+    async def slow(self, job):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {}
+
+    monkeypatch.setattr(forecast_job_runner, "_with_job_repo", with_job_repo)
+    monkeypatch.setattr(forecast_job_runner, "FORECAST_JOB_LEASE_SECONDS", 0.03)
+    monkeypatch.setattr(ForecastJobRunner, "_execute", slow)
+
+    _run_for(ForecastJobRunner(concurrency=1, worker_id="test"), 0.2)
+
+    assert cancelled.is_set()
+    assert calls.count(AsyncForecastJobRepository.extend_lease) == 1
+    assert AsyncForecastJobRepository.complete not in calls
+    assert AsyncForecastJobRepository.fail not in calls
@@ -0,0 +1,41 @@
+import itertools
+from forecasting_module.domain.services.hyperparameter_search import grid_candidates, halving_rungs, random_candidates
+
+SPACE = {"changepoint_prior_scale": [0.01, 0.1, 0.5], "seasonality_mode": ["additive", "multiplicative"], "x": [1, 2]}
+
+
+def test_grid_is_the_product_of_the_values():
+    expected = [dict(zip(SPACE, values)) for values in itertools.product(*SPACE.values())]
+
+    assert grid_candidates(SPACE) == expected
+
+
+def test_random_draws_are_distinct_grid_points_and_seeded():
+    drawn = random_candidates(SPACE, 5, seed=3)
+
+    assert len(drawn) == 5
+    assert len({tuple(c.values()) for c in drawn}) == 5
+    assert all(c in grid_candidates(SPACE) for c in drawn)
+    assert drawn == random_candidates(SPACE, 5, seed=3)
+
+
+def test_random_search_larger_than_the_grid_is_the_grid():
+    assert random_candidates(SPACE, 50, seed=0) == grid_candidates(SPACE)
+
+
+def test_halving_grows_windows_and_shrinks_candidates_by_eta():
+    assert halving_rungs(27, 9, 3) == [(1, 27), (3, 9), (9, 3)]
+    assert halving_rungs(16, 8, 2) == [(1, 16), (2, 8), (4, 4), (8, 2)]
+
+
+def test_halving_ends_on_every_window_and_keeps_a_candidate():
+    for n_candidates, n_windows, eta in [(40, 4, 3), (32, 10, 3), (2, 9, 3)]:
+        rungs = halving_rungs(n_candidates, n_windows, eta)
+        assert rungs[0] == (1, n_candidates)
+        assert rungs[-1][0] == n_windows
+        assert all(candidates >= 1 for _, candidates in rungs)
+
+
+def test_no_halving_without_eta_or_windows():
+    assert halving_rungs(12, 5, None) == [(5, 12)]
+    assert halving_rungs(12, 2, 3) == [(2, 12)]
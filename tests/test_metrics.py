@@ -0,0 +1,12 @@
+# imported first, as in production: the app module loads prometheus_client itself
+from forecasting_module.infra.web.app import app  # noqa: F401
+from forecasting_module.infra.metrics import FORECASTS, metrics_registry
+from prometheus_client import generate_latest
+
+
+def test_api_process_samples_are_exported():
+    FORECASTS.labels("prophet", "generated").inc()
+
+    exported = generate_latest(metrics_registry()).decode()
+
+    assert 'forecasts_total{method="prophet",outcome="generated"}' in exported
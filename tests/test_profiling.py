@@ -0,0 +1,22 @@
+import os
+from forecasting_module.infra import profiling
+
+
+def test_profiled_run_returns_the_result_and_writes_stats(tmp_path):
+    path = tmp_path / "f-j.prof"
+
+    assert profiling.run_profiled(path, sum, [1, 2, 3]) == 6
+    assert path.stat().st_size > 0
+
+
+def test_only_the_newest_profiles_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "FORECAST_PROFILE_KEEP", 2)
+    for i in range(3):
+        old = tmp_path / f"old-{i}.prof"
+        old.write_bytes(b"")
+        os.utime(old, (1_000 + i, 1_000 + i))
+    (tmp_path / "notes.txt").write_text("not a profile")
+
+    profiling.run_profiled(tmp_path / "new.prof", sum, [1])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.prof", "notes.txt", "old-2.prof"]
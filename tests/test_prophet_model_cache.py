@@ -0,0 +1,37 @@
+from datetime import date
+from forecasting_module.infra.storage.prophet_model_cache import ProphetModelCache
+
+
+def test_new_settings_retire_the_products_older_fits():
+    cache = ProphetModelCache(max_bytes=100)
+    cache.put("p1/settings-a/sales-1.json", "fit-a", 10, date(2026, 1, 31))
+    cache.put("p2/settings-a/sales-1.json", "other", 10, date(2026, 1, 31))
+
+    cache.put("p1/settings-b/sales-1.json", "fit-b", 10, date(2026, 1, 31))
+
+    assert cache.get("p1/settings-a/sales-1.json") is None
+    assert cache.get("p1/settings-b/sales-1.json") == "fit-b"
+    assert cache.get("p2/settings-a/sales-1.json") == "other"
+
+
+def test_newer_sales_retire_fits_on_older_windows():
+    cache = ProphetModelCache(max_bytes=100)
+    cache.put("p1/settings-a/sales-1.json", "old", 10, date(2026, 1, 30))
+
+    cache.put("p1/settings-a/sales-2.json", "new", 10, date(2026, 1, 31))
+
+    assert cache.get("p1/settings-a/sales-1.json") is None
+    assert cache.stats()["bytes"] == 10
+
+
+def test_least_recently_used_is_evicted_over_budget():
+    cache = ProphetModelCache(max_bytes=20)
+    cache.put("p1/s/a.json", 1, 10, date(2026, 1, 31))
+    cache.put("p2/s/a.json", 2, 10, date(2026, 1, 31))
+    cache.get("p1/s/a.json")
+
+    cache.put("p3/s/a.json", 3, 10, date(2026, 1, 31))
+
+    assert cache.get("p2/s/a.json") is None
+    assert cache.get("p1/s/a.json") == 1
+    assert cache.stats()["evictions"] == 1
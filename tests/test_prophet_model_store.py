@@ -0,0 +1,42 @@
+import os
+from pathlib import Path
+from forecasting_module.infra.storage import prophet_model_store
+from forecasting_module.infra.storage.prophet_model_store import ProphetModelStore
+
+
+def _artifacts(product_dir: Path, n: int) -> list[Path]:
+    paths = []
+    for i in range(n):
+        path = product_dir / f"fp{i}" / "model.json"
+        path.parent.mkdir(parents=True)
+        path.write_text("{}")
+        os.utime(path, (1_000 + i, 1_000 + i))
+        paths.append(path)
+    return paths
+
+
+def test_prune_keeps_the_newest_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(prophet_model_store, "MODEL_STORE_KEEP", 2)
+    paths = _artifacts(tmp_path / "p1", 4)
+
+    ProphetModelStore(tmp_path)._prune(tmp_path / "p1")
+
+    assert [p.exists() for p in paths] == [False, False, True, True]
+
+
+def test_prune_skips_artifacts_removed_meanwhile(tmp_path, monkeypatch):
+    monkeypatch.setattr(prophet_model_store, "MODEL_STORE_KEEP", 1)
+    paths = _artifacts(tmp_path / "p1", 3)
+    stat = Path.stat
+
+    def vanishing_stat(self, *args, **kwargs):
+        # another worker prunes the oldest artifact between the glob and the stat
+        if self == paths[0]:
+            self.unlink(missing_ok=True)
+        return stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", vanishing_stat)
+
+    ProphetModelStore(tmp_path)._prune(tmp_path / "p1")
+
+    assert [p.exists() for p in paths] == [False, False, True]
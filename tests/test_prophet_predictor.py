@@ -0,0 +1,53 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+from forecasting_module.domain.services.prophet_predictor import ProphetParameters, ProphetPredictor
+
+LAST_DAY = date(2025, 12, 31)
+
+
+def _sales() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    ds = pd.date_range(end=pd.Timestamp(LAST_DAY), periods=500, freq="D")
+    t = np.arange(len(ds))
+    y = 50 + 0.05 * t + 8 * np.sin(2 * np.pi * t / 7) + 5 * np.sin(2 * np.pi * t / 365.25) + rng.normal(0, 2, len(ds))
+    return pd.DataFrame({"ds": ds, "y": y})
+
+
+@pytest.fixture(scope="module", params=["additive", "multiplicative"])
+def model(request):
+    from prophet import Prophet
+
+    model = Prophet(seasonality_mode=request.param, uncertainty_samples=200)
+    model.add_seasonality(name="monthly", period=30.5, fourier_order=3)
+    model.fit(_sales())
+    return model
+
+
+def _prophet_predict(model, start: date, end: date) -> pd.DataFrame:
+    future = model.make_future_dataframe(periods=(end - LAST_DAY).days, include_history=False)
+    forecast = model.predict(future)
+    return forecast[forecast["ds"].dt.date >= start].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("start, end", [(date(2026, 1, 1), date(2026, 3, 31)), (date(2026, 6, 1), date(2026, 6, 30))])
+def test_point_forecast_matches_prophet(model, start, end):
+    expected = _prophet_predict(model, start, end)
+
+    actual = ProphetPredictor(ProphetParameters.from_model(model)).predict(start, end)  # pyright: ignore
+
+    assert (actual["ds"].to_numpy() == expected["ds"].to_numpy()).all()
+    np.testing.assert_allclose(actual["yhat"], expected["yhat"], rtol=1e-9)
+
+
+def test_intervals_match_prophet_with_the_same_seed(model):
+    start, end = date(2026, 1, 1), date(2026, 2, 28)
+    np.random.seed(7)
+    expected = _prophet_predict(model, start, end)
+
+    np.random.seed(7)
+    actual = ProphetPredictor(ProphetParameters.from_model(model)).predict(start, end)  # pyright: ignore
+
+    np.testing.assert_allclose(actual["yhat_lower"], expected["yhat_lower"], rtol=1e-9)
+    np.testing.assert_allclose(actual["yhat_upper"], expected["yhat_upper"], rtol=1e-9)
@@ -0,0 +1,35 @@
+from dataclasses import replace
+from datetime import date
+from forecasting_module.infra.database.repositories.prophet_model_repo import (
+    ProphetChangepoint,
+    ProphetSeasonality,
+    build_default_prophet_settings,
+    build_prophet_from_settings,
+)
+from forecasting_module.infra.storage.prophet_model_store import settings_fingerprint
+
+
+def test_stored_seasonality_flags_become_bools():
+    settings = build_default_prophet_settings("model")
+    settings.yearly_seasonality = "false"
+    settings.weekly_seasonality = "true"
+
+    model = build_prophet_from_settings(settings)
+
+    assert model.yearly_seasonality is False
+    assert model.weekly_seasonality is True
+    assert model.daily_seasonality == "auto"
+
+
+def test_fingerprint_ignores_the_order_of_seasons_and_changepoints():
+    settings = build_default_prophet_settings("model")
+    settings.seasons = [
+        ProphetSeasonality("s1", settings.id, "monthly", 30.5, 5, None, None),
+        ProphetSeasonality("s2", settings.id, "quarterly", 91.25, 3, 5.0, "multiplicative"),
+    ]
+    settings.changepoints = [ProphetChangepoint("c1", settings.id, date(2025, 3, 1)), ProphetChangepoint("c2", settings.id, date(2025, 1, 1))]
+
+    reordered = replace(settings, seasons=settings.seasons[::-1], changepoints=settings.changepoints[::-1])
+
+    assert settings_fingerprint(reordered) == settings_fingerprint(settings)
+    assert settings_fingerprint(replace(settings, seasons=settings.seasons[:1])) != settings_fingerprint(settings)
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+import numpy as np
+import pandas as pd
+from forecasting_module.application.usecases.tune_prophet_settings import usecase
+from forecasting_module.application.usecases.tune_prophet_settings.usecase import (
+    TuneProphetSettingsRepositories,
+    TuneProphetSettingsUsecase,
+)
+from forecasting_module.domain.entities.product import Product
+from forecasting_module.domain.entities.prophet_model import ProphetModel
+
+
+class ProductRepository:
+    def find_all_by_account_id(self, account_id):
+        return [Product("p1", 0), Product("p2", 0)]
+
+
+class SaleRepository:
+    def find_daily_series_by_product_ids(self, product_ids, data_depth):
+        ds = pd.date_range("2025-01-01", periods=120, freq="D")
+        return pd.concat(
+            [pd.DataFrame({"product_id": product_id, "ds": ds, "y": np.arange(120.0) % 7}) for product_id in product_ids],
+            ignore_index=True,
+        )
+
+
+class ProphetModelRepository:
+    def __init__(self):
+        self.saved = []
+
+    def get_models_with_settings_by_product_ids(self, product_ids):
+        return {product_id: (ProphetModel(f"m-{product_id}", product_id, "n", "", True, None), None) for product_id in product_ids}
+
+    def save_model_settings(self, settings):
+        self.saved.append(settings.prophet_model_id)
+
+
+def _backtest(product_id, settings, sales, cutoffs, lead, horizon):
+    # p2's fits succeed but forecast no day with an actual to score against
+    frames = []
+    for cutoff in cutoffs:
+        days = pd.date_range(cutoff + pd.Timedelta(days=lead), cutoff + pd.Timedelta(days=horizon), freq="D")
+        actual = sales.set_index("ds").loc[days, "y"].to_numpy()
+        forecast = actual + settings.changepoint_prior_scale if product_id == "p1" else np.nan
+        frames.append(pd.DataFrame({"ds": days, "y": actual, "prophet": forecast, "unique_id": product_id, "cutoff": cutoff}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_products_without_any_scored_candidate_are_reported(monkeypatch):
+    monkeypatch.setattr(usecase, "backtest_prophet_candidate", _backtest)
+    prophet_model_repo = ProphetModelRepository()
+
+    @contextmanager
+    def transaction():
+        yield TuneProphetSettingsRepositories(ProductRepository(), SaleRepository(), prophet_model_repo)  # pyright: ignore
+
+    with ThreadPoolExecutor(2) as executor:
+        result = TuneProphetSettingsUsecase(transaction, executor).handle({
+            "account_id": "a", "product_ids": None, "data_depth": 100,
+            "forecast_start_date": date(2025, 5, 1), "forecast_end_date": date(2025, 5, 7),
+            "search_space": {"changepoint_prior_scale": [0.5, 0.1, 1.0]}, "search": "grid",
+            "n_candidates": 3, "seed": None, "n_windows": 3, "step_days": None, "halving_eta": 3,
+        })
+
+    assert result["tuned"]["p1"]["params"] == {"changepoint_prior_scale": 0.1}
+    assert result["failed"] == {"p2": "No candidate could be scored"}
+    assert prophet_model_repo.saved == ["m-p1"]